@@ -0,0 +1,124 @@
+"""
+Compare the throughput of the client presets against a local stand-in of
+the vimeo api serving HTTP/1.1 and HTTP/2 (prior knowledge) on cleartext.
+
+    pip install h2 hypercorn
+    PYTHONPATH=. python benchmarks/http2_presets.py --requests 2000 --concurrency 200
+
+The server answers after `--latency` seconds to mimic the api, so the
+results show how well the requests are spread on the connections.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import socket
+import time
+
+import vimex
+
+PAYLOAD = json.dumps({"uri": "/videos/1", "name": "some_video"}).encode()
+
+
+def make_app(latency: float):
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        await asyncio.sleep(latency)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send({"type": "http.response.body", "body": PAYLOAD})
+
+    return app
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_clients(url: str, requests: int, concurrency: int, client_kwargs):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with vimex.AsyncVimeoClient(**client_kwargs) as client:
+
+        async def get():
+            async with semaphore:
+                response = await client.get(url)
+                response.raise_for_status()
+                return response.http_version
+
+        start = time.perf_counter()
+        versions = await asyncio.gather(*(get() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+    return elapsed, set(versions)
+
+
+def run_server(port: int, latency: float):
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+
+    config = Config()
+    config.bind = [f"127.0.0.1:{port}"]
+    config.backlog = 4096
+    config.h2_max_concurrent_streams = 1000
+    config.keep_alive_max_requests = 10**9
+    config.loglevel = "WARNING"
+    asyncio.run(serve(make_app(latency), config))
+
+
+def wait_for_server(port: int, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError("The benchmark server didn't start.")
+
+
+async def main(args):
+    port = get_free_port()
+    # The server runs in its own process, so it doesn't share the event
+    # loop of the clients.
+    server = multiprocessing.Process(
+        target=run_server, args=(port, args.latency), daemon=True
+    )
+    server.start()
+    wait_for_server(port)
+    url = f"http://127.0.0.1:{port}/videos/1"
+
+    scenarios = {
+        "httpx defaults": {},
+        "upload-heavy": {"preset": "upload-heavy"},
+        # Cleartext HTTP/2 needs prior knowledge, TLS would negotiate it.
+        "api-heavy": {"preset": "api-heavy", "http1": False},
+    }
+    try:
+        print(f"{args.requests} requests, {args.concurrency} concurrent")
+        for name, client_kwargs in scenarios.items():
+            elapsed, versions = await run_clients(
+                url, args.requests, args.concurrency, client_kwargs
+            )
+            print(
+                f"{name:>16}: {args.requests / elapsed:8.0f} req/s "
+                f"({elapsed:.2f}s, {', '.join(sorted(versions))})"
+            )
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.02)
+    asyncio.run(main(parser.parse_args()))
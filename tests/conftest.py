@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture
+def anyio_backend():
+    # The clients rely on asyncio (tasks, to_thread, wrap_future).
+    return "asyncio"
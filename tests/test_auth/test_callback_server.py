@@ -0,0 +1,201 @@
+import asyncio
+import socket
+import threading
+import time
+from unittest import mock
+
+import httpx
+import pytest
+
+import vimex
+from vimex._oauth2_server import CallbackListener, CallbackServer, Server
+
+
+@pytest.fixture
+def port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class BrowserCallbackServer(CallbackServer):
+    """
+    Simulate the browser redirected by vimeo after the authorization.
+    """
+
+    def __init__(self, *args, query: dict, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.query = query
+        self.responses = []
+
+    def open_link(self, link):
+        def redirect():
+            self.responses.append(
+                httpx.get(f"http://{self.host}:{self.port}/", params=self.query)
+            )
+
+        threading.Thread(target=redirect).start()
+
+
+class TestCallbackServer:
+    def test_get_authorization_grant(self, port):
+        server = BrowserCallbackServer(
+            port=port, query={"code": "some_code", "state": "some_state"}
+        )
+
+        result = server.get_authorization_grant("link", state="some_state")
+
+        assert result.code == "some_code"
+        assert result.received_state == "some_state"
+        assert not CallbackListener.get(server.host, port)._pending
+
+    def test_unknown_state_is_rejected(self, port):
+        listener = CallbackListener.get("127.0.0.1", port)
+        future = listener.register("some_state")
+        try:
+            response = httpx.get(
+                f"http://127.0.0.1:{port}/",
+                params={"code": "some_code", "state": "other_state"},
+            )
+            assert response.status_code == 400
+            assert not future.done()
+        finally:
+            future.cancel()
+
+    def test_duplicated_state_is_rejected(self, port):
+        listener = CallbackListener.get("127.0.0.1", port)
+        future = listener.register("some_state")
+        try:
+            with pytest.raises(vimex.AuthorizationStateException):
+                listener.register("some_state")
+        finally:
+            future.cancel()
+
+    def test_fragment_redirect(self, port):
+        listener = CallbackListener.get("127.0.0.1", port)
+        future = listener.register("some_state")
+        try:
+            response = httpx.get(f"http://127.0.0.1:{port}/")
+            assert response.status_code == 200
+            assert "window.location.hash" in response.text
+        finally:
+            future.cancel()
+
+    def test_listener_is_restarted(self, port):
+        for state in ("first_state", "second_state"):
+            server = BrowserCallbackServer(
+                port=port, query={"access_token": "token", "state": state}
+            )
+            result = server.get_authorization_grant("link", state=state)
+            assert result.access_token == "token"
+
+    @pytest.mark.anyio
+    async def test_concurrent_authorizations_share_the_listener(self, port):
+        servers = [
+            BrowserCallbackServer(port=port, query={"code": state, "state": state})
+            for state in ("first_state", "second_state", "third_state")
+        ]
+
+        results = await asyncio.gather(
+            *(
+                server.async_get_authorization_grant("link", state=server.query["state"])
+                for server in servers
+            )
+        )
+
+        assert [result.code for result in results] == [
+            "first_state",
+            "second_state",
+            "third_state",
+        ]
+
+    @pytest.mark.anyio
+    async def test_cancellation_releases_the_state(self, port):
+        server = CallbackServer(port=port)
+        server.open_link = lambda link: None
+        task = asyncio.create_task(
+            server.async_get_authorization_grant("link", state="some_state")
+        )
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert not CallbackListener.get(server.host, port)._pending
+
+
+class BrowserServer(Server):
+    """
+    Redirect the browser to the uvicorn server with the next of `queries`.
+    """
+
+    def __init__(self, *args, queries: list, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.queries = iter(queries)
+
+    def open_link(self, link):
+        query = next(self.queries)
+
+        def redirect():
+            # Wait for the server to start.
+            for _ in range(100):
+                try:
+                    httpx.get(f"http://{self.host}:{self.port}/", params=query)
+                    return
+                except httpx.TransportError:
+                    time.sleep(0.05)
+
+        threading.Thread(target=redirect).start()
+
+
+class TestServer:
+    @mock.patch("vimex.VimeoOauth2AuthorizationCode.send_request")
+    def test_consecutive_authorizations(self, mocked_send_request, port):
+        mocked_send_request.return_value = httpx.Response(
+            200, json={"access_token": "some_token"}
+        )
+        auth = vimex.VimeoOauth2AuthorizationCode(
+            client_id="some_client_id",
+            client_secret="some_client_secret",
+            state="some_state",
+        )
+        auth.server = BrowserServer(
+            port=port,
+            queries=[
+                {"code": "first_code", "state": "some_state"},
+                {"code": "second_code", "state": "some_state"},
+            ],
+        )
+
+        auth.sync_fetch_token()
+        auth.sync_fetch_token()
+
+        codes = [
+            call.args[0].content for call in mocked_send_request.call_args_list
+        ]
+        assert b"code=first_code" in codes[0]
+        assert b"code=second_code" in codes[1]
+
+
+class TestLazyServer:
+    def test_server_is_built_on_first_use(self):
+        auth = vimex.VimeoOauth2AuthorizationCode(
+            client_id="some_client_id",
+            client_secret="some_client_secret",
+            state="some_state",
+        )
+
+        assert auth._server is None
+        assert isinstance(auth.server, Server)
+        assert "_server" not in vars(auth.server)
+
+    def test_server_class(self):
+        auth = vimex.VimeoOauth2ImplicitGrant(
+            client_id="some_client_id",
+            client_secret="some_client_secret",
+            state="some_state",
+            server_class=CallbackServer,
+        )
+
+        assert isinstance(auth.server, CallbackServer)
+        assert auth.redirect_uri == "http://127.0.0.1:5555"
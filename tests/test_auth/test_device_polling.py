@@ -0,0 +1,99 @@
+import asyncio
+
+import httpx
+import pytest
+
+from vimex._oauth2_server import DeviceCodePoller, Server
+
+POLL_URL = "https://api.vimeo.com/oauth/device/authorize"
+
+
+def polling_responses(*responses):
+    responses = iter(responses)
+    return lambda request: next(responses)
+
+
+class TestDeviceCodePoller:
+    def test_slow_down_increases_the_interval(self):
+        poller = DeviceCodePoller(POLL_URL, expires_in=600, interval=2)
+
+        assert not poller.process(
+            httpx.Response(400, json={"error": "authorization_pending"})
+        )
+        assert poller.interval == 2
+        assert not poller.process(httpx.Response(400, json={"error": "slow_down"}))
+        assert poller.interval == 7
+
+    def test_terminal_errors_stop_the_polling(self):
+        poller = DeviceCodePoller(POLL_URL, expires_in=600, interval=2)
+
+        assert poller.process(httpx.Response(400, json={"error": "access_denied"}))
+        assert poller.process(httpx.Response(400, json={"error": "expired_token"}))
+
+    def test_delay_does_not_exceed_the_deadline(self):
+        poller = DeviceCodePoller(POLL_URL, expires_in=1, interval=10)
+        assert poller.get_delay() <= 1
+
+
+class TestPollAuthorizeUrl:
+    def test_polling_reuses_the_given_client(self, respx_mock):
+        route = respx_mock.post(POLL_URL).mock(
+            side_effect=polling_responses(
+                httpx.Response(400, json={"error": "authorization_pending"}),
+                httpx.Response(400, json={"error": "authorization_pending"}),
+                httpx.Response(200, json={"access_token": "some_token"}),
+            )
+        )
+        progress = []
+
+        with httpx.Client() as client:
+            response = Server().poll_authorize_url(
+                POLL_URL,
+                expires_in=60,
+                interval=0,
+                client=client,
+                on_progress=progress.append,
+            )
+            assert not client.is_closed
+
+        assert response.json() == {"access_token": "some_token"}
+        assert route.call_count == 3
+        assert [status.error for status in progress] == [
+            "authorization_pending",
+            "authorization_pending",
+            None,
+        ]
+
+    def test_polling_stops_on_access_denied(self, respx_mock):
+        respx_mock.post(POLL_URL).mock(
+            return_value=httpx.Response(400, json={"error": "access_denied"})
+        )
+
+        response = Server().poll_authorize_url(POLL_URL, expires_in=60, interval=0)
+
+        assert response.status_code == 400
+
+    def test_polling_timeout(self, respx_mock):
+        respx_mock.post(POLL_URL).mock(
+            return_value=httpx.Response(400, json={"error": "authorization_pending"})
+        )
+
+        with pytest.raises(TimeoutError):
+            Server().poll_authorize_url(POLL_URL, expires_in=0.05, interval=0.01)
+
+    @pytest.mark.anyio
+    async def test_async_polling_can_be_cancelled(self, respx_mock):
+        respx_mock.post(POLL_URL).mock(
+            return_value=httpx.Response(400, json={"error": "authorization_pending"})
+        )
+
+        async with httpx.AsyncClient() as client:
+            task = asyncio.ensure_future(
+                Server().async_poll_authorize_url(
+                    POLL_URL, expires_in=60, interval=10, client=client
+                )
+            )
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
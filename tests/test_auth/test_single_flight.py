@@ -0,0 +1,69 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import httpx
+import pytest
+
+import vimex
+
+CLIENT_ID = "some_long_id"
+CLIENT_SECRET = "some_very_secret"
+STATE = "vERYlONGsTate"
+
+
+class TestSyncSingleFlight:
+    @mock.patch("vimex.VimeoOAuth2ClientCredentials.send_request")
+    def test_concurrent_callers_share_one_fetch(self, mocked_send_request):
+        def slow_send_request(*args, **kwargs):
+            time.sleep(0.05)
+            return httpx.Response(200, json={"access_token": "some_access_token"})
+
+        mocked_send_request.side_effect = slow_send_request
+        auth = vimex.VimeoOAuth2ClientCredentials(CLIENT_ID, CLIENT_SECRET, STATE)
+
+        with ThreadPoolExecutor(max_workers=20) as executor:
+            tokens = list(executor.map(lambda _: auth.sync_get_token(), range(20)))
+
+        assert tokens == ["some_access_token"] * 20
+        assert mocked_send_request.call_count == 1
+
+    @mock.patch("vimex.VimeoOAuth2ClientCredentials.send_request")
+    def test_waiters_share_a_failed_fetch(self, mocked_send_request):
+        started = threading.Event()
+
+        def slow_send_request(*args, **kwargs):
+            started.set()
+            time.sleep(0.05)
+            return httpx.Response(400)
+
+        mocked_send_request.side_effect = slow_send_request
+        auth = vimex.VimeoOAuth2ClientCredentials(CLIENT_ID, CLIENT_SECRET, STATE)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            first = executor.submit(auth.sync_get_token)
+            started.wait()
+            second = executor.submit(auth.sync_get_token)
+
+        assert first.result() is None
+        assert second.result() is None
+        assert mocked_send_request.call_count == 1
+
+
+@pytest.mark.anyio
+class TestAsyncSingleFlight:
+    @mock.patch("vimex.VimeoOAuth2ClientCredentials.async_send_request")
+    async def test_concurrent_callers_share_one_fetch(self, mocked_async_send_request):
+        async def slow_send_request(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"access_token": "some_access_token"})
+
+        mocked_async_send_request.side_effect = slow_send_request
+        auth = vimex.VimeoOAuth2ClientCredentials(CLIENT_ID, CLIENT_SECRET, STATE)
+
+        tokens = await asyncio.gather(*(auth.async_get_token() for _ in range(200)))
+
+        assert tokens == ["some_access_token"] * 200
+        assert mocked_async_send_request.call_count == 1
@@ -0,0 +1,86 @@
+from unittest import mock
+
+import httpx
+import pytest
+
+import vimex
+from vimex._data_structures import CachedToken
+
+CLIENT_ID = "some_long_id"
+CLIENT_SECRET = "some_very_secret"
+STATE = "vERYlONGsTate"
+API_ROOT = "https://some_website.com"
+
+
+@pytest.fixture(params=["memory", "file", "sqlite"])
+def token_cache(request, tmp_path):
+    if request.param == "memory":
+        return vimex.MemoryTokenCache()
+    if request.param == "file":
+        return vimex.FileTokenCache(str(tmp_path / "tokens.json"))
+    return vimex.SQLiteTokenCache(str(tmp_path / "tokens.sqlite"))
+
+
+class TestTokenCache:
+    def test_get_set_delete(self, token_cache):
+        assert token_cache.get("some_key") is None
+
+        token_cache.set("some_key", CachedToken("some_token", 1234.5))
+        token_cache.set("other_key", CachedToken("other_token"))
+
+        assert token_cache.get("some_key") == CachedToken("some_token", 1234.5)
+        assert token_cache.get("other_key") == CachedToken("other_token", None)
+
+        token_cache.delete("some_key")
+        assert token_cache.get("some_key") is None
+        assert token_cache.get("other_key") == CachedToken("other_token", None)
+
+
+class TestAuthWithTokenCache:
+    @mock.patch("vimex.VimeoOAuth2ClientCredentials.send_request")
+    def test_token_is_shared_through_the_cache(self, mocked_send_request, token_cache):
+        mocked_send_request.return_value = httpx.Response(
+            200, json={"access_token": "some_access_token"}
+        )
+        auth = vimex.VimeoOAuth2ClientCredentials(
+            CLIENT_ID, CLIENT_SECRET, STATE, token_cache=token_cache
+        )
+        next(auth.sync_auth_flow(httpx.Request("GET", API_ROOT)))
+
+        other_auth = vimex.VimeoOAuth2ClientCredentials(
+            CLIENT_ID, CLIENT_SECRET, STATE, token_cache=token_cache
+        )
+        request = next(other_auth.sync_auth_flow(httpx.Request("GET", API_ROOT)))
+
+        assert request.headers["Authorization"] == "Bearer some_access_token"
+        assert mocked_send_request.call_count == 1
+
+    @mock.patch("vimex.VimeoOAuth2ClientCredentials.send_request")
+    def test_cache_key_depends_on_the_scope(self, mocked_send_request, token_cache):
+        token_cache.set(
+            f"{CLIENT_ID}:client_credentials:public private",
+            CachedToken("private_token"),
+        )
+        mocked_send_request.return_value = httpx.Response(
+            200, json={"access_token": "public_token"}
+        )
+        auth = vimex.VimeoOAuth2ClientCredentials(
+            CLIENT_ID, CLIENT_SECRET, STATE, token_cache=token_cache
+        )
+
+        assert auth.sync_get_token() == "public_token"
+
+    @pytest.mark.anyio
+    @mock.patch("vimex.VimeoOAuth2ClientCredentials.async_send_request")
+    async def test_async_token_is_loaded_from_the_cache(
+        self, mocked_async_send_request, token_cache
+    ):
+        token_cache.set(
+            f"{CLIENT_ID}:client_credentials:public", CachedToken("cached_token")
+        )
+        auth = vimex.VimeoOAuth2ClientCredentials(
+            CLIENT_ID, CLIENT_SECRET, STATE, token_cache=token_cache
+        )
+
+        assert await auth.async_get_token() == "cached_token"
+        mocked_async_send_request.assert_not_called()
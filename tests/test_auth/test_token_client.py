@@ -0,0 +1,64 @@
+import httpx
+import pytest
+
+import vimex
+
+CLIENT_ID = "some_long_id"
+CLIENT_SECRET = "some_very_secret"
+STATE = "vERYlONGsTate"
+TOKEN_URL = vimex.VimeoOAuth2ClientCredentials.access_token_url
+
+
+class TestTokenClient:
+    def test_token_requests_reuse_one_client(self, respx_mock):
+        respx_mock.post(TOKEN_URL).mock(
+            return_value=httpx.Response(200, json={"access_token": "some_token"})
+        )
+        auth = vimex.VimeoOAuth2ClientCredentials(CLIENT_ID, CLIENT_SECRET, STATE)
+
+        auth.sync_get_token()
+        http_client = auth.http_client
+        auth.invalidate_token("some_token")
+        auth.sync_get_token()
+
+        assert auth.http_client is http_client
+        assert respx_mock.calls.call_count == 2
+
+        auth.close()
+        assert http_client.is_closed
+
+    def test_given_client_is_used_and_not_closed(self, respx_mock):
+        respx_mock.post(TOKEN_URL).mock(
+            return_value=httpx.Response(200, json={"access_token": "some_token"})
+        )
+        http_client = httpx.Client()
+        auth = vimex.VimeoOAuth2ClientCredentials(
+            CLIENT_ID, CLIENT_SECRET, STATE, http_client=http_client
+        )
+        vimex.VimeoClient(auth=auth)
+
+        assert auth.sync_get_token() == "some_token"
+        assert auth.http_client is http_client
+        auth.close()
+        assert not http_client.is_closed
+
+    def test_vimeo_client_shares_its_connection_pool(self):
+        auth = vimex.VimeoOAuth2ClientCredentials(CLIENT_ID, CLIENT_SECRET, STATE)
+
+        with vimex.VimeoClient(auth=auth) as client:
+            assert auth.http_client._transport is client._transport
+
+        # Bound to the pool of the next client.
+        with vimex.VimeoClient(auth=auth) as client:
+            assert auth.http_client._transport is client._transport
+
+    @pytest.mark.anyio
+    async def test_async_vimeo_client_shares_its_connection_pool(self, respx_mock):
+        respx_mock.post(TOKEN_URL).mock(
+            return_value=httpx.Response(200, json={"access_token": "some_token"})
+        )
+        auth = vimex.VimeoOAuth2ClientCredentials(CLIENT_ID, CLIENT_SECRET, STATE)
+
+        async with vimex.AsyncVimeoClient(auth=auth) as client:
+            assert await auth.async_get_token() == "some_token"
+            assert auth.async_http_client._transport is client._transport
@@ -0,0 +1,112 @@
+import time
+from unittest import mock
+
+import httpx
+import pytest
+
+import vimex
+from vimex._data_structures import CachedToken
+
+CLIENT_ID = "some_long_id"
+CLIENT_SECRET = "some_very_secret"
+STATE = "vERYlONGsTate"
+API_ROOT = "https://some_website.com"
+
+
+def token_responses(*tokens, expires_in=3600):
+    return [
+        httpx.Response(200, json={"access_token": token, "expires_in": expires_in})
+        for token in tokens
+    ]
+
+
+class TestTokenExpiry:
+    @mock.patch("vimex.VimeoOAuth2ClientCredentials.send_request")
+    def test_expiry_is_recorded(self, mocked_send_request):
+        mocked_send_request.side_effect = token_responses("first")
+        auth = vimex.VimeoOAuth2ClientCredentials(CLIENT_ID, CLIENT_SECRET, STATE)
+
+        assert auth.sync_get_token() == "first"
+        assert auth.expires_at == pytest.approx(time.time() + 3600, abs=5)
+
+    @mock.patch("vimex.VimeoOAuth2ClientCredentials.send_request")
+    def test_token_is_refreshed_before_expiry(self, mocked_send_request):
+        mocked_send_request.side_effect = token_responses("first", "second")
+        auth = vimex.VimeoOAuth2ClientCredentials(CLIENT_ID, CLIENT_SECRET, STATE)
+
+        assert auth.sync_get_token() == "first"
+        auth.expires_at = time.time() + auth.refresh_margin / 2
+        assert auth.sync_get_token() == "second"
+
+    @mock.patch("vimex.VimeoOAuth2ClientCredentials.send_request")
+    def test_expired_cached_token_is_ignored(self, mocked_send_request):
+        token_cache = vimex.MemoryTokenCache()
+        auth = vimex.VimeoOAuth2ClientCredentials(
+            CLIENT_ID, CLIENT_SECRET, STATE, token_cache=token_cache
+        )
+        token_cache.set(auth.cache_key, CachedToken("expired", time.time() - 1))
+        mocked_send_request.side_effect = token_responses("fresh")
+
+        assert auth.sync_get_token() == "fresh"
+        assert token_cache.get(auth.cache_key).access_token == "fresh"
+
+    @mock.patch("vimex.VimeoOAuth2ClientCredentials.send_request")
+    def test_request_is_replayed_once_on_401(self, mocked_send_request):
+        mocked_send_request.side_effect = token_responses("revoked", "fresh")
+        auth = vimex.VimeoOAuth2ClientCredentials(CLIENT_ID, CLIENT_SECRET, STATE)
+
+        flow = auth.sync_auth_flow(httpx.Request("GET", API_ROOT))
+        request = next(flow)
+        assert request.headers["Authorization"] == "Bearer revoked"
+
+        request = flow.send(httpx.Response(401))
+        assert request.headers["Authorization"] == "Bearer fresh"
+
+        with pytest.raises(StopIteration):
+            flow.send(httpx.Response(401))
+
+    @mock.patch("vimex.VimeoOAuth2ClientCredentials.send_request")
+    def test_request_is_not_replayed_on_success(self, mocked_send_request):
+        mocked_send_request.side_effect = token_responses("first")
+        auth = vimex.VimeoOAuth2ClientCredentials(CLIENT_ID, CLIENT_SECRET, STATE)
+
+        flow = auth.sync_auth_flow(httpx.Request("GET", API_ROOT))
+        next(flow)
+        with pytest.raises(StopIteration):
+            flow.send(httpx.Response(200))
+
+
+@pytest.mark.anyio
+class TestAsyncTokenRefresh:
+    @mock.patch("vimex.VimeoOAuth2ClientCredentials.async_send_request")
+    async def test_token_is_refreshed_in_background(self, mocked_async_send_request):
+        mocked_async_send_request.side_effect = token_responses("first", "second")
+        auth = vimex.VimeoOAuth2ClientCredentials(CLIENT_ID, CLIENT_SECRET, STATE)
+
+        assert await auth.async_get_token() == "first"
+        auth.expires_at = time.time() + auth.refresh_margin / 2
+
+        # The current token is returned while the refresh runs.
+        assert await auth.async_get_token() == "first"
+        await auth._refresh_task
+        assert await auth.async_get_token() == "second"
+        assert mocked_async_send_request.call_count == 2
+
+    @mock.patch("vimex.VimeoOAuth2ClientCredentials.async_send_request")
+    async def test_expired_token_is_refreshed_inline(self, mocked_async_send_request):
+        mocked_async_send_request.side_effect = token_responses("first", "second")
+        auth = vimex.VimeoOAuth2ClientCredentials(CLIENT_ID, CLIENT_SECRET, STATE)
+
+        assert await auth.async_get_token() == "first"
+        auth.expires_at = time.time() - 1
+        assert await auth.async_get_token() == "second"
+
+    @mock.patch("vimex.VimeoOAuth2ClientCredentials.async_send_request")
+    async def test_request_is_replayed_once_on_401(self, mocked_async_send_request):
+        mocked_async_send_request.side_effect = token_responses("revoked", "fresh")
+        auth = vimex.VimeoOAuth2ClientCredentials(CLIENT_ID, CLIENT_SECRET, STATE)
+
+        flow = auth.async_auth_flow(httpx.Request("GET", API_ROOT))
+        await anext(flow)
+        request = await flow.asend(httpx.Response(401))
+        assert request.headers["Authorization"] == "Bearer fresh"
@@ -0,0 +1,121 @@
+import httpx
+import pytest
+
+import vimex
+
+VIDEOS_URL = "https://api.vimeo.com/videos"
+
+
+def mock_videos(respx_mock, existing, batch_status=200):
+    requests = []
+
+    def list_videos(request: httpx.Request):
+        requests.append(request)
+        if batch_status != 200:
+            return httpx.Response(batch_status)
+        uris = request.url.params["uris"].split(",")
+        return httpx.Response(
+            200, json={"data": [{"uri": uri} for uri in uris if uri in existing]}
+        )
+
+    def get_video(request: httpx.Request):
+        requests.append(request)
+        if request.url.path not in existing:
+            return httpx.Response(404)
+        return httpx.Response(200, json={"uri": request.url.path})
+
+    respx_mock.get(VIDEOS_URL).mock(side_effect=list_videos)
+    respx_mock.get(url__regex=r"https://api.vimeo.com/(videos|users)/\w+").mock(
+        side_effect=get_video
+    )
+    return requests
+
+
+class TestGetMany:
+    def test_videos_are_batched(self, respx_mock):
+        uris = [f"/videos/{i}" for i in range(5)]
+        requests = mock_videos(respx_mock, existing=uris[:4])
+
+        with vimex.VimeoClient() as client:
+            results = dict(client.get_many(uris, fields=["name", "link"], batch_size=2))
+
+        assert results == {
+            **{uri: {"uri": uri} for uri in uris[:4]},
+            "/videos/4": None,
+        }
+        assert len(requests) == 3
+        assert {request.url.params["fields"] for request in requests} == {
+            "name,link,uri"
+        }
+        assert requests[0].url.params["per_page"] == "2"
+
+    def test_other_uris_use_single_gets(self, respx_mock):
+        requests = mock_videos(respx_mock, existing=["/users/1", "/videos/1"])
+
+        with vimex.VimeoClient() as client:
+            results = dict(client.get_many(["/users/1", "/videos/1"]))
+
+        assert results == {
+            "/users/1": {"uri": "/users/1"},
+            "/videos/1": {"uri": "/videos/1"},
+        }
+        assert sorted(request.url.path for request in requests) == [
+            "/users/1",
+            "/videos",
+        ]
+
+    def test_uris_are_consumed_lazily(self, respx_mock):
+        mock_videos(respx_mock, existing=[f"/videos/{i}" for i in range(100)])
+        consumed = []
+
+        def uris():
+            for i in range(100):
+                consumed.append(i)
+                yield f"/videos/{i}"
+
+        with vimex.VimeoClient() as client:
+            results = client.get_many(uris(), batch_size=2, max_concurrency=2)
+            next(results)
+            # The jobs of the running requests, and the next batch.
+            assert len(consumed) <= 7
+            results.close()
+
+    def test_fallback_on_single_gets(self, respx_mock):
+        uris = [f"/videos/{i}" for i in range(3)]
+        requests = mock_videos(respx_mock, existing=uris[:2], batch_status=400)
+
+        with vimex.VimeoClient() as client:
+            results = dict(client.get_many(uris, max_concurrency=2))
+
+        assert results == {
+            "/videos/0": {"uri": "/videos/0"},
+            "/videos/1": {"uri": "/videos/1"},
+            "/videos/2": None,
+        }
+        assert len(requests) == 4
+
+    @pytest.mark.anyio
+    async def test_async_get_many(self, respx_mock):
+        uris = [f"/videos/{i}" for i in range(6)]
+        requests = mock_videos(respx_mock, existing=uris)
+
+        async with vimex.AsyncVimeoClient() as client:
+            results = {
+                uri: item
+                async for uri, item in client.get_many(
+                    uris, fields=["name"], batch_size=4
+                )
+            }
+
+        assert results == {uri: {"uri": uri} for uri in uris}
+        assert len(requests) == 2
+
+    @pytest.mark.anyio
+    async def test_async_fallback_on_single_gets(self, respx_mock):
+        uris = ["/videos/1", "/videos/2"]
+        mock_videos(respx_mock, existing=uris, batch_status=500)
+
+        async with vimex.AsyncVimeoClient() as client:
+            results = {uri: item async for uri, item in client.get_many(uris)}
+
+        assert results == {uri: {"uri": uri} for uri in uris}
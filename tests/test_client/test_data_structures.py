@@ -0,0 +1,106 @@
+import io
+
+import httpx
+import pytest
+
+import vimex
+from vimex._data_structures import ServerFlowResult
+
+VIDEO = {
+    "uri": "/videos/1",
+    "name": "some_video",
+    "duration": 42,
+    "link": "https://vimeo.com/1",
+    "pictures": {"sizes": [{"width": 100}] * 10},
+    "embed": {"html": "<iframe></iframe>"},
+}
+
+
+class TestModels:
+    def test_video_keeps_only_its_fields(self):
+        video = vimex.Video.from_json(VIDEO)
+
+        assert video == vimex.Video(
+            uri="/videos/1",
+            name="some_video",
+            duration=42,
+            link="https://vimeo.com/1",
+        )
+        assert not hasattr(video, "__dict__")
+
+    def test_upload_ticket_unpacking(self):
+        upload_link, uri = vimex.UploadTicket.from_json(
+            {"upload": {"upload_link": "https://upload.com"}, "uri": "/videos/1"}
+        )
+
+        assert (upload_link, uri) == ("https://upload.com", "/videos/1")
+
+    def test_token_response(self):
+        token = vimex.TokenResponse.from_json(
+            {"access_token": "some_token", "token_type": "bearer", "expires_in": 3600}
+        )
+
+        assert token.access_token == "some_token"
+        assert token.expires_in == 3600
+        assert token.scope is None
+
+    def test_page_builds_the_models_lazily(self):
+        page = vimex.Page.from_json(
+            {
+                "total": 2,
+                "page": 1,
+                "per_page": 2,
+                "paging": {"next": "/me/videos?page=2"},
+                "data": [VIDEO, {**VIDEO, "uri": "/videos/2"}],
+            }
+        )
+
+        models = page.iter_models(vimex.Video)
+
+        assert (page.total, page.next) == (2, "/me/videos?page=2")
+        assert [video.uri for video in models] == ["/videos/1", "/videos/2"]
+
+    def test_server_flow_result_is_slotted(self):
+        result = ServerFlowResult(code="some_code")
+
+        assert not hasattr(result, "__dict__")
+        assert result == ServerFlowResult(code="some_code")
+        with pytest.raises(AttributeError):
+            result.other = "value"
+
+
+class TestToColumns:
+    def test_columns(self):
+        videos = [
+            vimex.Video(uri="/videos/1", duration=10),
+            vimex.Video(uri="/videos/2", duration=20),
+        ]
+
+        columns = vimex.to_columns(videos, fields=["uri", "duration"])
+
+        assert columns == {
+            "uri": ["/videos/1", "/videos/2"],
+            "duration": [10, 20],
+        }
+
+    def test_all_fields(self):
+        columns = vimex.to_columns(iter([vimex.Video(uri="/videos/1")]))
+
+        assert list(columns) == list(vimex.Video._fields)
+
+    def test_empty(self):
+        assert vimex.to_columns([], fields=["uri"]) == {"uri": []}
+
+
+def test_create_tus_video_returns_an_upload_ticket(respx_mock):
+    respx_mock.post(vimex.BaseUpload.upload_url).mock(
+        return_value=httpx.Response(
+            200,
+            json={"upload": {"upload_link": "https://upload.com"}, "uri": "/videos/1"},
+        )
+    )
+
+    with vimex.VimeoClient() as client:
+        ticket = client.create_tus_video(io.BytesIO(b"content"), name="some_name")
+
+    assert ticket == vimex.UploadTicket("https://upload.com", "/videos/1")
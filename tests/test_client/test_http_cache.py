@@ -0,0 +1,173 @@
+import gzip
+import os
+import time
+from unittest import mock
+
+import httpx
+import pytest
+
+import vimex
+from vimex._data_structures import CachedResponse
+
+VIDEO_URL = "https://api.vimeo.com/videos/1"
+
+
+@pytest.fixture(params=["memory", "file"])
+def http_cache(request, tmp_path):
+    if request.param == "memory":
+        return vimex.MemoryHTTPCache()
+    return vimex.FileHTTPCache(str(tmp_path / "http_cache"))
+
+
+def mock_video(respx_mock, etag='"v1"'):
+    received = []
+
+    def get_video(request: httpx.Request):
+        received.append(request)
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(
+            200,
+            headers={"ETag": etag, "Content-Encoding": "gzip"},
+            content=gzip.compress(b'{"uri": "/videos/1"}'),
+        )
+
+    respx_mock.get(VIDEO_URL).mock(side_effect=get_video)
+    return received
+
+
+def cached_response(stored_at=None):
+    return CachedResponse(
+        status_code=200,
+        headers=[("ETag", '"v1"')],
+        content=b"{}",
+        stored_at=time.time() if stored_at is None else stored_at,
+    )
+
+
+class TestHTTPCache:
+    def test_lru_eviction(self, http_cache):
+        http_cache.max_entries = 2
+        for key in ("a", "b"):
+            http_cache.set(key, cached_response())
+            time.sleep(0.01)
+        assert http_cache.get("a") is not None
+        time.sleep(0.01)
+
+        http_cache.set("c", cached_response())
+
+        assert http_cache.get("b") is None
+        assert http_cache.get("a") is not None
+        assert http_cache.get("c") is not None
+
+    def test_ttl_eviction(self, http_cache):
+        http_cache.ttl = 60
+        http_cache.set("old", cached_response(stored_at=time.time() - 120))
+        http_cache.set("new", cached_response())
+
+        assert http_cache.get("old") is None
+        assert http_cache.get("new") is not None
+
+    def test_delete(self, http_cache):
+        http_cache.set("a", cached_response())
+        http_cache.delete("a")
+
+        assert http_cache.get("a") is None
+
+
+class TestFileHTTPCache:
+    def test_directory_is_scanned_over_max_entries_only(self, tmp_path):
+        http_cache = vimex.FileHTTPCache(str(tmp_path), max_entries=20)
+        with mock.patch("vimex._http_cache.os.scandir", wraps=os.scandir) as scandir:
+            for index in range(20):
+                http_cache.set(str(index), cached_response())
+            http_cache.set("0", cached_response())
+            assert scandir.call_count == 1
+
+            http_cache.set("20", cached_response())
+            assert scandir.call_count == 2
+
+        assert len(os.listdir(tmp_path)) == 18
+        for index in range(18):
+            http_cache.set(f"new-{index}", cached_response())
+        assert len(os.listdir(tmp_path)) == 18
+
+    def test_count_follows_deletions(self, tmp_path):
+        vimex.FileHTTPCache(str(tmp_path)).set("old", cached_response())
+        http_cache = vimex.FileHTTPCache(str(tmp_path), max_entries=2)
+        http_cache.set("a", cached_response())
+        http_cache.delete("a")
+        http_cache.delete("a")
+        http_cache.set("b", cached_response())
+
+        assert sorted(os.listdir(tmp_path)) == ["b.json", "old.json"]
+
+
+class TestCacheTransport:
+    def test_304_is_served_from_the_cache(self, respx_mock, http_cache):
+        received = mock_video(respx_mock)
+
+        with vimex.VimeoClient(http_cache=http_cache) as client:
+            first = client.get(VIDEO_URL)
+            second = client.get(VIDEO_URL)
+
+        assert first.json() == second.json() == {"uri": "/videos/1"}
+        assert second.status_code == 200
+        assert "If-None-Match" not in received[0].headers
+        assert received[1].headers["If-None-Match"] == '"v1"'
+        assert (http_cache.hits, http_cache.misses) == (1, 1)
+
+    def test_changed_resource_is_replaced(self, respx_mock):
+        http_cache = vimex.MemoryHTTPCache()
+        mock_video(respx_mock, etag='"v1"')
+        with vimex.VimeoClient(http_cache=http_cache) as client:
+            client.get(VIDEO_URL)
+            respx_mock.get(VIDEO_URL).mock(
+                return_value=httpx.Response(
+                    200, headers={"ETag": '"v2"'}, json={"uri": "/videos/2"}
+                )
+            )
+            assert client.get(VIDEO_URL).json() == {"uri": "/videos/2"}
+
+        assert (http_cache.hits, http_cache.misses) == (0, 2)
+        assert [entry.get_header("etag") for entry in http_cache._entries.values()] == [
+            '"v2"'
+        ]
+
+    def test_keyed_by_auth_scope(self, respx_mock):
+        http_cache = vimex.MemoryHTTPCache()
+        received = mock_video(respx_mock)
+
+        for token in ("first_token", "second_token"):
+            with vimex.VimeoClient(
+                http_cache=http_cache, headers={"Authorization": f"Bearer {token}"}
+            ) as client:
+                client.get(VIDEO_URL)
+
+        assert "If-None-Match" not in received[1].headers
+        assert http_cache.misses == 2
+
+    def test_only_get_is_cached(self, respx_mock):
+        http_cache = vimex.MemoryHTTPCache()
+        route = respx_mock.patch(VIDEO_URL).mock(
+            return_value=httpx.Response(200, headers={"ETag": '"v1"'})
+        )
+
+        with vimex.VimeoClient(http_cache=http_cache) as client:
+            client.patch(VIDEO_URL)
+            client.patch(VIDEO_URL)
+
+        assert route.call_count == 2
+        assert (http_cache.hits, http_cache.misses) == (0, 0)
+
+    @pytest.mark.anyio
+    async def test_async_304_is_served_from_the_cache(self, respx_mock, http_cache):
+        received = mock_video(respx_mock)
+
+        async with vimex.AsyncVimeoClient(http_cache=http_cache) as client:
+            await client.get(VIDEO_URL)
+            response = await client.get(VIDEO_URL)
+
+        assert response.json() == {"uri": "/videos/1"}
+        assert received[1].headers["If-None-Match"] == '"v1"'
+        assert (http_cache.hits, http_cache.misses) == (1, 1)
@@ -0,0 +1,58 @@
+import subprocess
+import sys
+
+import pytest
+
+# Dependencies only needed by the callback servers, the sqlite cache and the
+# OpenTelemetry hook.
+LAZY_MODULES = (
+    "uvicorn",
+    "starlette",
+    "webbrowser",
+    "http.server",
+    "sqlite3",
+    "opentelemetry",
+)
+
+
+def get_imported_modules(code: str) -> dict:
+    """
+    Run `code` in a fresh interpreter, return the self import time in
+    microseconds of every imported module.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_time, _, name = line[len("import time:") :].split("|")
+        if self_time.strip().isdigit():
+            modules[name.strip()] = int(self_time)
+    return modules
+
+
+def test_import_vimex_is_lazy():
+    modules = get_imported_modules("import vimex")
+
+    assert "vimex" in modules
+    assert not [
+        name
+        for name in modules
+        if any(name == lazy or name.startswith(f"{lazy}.") for lazy in LAZY_MODULES)
+    ]
+
+
+@pytest.mark.parametrize(
+    "code, module",
+    [
+        ("import vimex; vimex.Server()._server", "uvicorn"),
+        ("import vimex; vimex.SQLiteTokenCache(':memory:')", "sqlite3"),
+    ],
+)
+def test_dependencies_are_loaded_on_use(code, module):
+    assert module in get_imported_modules(code)
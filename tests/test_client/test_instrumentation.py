@@ -0,0 +1,223 @@
+import io
+import time
+from unittest import mock
+
+import httpx
+import pytest
+
+import vimex
+
+API_URL = "https://api.vimeo.com/me"
+UPLOAD_LINK = "https://some-upload-link.com/1234"
+
+
+@pytest.fixture
+def events():
+    return []
+
+
+@pytest.fixture
+def instrumentation(events):
+    return vimex.Instrumentation([events.append])
+
+
+def tus_patch(request: httpx.Request):
+    offset = int(request.headers["Upload-Offset"])
+    return httpx.Response(
+        204, headers={"Upload-Offset": str(offset + len(request.read()))}
+    )
+
+
+class TestInstrumentation:
+    def test_emit_without_hooks(self):
+        vimex.Instrumentation().emit("upload.patch", 1.0, bytes=10)
+
+    def test_emit(self, instrumentation, events):
+        instrumentation.emit("upload.patch", 0.5, bytes=10)
+
+        [event] = events
+        assert event.name == "upload.patch"
+        assert event.value == 0.5
+        assert event.attributes == {"bytes": 10}
+
+    def test_failing_hook_is_logged(self, instrumentation, events, caplog):
+        def hook(event):
+            raise RuntimeError("boom")
+
+        instrumentation.hooks.insert(0, hook)
+        instrumentation.emit("token.fetch", 0.1)
+
+        assert len(events) == 1
+        assert "Instrumentation hook" in caplog.text
+
+
+class TestLatencyHistogram:
+    def test_quantiles(self):
+        histogram = vimex.LatencyHistogram()
+        for ms in range(1, 1001):
+            histogram.record(ms / 1000)
+
+        assert histogram.count == 1000
+        assert histogram.mean == pytest.approx(0.5005)
+        assert histogram.quantile(0.5) == pytest.approx(0.5, rel=2**-7)
+        assert histogram.quantile(0.99) == pytest.approx(0.99, rel=2**-7)
+        assert histogram.quantile(1) == 1.0
+
+    def test_wide_range(self):
+        histogram = vimex.LatencyHistogram()
+        for value in (1e-5, 1e-3, 10, 600):
+            histogram.record(value)
+
+        assert len(histogram.buckets) == 4
+        assert histogram.quantile(0.25) == pytest.approx(1e-5, rel=2**-7)
+        assert histogram.quantile(0.75) == pytest.approx(10, rel=2**-7)
+
+    def test_empty(self):
+        assert vimex.LatencyHistogram().quantile(0.5) is None
+
+
+class TestMetricsCollector:
+    def test_to_prometheus(self):
+        collector = vimex.MetricsCollector()
+        instrumentation = vimex.Instrumentation([collector])
+        instrumentation.emit("upload.patch", 0.5, bytes=100, offset=0)
+        instrumentation.emit("upload.patch", 1.5, bytes=300, offset=100)
+        instrumentation.emit("upload.retry", 1.0, attempt=1)
+        instrumentation.emit("rate_limit.headroom", 42, limit=100)
+
+        assert collector.throughput() == pytest.approx(200)
+        text = collector.to_prometheus()
+        assert "# TYPE vimex_upload_patch_seconds summary\n" in text
+        assert 'vimex_upload_patch_seconds{quantile="0.999"} ' in text
+        assert "vimex_upload_patch_seconds_sum 2.0\n" in text
+        assert "vimex_upload_patch_seconds_count 2\n" in text
+        assert "vimex_upload_patch_bytes_total 400\n" in text
+        assert "vimex_upload_retry_total 1\n" in text
+        assert "vimex_rate_limit_headroom 42\n" in text
+        assert "vimex_upload_patch_total" not in text
+
+    def test_empty(self):
+        assert vimex.MetricsCollector().to_prometheus() == ""
+
+
+class TestOpenTelemetryHook:
+    def test_instruments(self):
+        meter = mock.Mock()
+        hook = vimex.OpenTelemetryHook(meter)
+        instrumentation = vimex.Instrumentation([hook])
+        instrumentation.emit("upload.patch", 0.5, bytes=100)
+        instrumentation.emit("upload.patch", 1.5, bytes=300)
+        instrumentation.emit("upload.retry", 1.0)
+
+        meter.create_histogram.assert_called_once_with(
+            "vimex_upload_patch_seconds", unit="s"
+        )
+        histogram = meter.create_histogram.return_value
+        assert histogram.record.call_args_list == [mock.call(0.5), mock.call(1.5)]
+        assert [call.args[0] for call in meter.create_counter.call_args_list] == [
+            "vimex_upload_patch_bytes",
+            "vimex_upload_retry_total",
+        ]
+
+    def test_default_meter(self):
+        pytest.importorskip("opentelemetry")
+
+        assert vimex.OpenTelemetryHook().meter is not None
+
+
+class TestClientInstrumentation:
+    def test_rate_limit_events(self, respx_mock, monkeypatch, instrumentation, events):
+        monkeypatch.setattr(time, "sleep", lambda delay: None)
+        respx_mock.get(API_URL).side_effect = [
+            httpx.Response(429, headers={"Retry-After": "2"}),
+            httpx.Response(
+                200,
+                headers={"X-RateLimit-Limit": "100", "X-RateLimit-Remaining": "42"},
+            ),
+        ]
+
+        with vimex.VimeoClient(instrumentation=instrumentation) as client:
+            client.get(API_URL)
+
+        assert [(event.name, event.attributes) for event in events] == [
+            ("rate_limit.retry", {"attempt": 1, "host": "api.vimeo.com"}),
+            ("rate_limit.headroom", {"limit": 100}),
+        ]
+        assert events[0].value == pytest.approx(2, abs=0.1)
+        assert events[1].value == 42
+
+    def test_own_instrumentation_is_kept(self, instrumentation):
+        limiter = vimex.RateLimiter(instrumentation=vimex.Instrumentation())
+
+        client = vimex.VimeoClient(rate_limiter=limiter, instrumentation=instrumentation)
+
+        assert client.instrumentation is instrumentation
+        assert limiter.instrumentation is not instrumentation
+
+    @mock.patch("vimex.VimeoOAuth2ClientCredentials.send_request")
+    def test_token_fetch(self, mocked_send_request, instrumentation, events):
+        mocked_send_request.return_value = httpx.Response(
+            200, json={"access_token": "token"}
+        )
+        auth = vimex.VimeoOAuth2ClientCredentials("id", "secret", "state")
+        vimex.VimeoClient(auth=auth, instrumentation=instrumentation)
+
+        auth.sync_get_token()
+
+        [event] = events
+        assert event.name == "token.fetch"
+        assert event.value >= 0
+        assert event.attributes == {
+            "grant_type": "client_credentials",
+            "success": True,
+        }
+
+    @pytest.mark.anyio
+    async def test_async_token_fetch_failure(self, instrumentation, events):
+        auth = vimex.VimeoOAuth2ClientCredentials(
+            "id", "secret", "state", instrumentation=instrumentation
+        )
+        with mock.patch.object(
+            auth, "async_fetch_token", side_effect=httpx.ConnectError("refused")
+        ):
+            with pytest.raises(httpx.ConnectError):
+                await auth.async_get_token()
+
+        [event] = events
+        assert event.attributes["success"] is False
+
+    def test_upload_patches(self, respx_mock, instrumentation, events):
+        respx_mock.patch(UPLOAD_LINK).mock(side_effect=tus_patch)
+        client = vimex.VimeoClient(instrumentation=instrumentation)
+        uploader = client.get_tus_uploader(io.BytesIO(b"Hello World!"), UPLOAD_LINK)
+
+        list(uploader.chunks_upload(5))
+
+        assert [(event.name, event.attributes) for event in events] == [
+            ("upload.patch", {"bytes": 5, "offset": 0, "status_code": 204}),
+            ("upload.patch", {"bytes": 5, "offset": 5, "status_code": 204}),
+            ("upload.patch", {"bytes": 2, "offset": 10, "status_code": 204}),
+        ]
+
+    @pytest.mark.anyio
+    async def test_async_upload_retry(self, respx_mock, instrumentation, events):
+        respx_mock.patch(UPLOAD_LINK).side_effect = [httpx.Response(503), tus_patch]
+        respx_mock.head(UPLOAD_LINK).mock(
+            return_value=httpx.Response(200, headers={"Upload-Offset": "0"})
+        )
+        client = vimex.AsyncVimeoClient(instrumentation=instrumentation)
+        uploader = client.get_tus_uploader(
+            io.BytesIO(b"Hello World!"),
+            UPLOAD_LINK,
+            retry_policy=vimex.RetryPolicy(backoff_factor=0),
+        )
+
+        await uploader.upload()
+
+        assert [event.name for event in events] == [
+            "upload.patch",
+            "upload.retry",
+            "upload.patch",
+        ]
+        assert events[1].attributes == {"attempt": 1, "status_code": 503}
+        assert events[2].attributes["bytes"] == 12
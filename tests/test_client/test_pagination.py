@@ -0,0 +1,190 @@
+import httpx
+import pytest
+
+import vimex
+
+VIDEOS_URL = "https://api.vimeo.com/me/videos"
+
+
+def mock_pages(respx_mock, pages: int, per_page: int = 2):
+    requested = []
+
+    def list_videos(request: httpx.Request):
+        page = int(request.url.params.get("page", 1))
+        requested.append(page)
+        if page > pages:
+            return httpx.Response(404, json={"error": "Page not found"})
+        return httpx.Response(
+            200,
+            json={
+                "total": pages * per_page,
+                "page": page,
+                "per_page": per_page,
+                "paging": {
+                    "next": f"/me/videos?page={page + 1}&per_page={per_page}"
+                    if page < pages
+                    else None,
+                },
+                "data": [
+                    {"uri": f"/videos/{(page - 1) * per_page + index}"}
+                    for index in range(per_page)
+                ],
+            },
+        )
+
+    respx_mock.get(url__startswith=VIDEOS_URL).mock(side_effect=list_videos)
+    return requested
+
+
+class TestSyncPagination:
+    @pytest.mark.parametrize("prefetch", [0, 1, 3])
+    def test_paginate(self, respx_mock, prefetch):
+        requested = mock_pages(respx_mock, pages=4)
+
+        with vimex.VimeoClient() as client:
+            items = list(
+                client.paginate(VIDEOS_URL, params={"per_page": 2}, prefetch=prefetch)
+            )
+
+        assert [item["uri"] for item in items] == [f"/videos/{i}" for i in range(8)]
+        assert requested == [1, 2, 3, 4]
+
+    def test_paginate_models(self, respx_mock):
+        mock_pages(respx_mock, pages=2)
+
+        with vimex.VimeoClient() as client:
+            videos = list(client.paginate(VIDEOS_URL, model=vimex.Video))
+
+        assert videos == [vimex.Video(uri=f"/videos/{i}") for i in range(4)]
+
+    def test_prefetch_is_bounded(self, respx_mock):
+        requested = mock_pages(respx_mock, pages=10)
+
+        with vimex.VimeoClient() as client:
+            items = client.paginate(VIDEOS_URL, prefetch=2)
+            next(items)
+            items.close()
+
+        # The consumed page, the prefetched ones and the one waiting for room.
+        assert len(requested) <= 4
+
+    def test_error_is_raised(self, respx_mock):
+        respx_mock.get(VIDEOS_URL).mock(return_value=httpx.Response(500))
+
+        with vimex.VimeoClient(rate_limiter=False) as client:
+            with pytest.raises(httpx.HTTPStatusError):
+                list(client.paginate(VIDEOS_URL))
+
+
+class TestAsyncPagination:
+    @pytest.mark.anyio
+    @pytest.mark.parametrize("prefetch", [0, 2])
+    async def test_paginate(self, respx_mock, prefetch):
+        requested = mock_pages(respx_mock, pages=3)
+
+        async with vimex.AsyncVimeoClient() as client:
+            items = [
+                item async for item in client.paginate(VIDEOS_URL, prefetch=prefetch)
+            ]
+
+        assert [item["uri"] for item in items] == [f"/videos/{i}" for i in range(6)]
+        assert requested == [1, 2, 3]
+
+    @pytest.mark.anyio
+    async def test_stop_cancels_the_prefetch(self, respx_mock):
+        requested = mock_pages(respx_mock, pages=10)
+
+        async with vimex.AsyncVimeoClient() as client:
+            items = client.paginate(VIDEOS_URL, prefetch=1)
+            await items.__anext__()
+            await items.aclose()
+
+        assert len(requested) <= 3
+
+    @pytest.mark.anyio
+    async def test_error_is_raised(self, respx_mock):
+        respx_mock.get(VIDEOS_URL).mock(return_value=httpx.Response(500))
+
+        async with vimex.AsyncVimeoClient(rate_limiter=False) as client:
+            with pytest.raises(httpx.HTTPStatusError):
+                [item async for item in client.paginate(VIDEOS_URL)]
+
+
+class TestConcurrentPagination:
+    @pytest.mark.parametrize("ordered", [True, False])
+    def test_paginate_concurrently(self, respx_mock, ordered):
+        requested = mock_pages(respx_mock, pages=6)
+
+        with vimex.VimeoClient() as client:
+            items = list(
+                client.paginate_concurrently(
+                    VIDEOS_URL,
+                    params={"per_page": 2},
+                    max_concurrency=3,
+                    ordered=ordered,
+                )
+            )
+
+        uris = [item["uri"] for item in items]
+        expected = [f"/videos/{i}" for i in range(12)]
+        assert (uris if ordered else sorted(uris, key=expected.index)) == expected
+        assert sorted(requested) == [1, 2, 3, 4, 5, 6]
+
+    def test_page_urls(self):
+        response = httpx.Response(
+            200, request=httpx.Request("GET", f"{VIDEOS_URL}?per_page=10")
+        )
+
+        urls = vimex.VimeoClient.get_page_urls(
+            response, {"total": 35, "per_page": 10, "page": 1}
+        )
+
+        assert [url.params["page"] for url in urls] == ["2", "3", "4"]
+        assert all(url.params["per_page"] == "10" for url in urls)
+
+    def test_fallback_on_paging_next(self, respx_mock):
+        def list_videos(request: httpx.Request):
+            page = int(request.url.params.get("page", 1))
+            return httpx.Response(
+                200,
+                json={
+                    "paging": {"next": "/me/videos?page=2" if page == 1 else None},
+                    "data": [{"uri": f"/videos/{page}"}],
+                },
+            )
+
+        respx_mock.get(url__startswith=VIDEOS_URL).mock(side_effect=list_videos)
+
+        with vimex.VimeoClient() as client:
+            items = list(client.paginate_concurrently(VIDEOS_URL))
+
+        assert [item["uri"] for item in items] == ["/videos/1", "/videos/2"]
+
+    @pytest.mark.anyio
+    @pytest.mark.parametrize("ordered", [True, False])
+    async def test_async_paginate_concurrently(self, respx_mock, ordered):
+        requested = mock_pages(respx_mock, pages=5)
+
+        async with vimex.AsyncVimeoClient() as client:
+            uris = [
+                item["uri"]
+                async for item in client.paginate_concurrently(
+                    VIDEOS_URL, max_concurrency=2, ordered=ordered
+                )
+            ]
+
+        expected = [f"/videos/{i}" for i in range(10)]
+        assert (uris if ordered else sorted(uris, key=expected.index)) == expected
+        assert sorted(requested) == [1, 2, 3, 4, 5]
+
+    @pytest.mark.anyio
+    async def test_async_stop_cancels_the_pages(self, respx_mock):
+        requested = mock_pages(respx_mock, pages=20)
+
+        async with vimex.AsyncVimeoClient() as client:
+            items = client.paginate_concurrently(VIDEOS_URL, max_concurrency=2)
+            await items.__anext__()
+            await items.aclose()
+
+        # The first page and at most one window of pages.
+        assert len(requested) <= 3
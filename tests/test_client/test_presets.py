@@ -0,0 +1,46 @@
+import httpx
+import pytest
+
+import vimex
+from vimex import _presets
+from vimex._presets import PRESETS, get_preset_kwargs
+
+
+class TestPresets:
+    @pytest.mark.parametrize("preset", ["api-heavy", "upload-heavy"])
+    def test_preset_settings(self, preset):
+        kwargs = get_preset_kwargs(preset, {})
+
+        assert kwargs["limits"] is PRESETS[preset].limits
+        assert kwargs["timeout"] is PRESETS[preset].timeout
+
+    def test_explicit_arguments_win(self):
+        timeout = httpx.Timeout(1.0)
+
+        kwargs = get_preset_kwargs("api-heavy", {"timeout": timeout})
+
+        assert kwargs["timeout"] is timeout
+
+    def test_http2_requires_h2(self, monkeypatch):
+        monkeypatch.setattr(_presets, "is_http2_available", lambda: False)
+
+        assert get_preset_kwargs("api-heavy", {})["http2"] is False
+
+    def test_http2_when_available(self, monkeypatch):
+        monkeypatch.setattr(_presets, "is_http2_available", lambda: True)
+
+        assert get_preset_kwargs("api-heavy", {})["http2"] is True
+        assert get_preset_kwargs("upload-heavy", {})["http2"] is False
+
+    def test_unknown_preset(self):
+        with pytest.raises(ValueError):
+            vimex.VimeoClient(preset="unknown")
+
+    def test_no_preset(self):
+        assert get_preset_kwargs(None, {"timeout": 1}) == {"timeout": 1}
+
+    def test_client(self, monkeypatch):
+        monkeypatch.setattr(_presets, "is_http2_available", lambda: False)
+
+        with vimex.VimeoClient(preset="upload-heavy") as client:
+            assert client.timeout == PRESETS["upload-heavy"].timeout
@@ -0,0 +1,208 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+
+import vimex
+from vimex._rate_limit import parse_rate_limit_reset
+
+API_URL = "https://api.vimeo.com/me"
+
+
+def rate_limit_headers(remaining, reset_in=60.0, limit=100):
+    return {
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": datetime.fromtimestamp(
+            time.time() + reset_in, timezone.utc
+        ).isoformat(),
+    }
+
+
+class TestParseRateLimitReset:
+    def test_iso_date(self):
+        assert parse_rate_limit_reset("2013-11-14T14:39:42+00:00") == 1384439982
+
+    def test_epoch(self):
+        assert parse_rate_limit_reset("1384439982") == 1384439982
+
+    def test_delay(self):
+        assert parse_rate_limit_reset("30") == pytest.approx(time.time() + 30, abs=1)
+
+    def test_invalid(self):
+        assert parse_rate_limit_reset("soon") is None
+
+
+class TestRateLimiter:
+    def test_budget_is_tracked(self):
+        limiter = vimex.RateLimiter()
+
+        assert limiter.reserve() == 0
+        limiter.update(httpx.Response(200, headers=rate_limit_headers(42)))
+
+        assert limiter.limit == 100
+        assert limiter.remaining == 42
+        assert limiter.throttle.rate == pytest.approx(42 / 60, rel=0.05)
+
+    def test_in_flight_requests_are_counted(self):
+        limiter = vimex.RateLimiter()
+        limiter.reserve()
+        limiter.reserve()
+
+        limiter.update(httpx.Response(200, headers=rate_limit_headers(10)))
+
+        assert limiter.remaining == 9
+
+    def test_exhausted_budget_waits_for_the_reset(self):
+        limiter = vimex.RateLimiter()
+        limiter.reserve()
+        limiter.update(httpx.Response(200, headers=rate_limit_headers(0, 30)))
+
+        assert limiter.reserve() == pytest.approx(30, abs=1)
+
+    def test_queued_requests_wait_for_the_reset_only(self, monkeypatch):
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now)
+        limiter = vimex.RateLimiter()
+        limiter.reserve()
+        limiter.update(httpx.Response(200, headers=rate_limit_headers(2, 60)))
+        limiter.reserve()
+        limiter.update(httpx.Response(200, headers=rate_limit_headers(0, 60)))
+
+        delays = [limiter.reserve() for _ in range(15)]
+
+        assert delays == [pytest.approx(60, abs=1)] * 15
+
+        # After the reset the stale pace is dropped until the next headers.
+        now += 61
+        assert [limiter.reserve() for _ in range(15)] == [0] * 15
+        assert limiter.throttle is None
+
+    def test_configured_rate_is_restored_after_the_reset(self, monkeypatch):
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now)
+        limiter = vimex.RateLimiter(rate=1000, burst=5)
+        limiter.reserve()
+        limiter.update(httpx.Response(200, headers=rate_limit_headers(2, 60)))
+
+        now += 61
+        limiter.reserve()
+
+        assert limiter.throttle.rate == 1000
+        assert limiter.remaining is None
+
+    def test_retry_after_blocks_every_request(self):
+        limiter = vimex.RateLimiter()
+
+        delay = limiter.get_retry_delay(
+            httpx.Response(429, headers={"Retry-After": "5"})
+        )
+
+        assert delay == pytest.approx(5, abs=0.1)
+        assert limiter.reserve() == pytest.approx(5, abs=0.1)
+
+    def test_pacing(self):
+        limiter = vimex.RateLimiter(rate=10, burst=1)
+
+        assert limiter.reserve() == 0
+        assert limiter.reserve() == pytest.approx(0.1, abs=0.01)
+
+    def test_thread_safety(self):
+        limiter = vimex.RateLimiter()
+        limiter.reserve()
+        limiter.update(httpx.Response(200, headers=rate_limit_headers(1000, 3600)))
+
+        def reserve():
+            for _ in range(100):
+                limiter.reserve()
+
+        threads = [threading.Thread(target=reserve) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert limiter.remaining == 200
+
+
+class TestVimeoClientRateLimit:
+    def test_headers_are_tracked(self, respx_mock):
+        respx_mock.get(API_URL).mock(
+            return_value=httpx.Response(200, headers=rate_limit_headers(99))
+        )
+
+        with vimex.VimeoClient() as client:
+            client.get(API_URL)
+
+        assert client.rate_limiter.remaining == 99
+
+    def test_429_is_retried_after_retry_after(self, respx_mock, monkeypatch):
+        sleeps = []
+        monkeypatch.setattr(time, "sleep", sleeps.append)
+        route = respx_mock.get(API_URL)
+        route.side_effect = [
+            httpx.Response(429, headers={"Retry-After": "2"}),
+            httpx.Response(200),
+        ]
+
+        with vimex.VimeoClient() as client:
+            response = client.get(API_URL)
+
+        assert response.status_code == 200
+        assert route.call_count == 2
+        assert sleeps == [pytest.approx(2, abs=0.1)]
+
+    def test_retries_are_bounded(self, respx_mock, monkeypatch):
+        monkeypatch.setattr(time, "sleep", lambda delay: None)
+        route = respx_mock.get(API_URL).mock(
+            return_value=httpx.Response(429, headers={"Retry-After": "1"})
+        )
+
+        with vimex.VimeoClient(rate_limiter=vimex.RateLimiter(max_retries=2)) as client:
+            response = client.get(API_URL)
+
+        assert response.status_code == 429
+        assert route.call_count == 3
+
+    def test_other_hosts_are_not_limited(self, respx_mock):
+        route = respx_mock.get("https://upload.com/video").mock(
+            return_value=httpx.Response(429)
+        )
+
+        with vimex.VimeoClient() as client:
+            client.get("https://upload.com/video")
+
+        assert route.call_count == 1
+
+    def test_disabled(self, respx_mock):
+        route = respx_mock.get(API_URL).mock(return_value=httpx.Response(429))
+
+        with vimex.VimeoClient(rate_limiter=False) as client:
+            client.get(API_URL)
+
+        assert client.rate_limiter is None
+        assert route.call_count == 1
+
+    @pytest.mark.anyio
+    async def test_async_429_is_retried(self, respx_mock, monkeypatch):
+        sleeps = []
+
+        async def sleep(delay):
+            sleeps.append(delay)
+
+        monkeypatch.setattr(asyncio, "sleep", sleep)
+        route = respx_mock.get(API_URL)
+        route.side_effect = [
+            httpx.Response(429, headers={"Retry-After": "3"}),
+            httpx.Response(200, headers=rate_limit_headers(50)),
+        ]
+
+        async with vimex.AsyncVimeoClient() as client:
+            response = await client.get(API_URL)
+
+        assert response.status_code == 200
+        assert sleeps == [pytest.approx(3, abs=0.1)]
+        assert client.rate_limiter.remaining == 50
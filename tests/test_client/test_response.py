@@ -0,0 +1,75 @@
+import json
+import sys
+
+import httpx
+import pytest
+
+import vimex
+from vimex import _response
+from vimex._response import DecodedResponse, get_json_loads
+
+
+@pytest.fixture
+def counted_loads(monkeypatch):
+    calls = []
+
+    def loads(content):
+        calls.append(content)
+        return json.loads(content)
+
+    monkeypatch.setattr(_response, "get_json_loads", lambda: loads)
+    return calls
+
+
+class TestDecodedResponse:
+    def test_json_is_decoded_once(self, counted_loads):
+        response = DecodedResponse(
+            httpx.Response(200, json={"upload": {"upload_link": "link"}, "uri": "/1"})
+        )
+
+        assert response.get("upload", "upload_link") == "link"
+        assert response.get("uri") == "/1"
+        assert len(counted_loads) == 1
+
+    def test_missing_path(self):
+        response = DecodedResponse(httpx.Response(200, json={"uri": "/1"}))
+
+        with pytest.raises(KeyError):
+            response.get("upload", "upload_link")
+
+    def test_wrap(self):
+        response = DecodedResponse(httpx.Response(200))
+
+        assert DecodedResponse.wrap(response) is response
+
+    def test_get_value_from_response_decodes_once(self, counted_loads):
+        response = DecodedResponse(
+            httpx.Response(200, json={"upload": {"upload_link": "link"}, "uri": "/1"})
+        )
+
+        vimex.BaseUpload.get_value_from_response(response, "upload", "upload_link")
+        vimex.BaseUpload.get_value_from_response(response, "uri")
+
+        assert len(counted_loads) == 1
+
+    def test_error_response(self):
+        with pytest.raises(vimex.UploadException):
+            vimex.BaseUpload.get_value_from_response(
+                httpx.Response(400, json={"error": "some_error"}), "uri"
+            )
+
+
+class TestJsonLoads:
+    def test_standard_library_fallback(self, monkeypatch):
+        get_json_loads.cache_clear()
+        monkeypatch.setitem(sys.modules, "orjson", None)
+        monkeypatch.setitem(sys.modules, "ujson", None)
+        try:
+            assert get_json_loads() is json.loads
+        finally:
+            get_json_loads.cache_clear()
+
+    def test_orjson_is_preferred(self):
+        orjson = pytest.importorskip("orjson")
+
+        assert get_json_loads() is orjson.loads
@@ -0,0 +1,142 @@
+import io
+import json
+
+import httpx
+import pytest
+
+import vimex
+
+
+UPLOAD_URL = vimex.BaseUpload.upload_url
+
+
+def mock_vimeo_upload(respx_mock, received: list):
+    def create_video(request: httpx.Request):
+        name = json.loads(request.content)["name"]
+        if name == "broken":
+            return httpx.Response(400, json={"details": "some_error"})
+        return httpx.Response(
+            200,
+            json={
+                "upload": {"upload_link": f"https://upload.com/{name}"},
+                "uri": f"/videos/{name}",
+            },
+        )
+
+    def patch(request: httpx.Request):
+        offset = int(request.headers["Upload-Offset"])
+        content = request.read()
+        received.append(request.url.path.strip("/"))
+        return httpx.Response(
+            204, headers={"Upload-Offset": str(offset + len(content))}
+        )
+
+    respx_mock.post(UPLOAD_URL).mock(side_effect=create_video)
+    respx_mock.patch(url__startswith="https://upload.com/").mock(side_effect=patch)
+
+
+def get_items():
+    return [
+        vimex.BatchItem(io.BytesIO(b"first"), {"name": "first"}, priority=2),
+        vimex.BatchItem(io.BytesIO(b"second"), {"name": "second"}, priority=1),
+        vimex.BatchItem(io.BytesIO(b"broken"), {"name": "broken"}, priority=3),
+        vimex.BatchItem(io.BytesIO(b"third"), {"name": "third"}, priority=0),
+    ]
+
+
+class TestBatchUploader:
+    def test_upload_in_priority_order(self, respx_mock):
+        received = []
+        mock_vimeo_upload(respx_mock, received)
+        batch = vimex.BatchUploader(vimex.VimeoClient(), max_in_flight=1)
+
+        results = list(batch.upload(get_items()))
+
+        assert received == ["third", "second", "first"]
+        assert [result.uri for result in results] == [
+            "/videos/third",
+            "/videos/second",
+            "/videos/first",
+            None,
+        ]
+        assert [result.is_success for result in results] == [True, True, True, False]
+        assert isinstance(results[-1].error, vimex.UploadException)
+
+    def test_upload_in_chunks_with_bandwidth_cap(self, respx_mock):
+        received = []
+        mock_vimeo_upload(respx_mock, received)
+        batch = vimex.BatchUploader(
+            vimex.VimeoClient(),
+            max_in_flight=2,
+            max_bytes_per_second=1024 * 1024,
+            chunk_size=2,
+        )
+
+        results = list(batch.upload(get_items()))
+
+        assert sorted(received) == ["first"] * 3 + ["second"] * 3 + ["third"] * 3
+        assert len(results) == 4
+
+    def test_upload_with_prefetched_tickets(self, respx_mock):
+        received = []
+        mock_vimeo_upload(respx_mock, received)
+        batch = vimex.BatchUploader(
+            vimex.VimeoClient(), max_in_flight=1, prefetch_tickets=2
+        )
+
+        results = list(batch.upload(get_items()))
+
+        assert received == ["third", "second", "first"]
+        assert [result.uri for result in results] == [
+            "/videos/third",
+            "/videos/second",
+            "/videos/first",
+            None,
+        ]
+
+
+    def test_upload_streams_without_metadata(self, respx_mock, tmp_path):
+        received = []
+        mock_vimeo_upload(respx_mock, received)
+        path = tmp_path / "named"
+        path.write_bytes(b"named")
+        batch = vimex.BatchUploader(vimex.VimeoClient(), max_in_flight=1)
+
+        with open(path, "rb") as named:
+            results = list(batch.upload([io.BytesIO(b"hello"), named]))
+
+        assert [result.uri for result in results] == [
+            "/videos/Untitled",
+            "/videos/named",
+        ]
+        assert all(result.is_success for result in results)
+
+@pytest.mark.anyio
+class TestAsyncBatchUploader:
+    async def test_upload(self, respx_mock):
+        received = []
+        mock_vimeo_upload(respx_mock, received)
+        batch = vimex.AsyncBatchUploader(vimex.AsyncVimeoClient(), max_in_flight=1)
+
+        results = [result async for result in batch.upload(get_items())]
+
+        assert received == ["third", "second", "first"]
+        assert sorted(result.uri or "" for result in results) == [
+            "",
+            "/videos/first",
+            "/videos/second",
+            "/videos/third",
+        ]
+
+    async def test_upload_with_prefetched_tickets(self, respx_mock):
+        received = []
+        mock_vimeo_upload(respx_mock, received)
+        batch = vimex.AsyncBatchUploader(
+            vimex.AsyncVimeoClient(), max_in_flight=1, prefetch_tickets=2
+        )
+
+        results = [result async for result in batch.upload(get_items())]
+
+        assert received == ["third", "second", "first"]
+        assert len(results) == 4
+        assert respx_mock.calls.call_count == 7
@@ -1,9 +1,23 @@
+import asyncio
 import io
+import json
+import threading
+from unittest import mock
 
 import httpx
 import pytest
 
 import vimex
+from vimex._throttle import Throttle
+from vimex._utils import get_file_fingerprint
+from vimex._streams import (
+    AsyncRangeStream,
+    ChunkSource,
+    ChunkStream,
+    MmapChunkSource,
+    RangeStream,
+    get_chunk_source,
+)
 
 
 class TestSyncTusUpload:
@@ -35,3 +49,750 @@ class TestSyncTusUpload:
             client.create_upload_link(stream, "tus")
         # assert upload_link == "some_upload_link"
         # assert uri == "some_upload_uri"
+
+
+def tus_patch_side_effect(received: list):
+    def side_effect(request: httpx.Request):
+        offset = int(request.headers["Upload-Offset"])
+        content = request.read()
+        received.append((offset, content))
+        return httpx.Response(
+            204, headers={"Upload-Offset": str(offset + len(content))}
+        )
+
+    return side_effect
+
+
+class TestSyncTusUploader:
+    upload_link = "https://some-upload-link.com/1234"
+
+    @pytest.mark.parametrize("read_ahead", [False, True])
+    def test_chunks_upload(self, respx_mock, read_ahead):
+        received = []
+        respx_mock.patch(self.upload_link).mock(
+            side_effect=tus_patch_side_effect(received)
+        )
+        client = vimex.VimeoClient()
+        uploader = client.get_tus_uploader(
+            io.BytesIO(b"Hello World!"), self.upload_link
+        )
+
+        responses = list(uploader.chunks_upload(5, read_ahead=read_ahead))
+
+        assert len(responses) == 3
+        assert received == [(0, b"Hello"), (5, b" Worl"), (10, b"d!")]
+        assert uploader.upload_offset == 12
+
+    def test_chunks_upload_with_read_ahead_and_partial_patch(self, respx_mock):
+        received = []
+
+        def side_effect(request: httpx.Request):
+            offset = int(request.headers["Upload-Offset"])
+            content = request.read()
+            received.append((offset, content))
+            # Accept only the first 3 bytes of every chunk.
+            return httpx.Response(204, headers={"Upload-Offset": str(offset + 3)})
+
+        respx_mock.patch(self.upload_link).mock(side_effect=side_effect)
+        client = vimex.VimeoClient()
+        uploader = client.get_tus_uploader(
+            io.BytesIO(b"Hello World!"), self.upload_link
+        )
+
+        list(uploader.chunks_upload(5, read_ahead=True))
+
+        assert received == [
+            (0, b"Hello"),
+            (3, b"lo Wo"),
+            (6, b"World"),
+            (9, b"ld!"),
+        ]
+
+    def test_chunks_upload_from_memory_mapped_file(self, respx_mock, tmp_path):
+        path = tmp_path / "video.mp4"
+        path.write_bytes(b"Hello World!")
+        received = []
+        respx_mock.patch(self.upload_link).mock(
+            side_effect=tus_patch_side_effect(received)
+        )
+        client = vimex.VimeoClient()
+        uploader = client.get_tus_uploader(str(path), self.upload_link)
+
+        assert isinstance(uploader.chunk_source, MmapChunkSource)
+        list(uploader.chunks_upload(5))
+        uploader.close()
+
+        assert received == [(0, b"Hello"), (5, b" Worl"), (10, b"d!")]
+
+    def test_upload_streams_the_file(self, respx_mock):
+        received = []
+        respx_mock.patch(self.upload_link).mock(
+            side_effect=tus_patch_side_effect(received)
+        )
+        client = vimex.VimeoClient()
+        uploader = client.get_tus_uploader(
+            io.BytesIO(b"Hello World!"), self.upload_link, chunk_size=5
+        )
+        uploader.upload_buffer_size = 5
+        progress = []
+
+        response = uploader.upload(on_progress=progress.append)
+
+        assert response.request.headers["Content-Length"] == "12"
+        assert received == [(0, b"Hello World!")]
+        assert progress == [5, 10, 12]
+        assert uploader.upload_offset == 12
+
+    @pytest.mark.parametrize("read_ahead", [False, True])
+    def test_chunks_upload_with_adaptive_chunk_size(self, respx_mock, read_ahead):
+        received = []
+        respx_mock.patch(self.upload_link).mock(
+            side_effect=tus_patch_side_effect(received)
+        )
+        client = vimex.VimeoClient()
+        uploader = client.get_tus_uploader(
+            io.BytesIO(b"Hello World!"), self.upload_link
+        )
+        adaptive = vimex.AdaptiveChunkSize(initial=2, minimum=2, maximum=4)
+
+        list(uploader.chunks_upload(adaptive=adaptive, read_ahead=read_ahead))
+
+        assert uploader.chunk_sizes == [2, 4, 4, 2]
+        assert b"".join(content for _, content in received) == b"Hello World!"
+        assert len(adaptive.samples) == 4
+
+    def test_read_ahead_follows_a_shrinking_chunk_size(self, respx_mock):
+        received = []
+        respx_mock.patch(self.upload_link).mock(
+            side_effect=tus_patch_side_effect(received)
+        )
+        client = vimex.VimeoClient()
+        uploader = client.get_tus_uploader(
+            io.BytesIO(b"Hello World!"), self.upload_link
+        )
+        adaptive = vimex.AdaptiveChunkSize(initial=4, minimum=2, maximum=4)
+        sizes = iter([2, 2, 2, 2, 2])
+        adaptive.update = lambda size, elapsed: next(sizes)
+
+        list(uploader.chunks_upload(adaptive=adaptive, read_ahead=True))
+
+        assert uploader.chunk_sizes == [4, 2, 2, 2, 2]
+        assert b"".join(content for _, content in received) == b"Hello World!"
+
+
+class TestAdaptiveChunkSize:
+    def test_grows_on_fast_requests(self):
+        adaptive = vimex.AdaptiveChunkSize(
+            initial=100, minimum=10, maximum=1000, target_duration=1.0
+        )
+        assert adaptive.update(100, 0.01) == 200
+        assert adaptive.update(200, 0.01) == 400
+        assert adaptive.update(400, 0.01) == 800
+        assert adaptive.update(800, 0.01) == 1000
+
+    def test_shrinks_on_slow_requests(self):
+        adaptive = vimex.AdaptiveChunkSize(
+            initial=100, minimum=30, maximum=1000, target_duration=1.0
+        )
+        assert adaptive.update(100, 1.25) == 80
+        assert adaptive.update(80, 10) == 40
+        assert adaptive.update(40, 10) == 30
+
+    def test_invalid_bounds(self):
+        with pytest.raises(ValueError):
+            vimex.AdaptiveChunkSize(minimum=10, maximum=5)
+
+
+class TestTusUploadResume:
+    upload_link = "https://some-upload-link.com/1234"
+
+    def test_resume_fetches_the_server_offset(self, respx_mock):
+        received = []
+        respx_mock.head(self.upload_link).mock(
+            return_value=httpx.Response(200, headers={"Upload-Offset": "6"})
+        )
+        respx_mock.patch(self.upload_link).mock(
+            side_effect=tus_patch_side_effect(received)
+        )
+        client = vimex.VimeoClient()
+        uploader = client.get_tus_uploader(
+            io.BytesIO(b"Hello World!"), self.upload_link
+        )
+
+        assert uploader.resume() == 6
+        list(uploader.chunks_upload(5))
+
+        assert received == [(6, b"World"), (11, b"!")]
+
+    def test_resume_expired_upload_link(self, respx_mock, tmp_path):
+        journal = vimex.UploadJournal(str(tmp_path / "journal.json"))
+        stream = io.BytesIO(b"Hello World!")
+        respx_mock.head(self.upload_link).mock(return_value=httpx.Response(404))
+        client = vimex.VimeoClient()
+        uploader = client.get_tus_uploader(stream, self.upload_link, journal=journal)
+        uploader.save_offset()
+
+        with pytest.raises(vimex.UploadException):
+            uploader.resume()
+        assert journal.get(uploader.fingerprint) is None
+
+    def test_journal_records_the_offset(self, respx_mock, tmp_path):
+        journal = vimex.UploadJournal(str(tmp_path / "journal.json"))
+        stream = io.BytesIO(b"Hello World!")
+        received = []
+        respx_mock.patch(self.upload_link).mock(
+            side_effect=tus_patch_side_effect(received)
+        )
+        client = vimex.VimeoClient()
+        uploader = client.get_tus_uploader(stream, self.upload_link, journal=journal)
+        chunks = uploader.chunks_upload(5)
+
+        next(chunks)
+        assert journal.get(uploader.fingerprint) == {
+            "upload_link": self.upload_link,
+            "offset": 5,
+        }
+
+        list(chunks)
+        assert journal.get(uploader.fingerprint) is None
+
+    def test_resume_tus_uploader_from_journal(self, respx_mock, tmp_path):
+        journal = vimex.UploadJournal(str(tmp_path / "journal.json"))
+        path = tmp_path / "video.mp4"
+        path.write_bytes(b"Hello World!")
+        journal.save(get_file_fingerprint(str(path)), self.upload_link, 5)
+        respx_mock.head(self.upload_link).mock(
+            return_value=httpx.Response(200, headers={"Upload-Offset": "10"})
+        )
+        client = vimex.VimeoClient()
+
+        uploader = client.resume_tus_uploader(str(path), journal)
+
+        assert uploader.upload_link == self.upload_link
+        assert uploader.upload_offset == 10
+        assert client.resume_tus_uploader(io.BytesIO(b"Other"), journal) is None
+
+
+    @pytest.mark.parametrize("status_code", [404, 410])
+    def test_resume_tus_uploader_with_expired_link(
+        self, respx_mock, tmp_path, status_code
+    ):
+        journal = vimex.UploadJournal(str(tmp_path / "journal.json"))
+        path = tmp_path / "video.mp4"
+        path.write_bytes(b"Hello World!")
+        fingerprint = get_file_fingerprint(str(path))
+        journal.save(fingerprint, self.upload_link, 5)
+        respx_mock.head(self.upload_link).mock(
+            return_value=httpx.Response(status_code)
+        )
+        client = vimex.VimeoClient()
+
+        with mock.patch.object(
+            vimex.TusUploader, "close", autospec=True
+        ) as mocked_close:
+            assert client.resume_tus_uploader(str(path), journal) is None
+
+        assert journal.get(fingerprint) is None
+        mocked_close.assert_called_once()
+
+    def test_resume_tus_uploader_failure_closes_the_uploader(
+        self, respx_mock, tmp_path
+    ):
+        journal = vimex.UploadJournal(str(tmp_path / "journal.json"))
+        path = tmp_path / "video.mp4"
+        path.write_bytes(b"Hello World!")
+        journal.save(get_file_fingerprint(str(path)), self.upload_link, 5)
+        respx_mock.head(self.upload_link).mock(return_value=httpx.Response(403))
+        client = vimex.VimeoClient()
+
+        with mock.patch.object(
+            vimex.TusUploader, "close", autospec=True
+        ) as mocked_close:
+            with pytest.raises(vimex.UploadException):
+                client.resume_tus_uploader(str(path), journal)
+
+        mocked_close.assert_called_once()
+
+    @pytest.mark.anyio
+    async def test_async_resume_tus_uploader_with_expired_link(
+        self, respx_mock, tmp_path
+    ):
+        journal = vimex.UploadJournal(str(tmp_path / "journal.json"))
+        stream = io.BytesIO(b"Hello World!")
+        journal.save(get_file_fingerprint(stream), self.upload_link, 5)
+        respx_mock.head(self.upload_link).mock(return_value=httpx.Response(404))
+        client = vimex.AsyncVimeoClient()
+
+        assert await client.resume_tus_uploader(stream, journal) is None
+        assert journal.get(get_file_fingerprint(stream)) is None
+
+    def test_fingerprint_of_a_path_closes_the_file(self, tmp_path):
+        path = tmp_path / "video.mp4"
+        path.write_bytes(b"Hello World!")
+
+        opened = []
+
+        def tracked_open(*args, **kwargs):
+            opened.append(open(*args, **kwargs))
+            return opened[-1]
+
+        with mock.patch("vimex._utils.open", tracked_open, create=True):
+            get_file_fingerprint(str(path))
+
+        [file] = opened
+        assert file.closed
+
+    def test_fingerprint_restores_the_stream_position(self):
+        stream = io.BytesIO(b"Hello World!")
+        stream.seek(5)
+
+        assert get_file_fingerprint(stream) == get_file_fingerprint(
+            io.BytesIO(b"Hello World!")
+        )
+        assert stream.tell() == 5
+
+
+class TestTusUploadRetry:
+    upload_link = "https://some-upload-link.com/1234"
+
+    def get_uploader(self, attempts=3):
+        client = vimex.VimeoClient()
+        return client.get_tus_uploader(
+            io.BytesIO(b"Hello World!"),
+            self.upload_link,
+            retry_policy=vimex.RetryPolicy(attempts=attempts, backoff_factor=0),
+        )
+
+    def test_retry_resumes_from_the_server_offset(self, respx_mock):
+        received = []
+        responses = iter(
+            [
+                httpx.Response(503),
+                tus_patch_side_effect(received),
+                tus_patch_side_effect(received),
+            ]
+        )
+
+        def side_effect(request):
+            response = next(responses)
+            return response(request) if callable(response) else response
+
+        respx_mock.patch(self.upload_link).mock(side_effect=side_effect)
+        respx_mock.head(self.upload_link).mock(
+            return_value=httpx.Response(200, headers={"Upload-Offset": "3"})
+        )
+        uploader = self.get_uploader()
+
+        list(uploader.chunks_upload(6))
+
+        assert received == [(3, b"lo "), (6, b"World!")]
+        assert uploader.retries == 1
+
+    def test_retry_on_transport_error(self, respx_mock):
+        received = []
+        side_effect = tus_patch_side_effect(received)
+        calls = []
+
+        def flaky(request):
+            calls.append(request)
+            if len(calls) == 1:
+                raise httpx.ConnectError("Connection refused")
+            return side_effect(request)
+
+        respx_mock.patch(self.upload_link).mock(side_effect=flaky)
+        respx_mock.head(self.upload_link).mock(
+            return_value=httpx.Response(200, headers={"Upload-Offset": "0"})
+        )
+        uploader = self.get_uploader()
+
+        uploader.upload()
+
+        assert received == [(0, b"Hello World!")]
+        assert uploader.retries == 1
+
+    def test_missing_upload_offset_is_retried(self, respx_mock):
+        respx_mock.patch(self.upload_link).mock(return_value=httpx.Response(204))
+        respx_mock.head(self.upload_link).mock(
+            return_value=httpx.Response(200, headers={"Upload-Offset": "0"})
+        )
+        uploader = self.get_uploader(attempts=2)
+
+        with pytest.raises(vimex.UploadException):
+            list(uploader.chunks_upload(6))
+        assert uploader.retries == 1
+
+    def test_client_error_is_not_retried(self, respx_mock):
+        respx_mock.patch(self.upload_link).mock(return_value=httpx.Response(403))
+        head = respx_mock.head(self.upload_link)
+        uploader = self.get_uploader()
+
+        with pytest.raises(vimex.UploadException):
+            list(uploader.chunks_upload(6))
+        assert uploader.retries == 0
+        assert not head.called
+
+    @pytest.mark.parametrize(
+        "head_error",
+        [httpx.Response(503), httpx.Response(429, headers={"Retry-After": "0"})],
+    )
+    def test_failed_resync_is_retried(self, respx_mock, head_error):
+        received = []
+        patch = respx_mock.patch(self.upload_link)
+        patch.side_effect = [httpx.Response(503), tus_patch_side_effect(received)]
+        respx_mock.head(self.upload_link).side_effect = [
+            head_error,
+            httpx.Response(200, headers={"Upload-Offset": "0"}),
+        ]
+        uploader = self.get_uploader(attempts=5)
+
+        uploader.upload()
+
+        assert received == [(0, b"Hello World!")]
+        assert uploader.retries == 2
+
+    def test_adaptive_chunk_size_learns_from_acknowledged_patches(self, respx_mock):
+        received = []
+        respx_mock.patch(self.upload_link).side_effect = [
+            httpx.Response(503),
+            tus_patch_side_effect(received),
+            tus_patch_side_effect(received),
+            tus_patch_side_effect(received),
+        ]
+        respx_mock.head(self.upload_link).mock(
+            return_value=httpx.Response(200, headers={"Upload-Offset": "0"})
+        )
+        uploader = self.get_uploader()
+        adaptive = vimex.AdaptiveChunkSize(initial=4, minimum=4, maximum=4)
+
+        list(uploader.chunks_upload(adaptive=adaptive))
+
+        assert uploader.chunk_sizes == [4, 4, 4]
+        assert [size for size, _, _ in adaptive.samples] == [4, 4, 4]
+
+    def test_partial_acknowledgement_is_recorded(self, respx_mock):
+        def side_effect(request: httpx.Request):
+            offset = int(request.headers["Upload-Offset"])
+            request.read()
+            # Accept only the first 3 bytes of every chunk.
+            return httpx.Response(204, headers={"Upload-Offset": str(offset + 3)})
+
+        respx_mock.patch(self.upload_link).mock(side_effect=side_effect)
+        uploader = self.get_uploader()
+
+        list(uploader.chunks_upload(6))
+
+        assert uploader.chunk_sizes == [3, 3, 3, 3]
+
+    def test_failed_resync_counts_as_an_attempt(self, respx_mock):
+        respx_mock.patch(self.upload_link).mock(return_value=httpx.Response(503))
+        head = respx_mock.head(self.upload_link).mock(
+            return_value=httpx.Response(503)
+        )
+        uploader = self.get_uploader(attempts=3)
+
+        with pytest.raises(vimex.UploadException, match="after 3 attempts"):
+            uploader.upload()
+        assert head.call_count == 2
+
+    def test_expired_link_on_resync_is_fatal(self, respx_mock):
+        respx_mock.patch(self.upload_link).mock(return_value=httpx.Response(503))
+        head = respx_mock.head(self.upload_link).mock(
+            return_value=httpx.Response(404)
+        )
+        uploader = self.get_uploader(attempts=5)
+
+        with pytest.raises(vimex.UploadException, match="Unable to resume"):
+            uploader.upload()
+        assert head.call_count == 1
+
+
+class TestRetryPolicy:
+    def test_retryable_responses(self):
+        policy = vimex.RetryPolicy()
+        assert policy.is_retryable(None)
+        assert policy.is_retryable(httpx.Response(409))
+        assert policy.is_retryable(httpx.Response(429))
+        assert policy.is_retryable(httpx.Response(507))
+        assert not policy.is_retryable(httpx.Response(400))
+
+    def test_backoff(self):
+        policy = vimex.RetryPolicy(backoff_factor=1, max_backoff=5)
+        assert 0 <= policy.get_backoff(1) <= 1
+        assert 0 <= policy.get_backoff(10) <= 5
+        response = httpx.Response(429, headers={"Retry-After": "2"})
+        assert policy.get_backoff(1, response) == 2
+
+
+class TestChunkSource:
+    def test_bytes_io_is_served_without_copy(self):
+        source = get_chunk_source(io.BytesIO(b"Hello World!"))
+        chunk = source.read(6, 5)
+        assert isinstance(chunk, memoryview)
+        assert chunk == b"World"
+        assert not source.blocking
+        source.close()
+
+    def test_file_is_memory_mapped(self, tmp_path):
+        path = tmp_path / "video.mp4"
+        path.write_bytes(b"Hello World!")
+        with open(path, "rb") as file:
+            source = get_chunk_source(file)
+            assert isinstance(source, MmapChunkSource)
+            assert source.blocking
+            assert source.read(6, 5) == b"World"
+            source.close()
+
+    def test_empty_file_falls_back_to_buffered_reads(self, tmp_path):
+        path = tmp_path / "video.mp4"
+        path.write_bytes(b"")
+        with open(path, "rb") as file:
+            source = get_chunk_source(file)
+            assert type(source) is ChunkSource
+            assert source.read(0, 5) == b""
+
+    def test_chunk_stream_yields_slices(self):
+        stream = ChunkStream(b"Hello World!", block_size=5)
+        assert [bytes(block) for block in stream] == [b"Hello", b" Worl", b"d!"]
+        assert len(stream) == 12
+
+    def test_range_stream_reads_with_a_fixed_buffer(self):
+        source = ChunkSource(io.BufferedReader(io.BytesIO(b"Hello World!")))
+        stream = RangeStream(source, 3, 8, buffer_size=3)
+        assert [bytes(block) for block in stream] == [b"lo ", b"Wor", b"ld"]
+        assert len(stream) == 8
+
+
+@pytest.mark.anyio
+class TestAsyncTusUploader:
+    upload_link = "https://some-upload-link.com/1234"
+
+    async def test_create_tus_video_200(self, respx_mock):
+        client = vimex.AsyncVimeoClient()
+        respx_mock.post(client.upload_url).mock(
+            return_value=httpx.Response(
+                200,
+                json={
+                    "upload": {"upload_link": "some_upload_link"},
+                    "uri": "some_upload_uri",
+                },
+            )
+        )
+        upload_link, uri = await client.create_tus_video(
+            io.BytesIO(b"Hello World!"), name="some_name"
+        )
+        assert upload_link == "some_upload_link"
+        assert uri == "some_upload_uri"
+
+    async def test_create_tus_video_400(self, respx_mock):
+        client = vimex.AsyncVimeoClient()
+        respx_mock.post(client.upload_url).mock(
+            return_value=httpx.Response(400, json={"details": "some_error"})
+        )
+        with pytest.raises(vimex.UploadException):
+            await client.create_tus_video(io.BytesIO(b"Hello World!"), name="name")
+
+    @pytest.mark.parametrize("read_ahead", [False, True])
+    async def test_chunks_upload(self, respx_mock, read_ahead):
+        received = []
+        respx_mock.patch(self.upload_link).mock(
+            side_effect=tus_patch_side_effect(received)
+        )
+        client = vimex.AsyncVimeoClient()
+        uploader = client.get_tus_uploader(
+            io.BytesIO(b"Hello World!"), self.upload_link
+        )
+
+        responses = [
+            response
+            async for response in uploader.chunks_upload(5, read_ahead=read_ahead)
+        ]
+
+        assert len(responses) == 3
+        assert received == [(0, b"Hello"), (5, b" Worl"), (10, b"d!")]
+        assert uploader.upload_offset == 12
+
+    async def test_read_ahead_with_adaptive_chunk_size(self, respx_mock):
+        received = []
+        respx_mock.patch(self.upload_link).mock(
+            side_effect=tus_patch_side_effect(received)
+        )
+        client = vimex.AsyncVimeoClient()
+        uploader = client.get_tus_uploader(
+            io.BytesIO(b"Hello World!"), self.upload_link
+        )
+        adaptive = vimex.AdaptiveChunkSize(initial=2, minimum=2, maximum=4)
+
+        async for _ in uploader.chunks_upload(adaptive=adaptive, read_ahead=True):
+            pass
+
+        assert uploader.chunk_sizes == [2, 4, 4, 2]
+        assert b"".join(content for _, content in received) == b"Hello World!"
+
+    async def test_upload_streams_the_file(self, respx_mock):
+        received = []
+        respx_mock.patch(self.upload_link).mock(
+            side_effect=tus_patch_side_effect(received)
+        )
+        client = vimex.AsyncVimeoClient()
+        uploader = client.get_tus_uploader(
+            io.BytesIO(b"Hello World!"), self.upload_link
+        )
+        uploader.upload_buffer_size = 5
+        progress = []
+
+        await uploader.upload(on_progress=progress.append)
+
+        assert received == [(0, b"Hello World!")]
+        assert progress == [5, 10, 12]
+
+    async def test_memory_mapped_file_is_read_in_a_thread(self, respx_mock, tmp_path):
+        path = tmp_path / "video.mp4"
+        path.write_bytes(b"Hello World!")
+        received = []
+        respx_mock.patch(self.upload_link).mock(
+            side_effect=tus_patch_side_effect(received)
+        )
+        client = vimex.AsyncVimeoClient()
+        uploader = client.get_tus_uploader(str(path), self.upload_link)
+        uploader.upload_buffer_size = 5
+        read = uploader.chunk_source.read
+        threads = set()
+
+        def tracked_read(offset, size):
+            threads.add(threading.get_ident())
+            return read(offset, size)
+
+        uploader.chunk_source.read = tracked_read
+        await uploader.upload()
+        uploader.close()
+
+        assert received == [(0, b"Hello World!")]
+        assert threading.get_ident() not in threads
+
+    async def test_file_is_opened_in_a_thread(self, respx_mock, tmp_path):
+        path = tmp_path / "video.mp4"
+        path.write_bytes(b"Hello World!")
+        respx_mock.patch(self.upload_link).mock(side_effect=tus_patch_side_effect([]))
+        client = vimex.AsyncVimeoClient()
+        uploader = client.get_tus_uploader(str(path), self.upload_link)
+        threads = set()
+        prepare = uploader.prepare
+
+        def tracked_prepare():
+            threads.add(threading.get_ident())
+            return prepare()
+
+        uploader.prepare = tracked_prepare
+        async for _ in uploader.chunks_upload(5):
+            pass
+        uploader.close()
+
+        assert len(threads) == 1
+        assert threading.get_ident() not in threads
+        assert uploader.upload_offset == 12
+
+    async def test_create_tus_video_reads_the_size_in_a_thread(
+        self, respx_mock, tmp_path
+    ):
+        path = tmp_path / "video.mp4"
+        path.write_bytes(b"Hello World!")
+        client = vimex.AsyncVimeoClient()
+        route = respx_mock.post(client.upload_url).mock(
+            return_value=httpx.Response(
+                200, json={"upload": {"upload_link": "link"}, "uri": "uri"}
+            )
+        )
+        threads = set()
+        get_file_size = vimex._upload.get_file_size
+
+        def tracked_get_file_size(file):
+            threads.add(threading.get_ident())
+            return get_file_size(file)
+
+        with mock.patch("vimex._upload.get_file_size", tracked_get_file_size):
+            await client.create_tus_video(str(path))
+
+        assert threading.get_ident() not in threads
+        assert json.loads(route.calls.last.request.content)["upload"]["size"] == "12"
+
+    async def test_resume(self, respx_mock):
+        respx_mock.head(self.upload_link).mock(
+            return_value=httpx.Response(200, headers={"Upload-Offset": "6"})
+        )
+        client = vimex.AsyncVimeoClient()
+        uploader = client.get_tus_uploader(
+            io.BytesIO(b"Hello World!"), self.upload_link
+        )
+
+        assert await uploader.resume() == 6
+
+    async def test_retry_resumes_from_the_server_offset(self, respx_mock):
+        received = []
+        side_effect = tus_patch_side_effect(received)
+        calls = []
+
+        def flaky(request):
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(500)
+            return side_effect(request)
+
+        respx_mock.patch(self.upload_link).mock(side_effect=flaky)
+        respx_mock.head(self.upload_link).mock(
+            return_value=httpx.Response(200, headers={"Upload-Offset": "3"})
+        )
+        client = vimex.AsyncVimeoClient()
+        uploader = client.get_tus_uploader(
+            io.BytesIO(b"Hello World!"),
+            self.upload_link,
+            retry_policy=vimex.RetryPolicy(backoff_factor=0),
+        )
+
+        async for _ in uploader.chunks_upload(6):
+            pass
+
+        assert received == [(3, b"lo "), (6, b"World!")]
+        assert uploader.retries == 1
+
+    async def test_failed_resync_is_retried(self, respx_mock):
+        received = []
+        respx_mock.patch(self.upload_link).side_effect = [
+            httpx.Response(503),
+            tus_patch_side_effect(received),
+        ]
+        respx_mock.head(self.upload_link).side_effect = [
+            httpx.Response(503),
+            httpx.Response(200, headers={"Upload-Offset": "0"}),
+        ]
+        client = vimex.AsyncVimeoClient()
+        uploader = client.get_tus_uploader(
+            io.BytesIO(b"Hello World!"),
+            self.upload_link,
+            retry_policy=vimex.RetryPolicy(attempts=5, backoff_factor=0),
+        )
+
+        await uploader.upload()
+
+        assert received == [(0, b"Hello World!")]
+        assert uploader.retries == 2
+
+    async def test_throttled_range_stream_does_not_block_the_loop(self):
+        source = ChunkSource(io.BufferedReader(io.BytesIO(b"Hello World!")))
+        stream = AsyncRangeStream(
+            source, 0, 12, buffer_size=3, throttle=Throttle(rate=30, burst=3)
+        )
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        blocks = [bytes(block) async for block in stream]
+        ticker.cancel()
+
+        assert blocks == [b"Hel", b"lo ", b"Wor", b"ld!"]
+        # The stream is paced for ~0.3s, the other task keeps running.
+        assert ticks >= 10
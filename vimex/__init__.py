@@ -8,6 +8,13 @@ from ._auth import (
     VimeoOauth2ImplicitGrant,
     VimeoOauth2DeviceCodeGrant,
 )
+from ._oauth2_server import Server, CallbackServer
+from ._token_cache import (
+    BaseTokenCache,
+    MemoryTokenCache,
+    FileTokenCache,
+    SQLiteTokenCache,
+)
 from ._exceptions import (
     ClientCredentialsException,
     AuthorizationCodeException,
@@ -19,9 +26,36 @@ from ._upload import (
     BaseUpload,
     SyncUploadMixin,
     AsyncUploadMixin,
+    TusUploader,
+    AsyncTusUploader,
+    AdaptiveChunkSize,
+)
+
+from ._journal import UploadJournal
+from ._retry import RetryPolicy
+from ._rate_limit import RateLimiter
+from ._response import DecodedResponse
+from ._http_cache import BaseHTTPCache, MemoryHTTPCache, FileHTTPCache
+from ._instrumentation import (
+    Instrumentation,
+    LatencyHistogram,
+    MetricsCollector,
+    OpenTelemetryHook,
 )
 
-from ._data_structures import DeviceCodeGrantResponse
+from ._batch import BatchUploader, AsyncBatchUploader
+
+from ._data_structures import (
+    DeviceCodeGrantResponse,
+    BatchItem,
+    UploadResult,
+    Event,
+    Video,
+    UploadTicket,
+    Page,
+    TokenResponse,
+    to_columns,
+)
 
 __all__ = [
     "VimeoClient",
@@ -30,6 +64,12 @@ __all__ = [
     "VimeoOauth2AuthorizationCode",
     "VimeoOauth2ImplicitGrant",
     "VimeoOauth2DeviceCodeGrant",
+    "Server",
+    "CallbackServer",
+    "BaseTokenCache",
+    "MemoryTokenCache",
+    "FileTokenCache",
+    "SQLiteTokenCache",
     "ClientCredentialsException",
     "AuthorizationCodeException",
     "AuthorizationStateException",
@@ -37,4 +77,28 @@ __all__ = [
     "UploadException",
     "AsyncUploadMixin",
     "SyncUploadMixin",
+    "TusUploader",
+    "AsyncTusUploader",
+    "UploadJournal",
+    "AdaptiveChunkSize",
+    "RetryPolicy",
+    "RateLimiter",
+    "DecodedResponse",
+    "BaseHTTPCache",
+    "MemoryHTTPCache",
+    "FileHTTPCache",
+    "Instrumentation",
+    "LatencyHistogram",
+    "MetricsCollector",
+    "OpenTelemetryHook",
+    "Event",
+    "BatchUploader",
+    "AsyncBatchUploader",
+    "BatchItem",
+    "UploadResult",
+    "Video",
+    "UploadTicket",
+    "Page",
+    "TokenResponse",
+    "to_columns",
 ]
@@ -1,5 +1,8 @@
+import asyncio
 import base64
 import sys
+import threading
+import time
 import typing
 from typing import Generator
 import logging
@@ -7,8 +10,17 @@ import httpx
 
 from httpx import Request, Response
 
-from ._oauth2_server import Server
-from ._data_structures import DeviceCodeGrantResponse, GrantType
+from ._oauth2_server import BaseServer, Server
+from ._data_structures import (
+    CachedToken,
+    DeviceCodeGrantResponse,
+    DevicePollStatus,
+    GrantType,
+    TokenResponse,
+)
+from ._instrumentation import Instrumentation
+from ._response import loads
+from ._token_cache import BaseTokenCache
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +39,12 @@ class BaseOauth2Auth(httpx.Auth):
     default_scope = "public private"
     server_host = "http://127.0.0.1"
     server_port = 5555
+    # Receives the redirects of the authorization server, built on first use.
+    server_class: typing.Type[BaseServer] = Server
+    # Tokens are refreshed this many seconds before they expire.
+    refresh_margin = 60
+    # Minimum delay between two background refreshes.
+    refresh_retry_interval = 10
 
     def __init__(
         self,
@@ -35,6 +53,11 @@ class BaseOauth2Auth(httpx.Auth):
         state: str,
         access_token: typing.Optional[str] = None,
         scope: typing.Optional[list[str]] = None,
+        token_cache: typing.Optional[BaseTokenCache] = None,
+        http_client: typing.Optional[httpx.Client] = None,
+        async_http_client: typing.Optional[httpx.AsyncClient] = None,
+        server_class: typing.Optional[typing.Type[BaseServer]] = None,
+        instrumentation: typing.Optional[Instrumentation] = None,
     ) -> None:
         self.client_id = client_id
         self.client_secret = client_secret
@@ -43,6 +66,28 @@ class BaseOauth2Auth(httpx.Auth):
         self.scope = (
             " ".join(scope) if scope and isinstance(scope, list) else self.default_scope
         )
+        self.token_cache = token_cache
+        # Single-flight token acquisition, one fetch at a time per instance.
+        self._sync_lock = threading.Lock()
+        self._async_lock: typing.Optional[asyncio.Lock] = None
+        # Number of completed fetches.
+        self._fetch_count = 0
+        # Unix timestamp, None when the token doesn't expire.
+        self.expires_at: typing.Optional[float] = None
+        self._refresh_task: typing.Optional[asyncio.Task] = None
+        self._next_refresh_at = 0.0
+        # Long-lived clients used for the token requests, the ones created
+        # by the auth are closed by `close`/`aclose`.
+        self._http_client = http_client
+        self._async_http_client = async_http_client
+        self._owns_http_client = self._owns_async_http_client = False
+        self._transport: typing.Optional[httpx.BaseTransport] = None
+        self._async_transport: typing.Optional[httpx.AsyncBaseTransport] = None
+        if server_class is not None:
+            self.server_class = server_class
+        self._server: typing.Optional[BaseServer] = None
+        # Receives a `token.fetch` event per token request.
+        self.instrumentation = instrumentation
 
     def sync_auth_flow(
         self, request: httpx.Request
@@ -50,7 +95,15 @@ class BaseOauth2Auth(httpx.Auth):
         token = self.sync_get_token()
         if token:
             request.headers[self.header_name] = self.header_value.format(token=token)
-        yield request
+        response = yield request
+        if response.status_code == 401 and token:
+            # The token was revoked or expired early, replay once.
+            self.invalidate_token(token)
+            if token := self.sync_get_token():
+                request.headers[self.header_name] = self.header_value.format(
+                    token=token
+                )
+                yield request
 
     async def async_auth_flow(
         self, request: Request
@@ -58,14 +111,164 @@ class BaseOauth2Auth(httpx.Auth):
         token = await self.async_get_token()
         if token:
             request.headers[self.header_name] = self.header_value.format(token=token)
-        yield request
+        response = yield request
+        if response.status_code == 401 and token:
+            await self.async_invalidate_token(token)
+            if token := await self.async_get_token():
+                request.headers[self.header_name] = self.header_value.format(
+                    token=token
+                )
+                yield request
+
+    def has_valid_token(self, margin: float = 0) -> bool:
+        """
+        Whether there is a token not expiring within `margin` seconds.
+        """
+        if self.access_token is None:
+            return False
+        return self.expires_at is None or time.time() < self.expires_at - margin
 
     def sync_get_token(self):
-        raise NotImplementedError
+        if self.has_valid_token(self.refresh_margin):
+            return self.access_token
+        fetch_count = self._fetch_count
+        with self._sync_lock:
+            # Callers that waited for a concurrent fetch share its result.
+            if (
+                not self.has_valid_token(self.refresh_margin)
+                and fetch_count == self._fetch_count
+            ):
+                self.sync_acquire_token()
+        return self.access_token
+
+    def sync_acquire_token(self):
+        self.load_cached_token()
+        if self.has_valid_token(self.refresh_margin):
+            return
+        start, payload = time.perf_counter(), None
+        try:
+            if payload := self.sync_fetch_token():
+                self.set_token(payload)
+                self.store_token()
+        finally:
+            self._fetch_count += 1
+            self.record_fetch(start, payload)
 
     async def async_get_token(self):
+        if self.has_valid_token(self.refresh_margin):
+            return self.access_token
+        if self.has_valid_token():
+            # Still usable, refresh it without blocking the request.
+            self.schedule_refresh()
+            return self.access_token
+        await self.async_refresh_token(self._fetch_count)
+        return self.access_token
+
+    async def async_refresh_token(self, fetch_count):
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        async with self._async_lock:
+            if (
+                not self.has_valid_token(self.refresh_margin)
+                and fetch_count == self._fetch_count
+            ):
+                await self.async_acquire_token()
+
+    async def async_acquire_token(self):
+        await self.async_run_cache(self.load_cached_token)
+        if self.has_valid_token(self.refresh_margin):
+            return
+        start, payload = time.perf_counter(), None
+        try:
+            if payload := await self.async_fetch_token():
+                self.set_token(payload)
+                await self.async_run_cache(self.store_token)
+        finally:
+            self._fetch_count += 1
+            self.record_fetch(start, payload)
+
+    def record_fetch(self, start: float, payload: typing.Optional[dict]):
+        if self.instrumentation is not None:
+            self.instrumentation.emit(
+                "token.fetch",
+                time.perf_counter() - start,
+                grant_type=self.grant_type.value,
+                success=bool(payload),
+            )
+
+    def schedule_refresh(self):
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        if time.monotonic() < self._next_refresh_at:
+            return
+        self._next_refresh_at = time.monotonic() + self.refresh_retry_interval
+        self._refresh_task = asyncio.ensure_future(
+            self.async_refresh_token(self._fetch_count)
+        )
+        self._refresh_task.add_done_callback(self._log_refresh_error)
+
+    @staticmethod
+    def _log_refresh_error(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Token refresh failed.", exc_info=task.exception())
+
+    def sync_fetch_token(self) -> typing.Optional[dict]:
+        """
+        Run the grant flow, returning the token response payload
+        or None on failure.
+        """
+        raise NotImplementedError
+
+    async def async_fetch_token(self) -> typing.Optional[dict]:
         raise NotImplementedError
 
+    def set_token(self, payload: dict):
+        token = TokenResponse.from_json(payload, self.token_field_name)
+        self.access_token = token.access_token
+        self.expires_at = (
+            time.time() + float(token.expires_in) if token.expires_in else None
+        )
+
+    def invalidate_token(self, token: str):
+        if self.access_token != token:
+            # Already replaced by a concurrent caller.
+            return
+        self.access_token = self.expires_at = None
+        if self.token_cache is not None:
+            self.token_cache.delete(self.cache_key)
+
+    async def async_invalidate_token(self, token: str):
+        if self.token_cache is not None and self.token_cache.blocking:
+            await asyncio.to_thread(self.invalidate_token, token)
+        else:
+            self.invalidate_token(token)
+
+    @property
+    def cache_key(self) -> str:
+        return f"{self.client_id}:{self.grant_type.value}:{self.scope}"
+
+    def load_cached_token(self):
+        if self.token_cache is None:
+            return
+        cached = self.token_cache.get(self.cache_key)
+        if cached and (cached.expires_at is None or time.time() < cached.expires_at):
+            self.access_token, self.expires_at = cached
+
+    def store_token(self):
+        if self.token_cache is None or self.access_token is None:
+            return
+        self.token_cache.set(
+            self.cache_key, CachedToken(self.access_token, self.expires_at)
+        )
+
+    async def async_run_cache(self, func):
+        if self.token_cache is None:
+            return
+        if self.token_cache.blocking:
+            await asyncio.to_thread(func)
+        else:
+            func()
+
     def build_access_token_request(
         self, method: str, url: str, headers: dict, body: dict, **kwargs
     ):
@@ -77,6 +280,45 @@ class BaseOauth2Auth(httpx.Auth):
         )
         return r
 
+    @property
+    def http_client(self) -> httpx.Client:
+        if self._http_client is None:
+            self._http_client = httpx.Client(transport=self._transport)
+            self._owns_http_client = self._transport is None
+        return self._http_client
+
+    @property
+    def async_http_client(self) -> httpx.AsyncClient:
+        if self._async_http_client is None:
+            self._async_http_client = httpx.AsyncClient(
+                transport=self._async_transport
+            )
+            self._owns_async_http_client = self._async_transport is None
+        return self._async_http_client
+
+    def bind_transport(self, transport: httpx.BaseTransport):
+        """
+        Send the token requests through the connection pool of `transport`,
+        owned by the api client. A client given by the caller, or already
+        created by the auth, is kept.
+        """
+        if self._http_client is None or self._transport is not None:
+            self._transport, self._http_client = transport, None
+
+    def bind_async_transport(self, transport: httpx.AsyncBaseTransport):
+        if self._async_http_client is None or self._async_transport is not None:
+            self._async_transport, self._async_http_client = transport, None
+
+    def close(self):
+        if self._owns_http_client and self._http_client is not None:
+            self._http_client.close()
+            self._http_client, self._owns_http_client = None, False
+
+    async def aclose(self):
+        if self._owns_async_http_client and self._async_http_client is not None:
+            await self._async_http_client.aclose()
+            self._async_http_client, self._owns_async_http_client = None, False
+
     @staticmethod
     def send_request(request, *args, **kwargs):
         _client, _auto_created = kwargs.pop("client", None), False
@@ -118,8 +360,13 @@ class BaseOauth2Auth(httpx.Auth):
     def redirect_uri(self):
         return f"http://{self.server.host}:{self.server.port}"
 
+    def create_server(self) -> BaseServer:
+        return self.server_class(port=self.server_port)
+
     @property
     def server(self):
+        if self._server is None:
+            self._server = self.create_server()
         return self._server
 
     @server.setter
@@ -132,23 +379,21 @@ class VimeoOAuth2ClientCredentials(BaseOauth2Auth):
     default_scope = "public"
     grant_type = GrantType.CLIENT_CREDENTIALS
 
-    def sync_get_token(self):
-        if self.access_token is None:
-            response = self.send_request(self.build_access_token_request())
-            if response.is_success:
-                response.read()
-                token = response.json().get(self.token_field_name, None)
-                self.access_token = token
-        return self.access_token
+    def sync_fetch_token(self):
+        response = self.send_request(
+            self.build_access_token_request(), client=self.http_client
+        )
+        if response.is_success:
+            response.read()
+            return loads(response.content)
 
-    async def async_get_token(self):
-        if self.access_token is None:
-            response = await self.async_send_request(self.build_access_token_request())
-            if response.is_success:
-                await response.aread()
-                token = response.json().get(self.token_field_name, None)
-                self.access_token = token
-        return self.access_token
+    async def async_fetch_token(self):
+        response = await self.async_send_request(
+            self.build_access_token_request(), client=self.async_http_client
+        )
+        if response.is_success:
+            await response.aread()
+            return loads(response.content)
 
     def build_access_token_request(self, *args, **kwargs):
         return super().build_access_token_request(
@@ -174,39 +419,29 @@ class VimeoOauth2AuthorizationCode(BaseOauth2Auth):
     exchange_url = "https://api.vimeo.com/oauth/access_token"
     grant_type = GrantType.AUTHORIZATION_CODE
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self._server = Server(
-            port=self.server_port,
+    def sync_fetch_token(self):
+        result = self.server.get_authorization_grant(
+            self.format_authorization_url(), state=self.state
         )
-
-    def sync_get_token(self):
-        if self.access_token is None:
-            result = self._server.get_authorization_grant(
-                self.format_authorization_url()
+        if code := result.code:
+            response = self.send_request(
+                self.build_access_token_request(code), client=self.http_client
             )
-            if code := result.code:
-                response = self.send_request(self.build_access_token_request(code))
-                if response.is_success:
-                    response.read()
-                    token = response.json().get(self.token_field_name, None)
-                    self.access_token = token
-        return self.access_token
+            if response.is_success:
+                response.read()
+                return loads(response.content)
 
-    async def async_get_token(self):
-        if self.access_token is None:
-            result = await self.server.async_get_authorization_grant(
-                self.format_authorization_url()
+    async def async_fetch_token(self):
+        result = await self.server.async_get_authorization_grant(
+            self.format_authorization_url(), state=self.state
+        )
+        if code := result.code:
+            response = await self.async_send_request(
+                self.build_access_token_request(code), client=self.async_http_client
             )
-            if code := result.code:
-                response = await self.async_send_request(
-                    self.build_access_token_request(code)
-                )
-                if response.is_success:
-                    await response.aread()
-                    token = response.json().get(self.token_field_name, None)
-                    self.access_token = token
-        return self.access_token
+            if response.is_success:
+                await response.aread()
+                return loads(response.content)
 
     def build_access_token_request(self, code, *args, **kwargs):
         return super().build_access_token_request(
@@ -241,27 +476,22 @@ class VimeoOauth2ImplicitGrant(BaseOauth2Auth):
                         "&scope={scope}"
     grant_type = GrantType.IMPLICIT
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self._server = Server(port=self.server_port, redirect_on_fragment=True)
+    def create_server(self) -> BaseServer:
+        return self.server_class(port=self.server_port, redirect_on_fragment=True)
 
-    def sync_get_token(self):
-        if self.access_token is None:
-            result = self._server.get_authorization_grant(
-                self.format_authorization_url()
-            )
-            if access_token := result.access_token:
-                self.access_token = access_token
-        return self.access_token
+    def sync_fetch_token(self):
+        result = self.server.get_authorization_grant(
+            self.format_authorization_url(), state=self.state
+        )
+        if access_token := result.access_token:
+            return {self.token_field_name: access_token}
 
-    async def async_get_token(self):
-        if self.access_token is None:
-            result = await self.server.async_get_authorization_grant(
-                self.format_authorization_url()
-            )
-            if access_token := result.access_token:
-                self.access_token = access_token
-        return self.access_token
+    async def async_fetch_token(self):
+        result = await self.server.async_get_authorization_grant(
+            self.format_authorization_url(), state=self.state
+        )
+        if access_token := result.access_token:
+            return {self.token_field_name: access_token}
 
     def format_authorization_url(self) -> str:
         return self.authorization_url.format(
@@ -277,55 +507,65 @@ class VimeoOauth2DeviceCodeGrant(BaseOauth2Auth):
     access_token_url = "https://api.vimeo.com/oauth/device"
     grant_type = GrantType.DEVICE
 
-    def __init__(self, *args, **kwargs):
+    def __init__(
+        self,
+        *args,
+        on_poll_progress: typing.Optional[
+            typing.Callable[[DevicePollStatus], None]
+        ] = None,
+        **kwargs,
+    ):
         super().__init__(*args, **kwargs)
-        self._server = Server(port=self.server_port)
+        self.on_poll_progress = on_poll_progress
 
-    def sync_get_token(self):
-        if self.access_token is None:
-            response = self.send_request(self.build_access_token_request())
+    def sync_fetch_token(self):
+        response = self.send_request(
+            self.build_access_token_request(), client=self.http_client
+        )
+        if response.is_success:
+            response.read()
+            payload = DeviceCodeGrantResponse(**loads(response.content))
+            self.print_instructions(payload.activate_link, payload.user_code)
+            response = self.server.poll_authorize_url(
+                url=payload.authorize_link,
+                expires_in=payload.expires_in,
+                interval=payload.interval,
+                headers=self.get_authorization_headers(),
+                data={
+                    "user_code": payload.user_code,
+                    "device_code": payload.device_code,
+                },
+                client=self.http_client,
+                on_progress=self.on_poll_progress,
+            )
             if response.is_success:
                 response.read()
-                payload = DeviceCodeGrantResponse(**response.json())
-                self.print_instructions(payload.activate_link, payload.user_code)
-                response = self._server.poll_authorize_url(
-                    url=payload.authorize_link,
-                    expires_in=payload.expires_in,
-                    interval=payload.interval,
-                    headers=self.get_authorization_headers(),
-                    data={
-                        "user_code": payload.user_code,
-                        "device_code": payload.device_code,
-                    },
-                )
-                if response.is_success:
-                    response.read()
-                    token = response.json().get(self.token_field_name, None)
-                    self.access_token = token
-        return self.access_token
+                return loads(response.content)
 
-    async def async_get_token(self):
-        if self.access_token is None:
-            response = await self.async_send_request(self.build_access_token_request())
+    async def async_fetch_token(self):
+        response = await self.async_send_request(
+            self.build_access_token_request(), client=self.async_http_client
+        )
+        if response.is_success:
+            await response.aread()
+            payload = DeviceCodeGrantResponse(**loads(response.content))
+            self.print_instructions(payload.activate_link, payload.user_code)
+
+            response = await self.server.async_poll_authorize_url(
+                url=payload.authorize_link,
+                expires_in=payload.expires_in,
+                interval=payload.interval,
+                headers=self.get_authorization_headers(),
+                data={
+                    "user_code": payload.user_code,
+                    "device_code": payload.device_code,
+                },
+                client=self.async_http_client,
+                on_progress=self.on_poll_progress,
+            )
             if response.is_success:
                 await response.aread()
-                payload = DeviceCodeGrantResponse(**response.json())
-                self.print_instructions(payload.activate_link, payload.user_code)
-
-                response = await self._server.async_poll_authorize_url(
-                    url=payload.authorize_link,
-                    expires_in=payload.expires_in,
-                    interval=payload.interval,
-                    headers=self.get_authorization_headers(),
-                    data={
-                        "user_code": payload.user_code,
-                        "device_code": payload.device_code,
-                    },
-                )
-                if response.is_success:
-                    token = response.json().get(self.token_field_name, None)
-                    self.access_token = token
-        return self.access_token
+                return loads(response.content)
 
     def build_access_token_request(self, *args, **kwargs):
         return super().build_access_token_request(
@@ -0,0 +1,198 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+from typing import AsyncIterator, Iterable, Iterator, Optional
+
+from ._data_structures import BatchItem, UploadResult
+from ._retry import RetryPolicy
+from ._throttle import Throttle
+
+
+class BaseBatchUploader:
+    """
+    Upload many files with at most `max_in_flight` concurrent uploads and
+    an optional `max_bytes_per_second` bandwidth cap shared by all of them.
+
+    Files are taken lazily from the given iterable, up to `lookahead` of
+    them are kept in a priority queue so that memory stays flat on huge
+    batches. With a `chunk_size` files are uploaded in chunks, otherwise
+    in a single streamed request.
+
+    With `prefetch_tickets` the upload tickets (`POST /me/videos`) of up to
+    that many upcoming files are created while the current files upload,
+    so a free upload slot never waits for a ticket round-trip.
+    """
+
+    def __init__(
+        self,
+        client,
+        max_in_flight: int = 4,
+        max_bytes_per_second: Optional[float] = None,
+        chunk_size: Optional[int] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        lookahead: Optional[int] = None,
+        prefetch_tickets: int = 0,
+    ):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1.")
+        self.client = client
+        self.max_in_flight = max_in_flight
+        self.throttle = (
+            Throttle(max_bytes_per_second) if max_bytes_per_second else None
+        )
+        self.chunk_size = chunk_size
+        self.retry_policy = retry_policy
+        self.prefetch_tickets = max(prefetch_tickets, 0)
+        self.lookahead = max(
+            lookahead or max_in_flight * 4, max_in_flight + self.prefetch_tickets
+        )
+        self._counter = itertools.count()
+
+    @staticmethod
+    def to_batch_item(item) -> BatchItem:
+        if isinstance(item, BatchItem):
+            return item
+        return BatchItem(item)
+
+    def fill_queue(self, queue: list, items: Iterator):
+        while len(queue) < self.lookahead:
+            try:
+                item = self.to_batch_item(next(items))
+            except StopIteration:
+                return
+            # The counter keeps the input order between equal priorities.
+            heapq.heappush(queue, (item.priority, next(self._counter), item))
+
+    def pop_item(self, queue: list, items: Iterator) -> BatchItem:
+        *_, item = heapq.heappop(queue)
+        self.fill_queue(queue, items)
+        return item
+
+    def get_uploader(self, item: BatchItem, upload_link: str):
+        return self.client.get_tus_uploader(
+            item.file,
+            upload_link,
+            chunk_size=self.chunk_size,
+            retry_policy=self.retry_policy,
+            throttle=self.throttle,
+        )
+
+
+class BatchUploader(BaseBatchUploader):
+    def create_ticket(self, item: BatchItem):
+        return self.client.create_tus_video(item.file, **(item.metadata or {}))
+
+    def transfer(self, item: BatchItem, get_ticket) -> UploadResult:
+        start, uri, uploader = time.monotonic(), None, None
+        try:
+            upload_link, uri = get_ticket()
+            uploader = self.get_uploader(item, upload_link)
+            if self.chunk_size:
+                for _ in uploader.chunks_upload(self.chunk_size):
+                    pass
+            else:
+                uploader.upload()
+        except Exception as exc:
+            error = exc
+        else:
+            error = None
+        finally:
+            if uploader is not None:
+                uploader.close()
+        retries = uploader.retries if uploader is not None else 0
+        return UploadResult(item.file, uri, time.monotonic() - start, retries, error)
+
+    def upload_file(self, item: BatchItem) -> UploadResult:
+        return self.transfer(item, partial(self.create_ticket, item))
+
+    def upload(self, items: Iterable) -> Iterator[UploadResult]:
+        """
+        Upload `items`, file paths, streams or `BatchItem`, yielding an
+        `UploadResult` as soon as every upload completes.
+        """
+        items, queue, running, tickets = iter(items), [], set(), deque()
+        with ThreadPoolExecutor(
+            max_workers=self.max_in_flight
+        ) as executor, ThreadPoolExecutor(
+            max_workers=max(self.prefetch_tickets, 1)
+        ) as ticket_executor:
+            self.fill_queue(queue, items)
+            while queue or tickets or running:
+                while (queue or tickets) and len(running) < self.max_in_flight:
+                    if tickets:
+                        item, ticket = tickets.popleft()
+                        get_ticket = ticket.result
+                    else:
+                        item = self.pop_item(queue, items)
+                        get_ticket = partial(self.create_ticket, item)
+                    running.add(executor.submit(self.transfer, item, get_ticket))
+                while queue and len(tickets) < self.prefetch_tickets:
+                    item = self.pop_item(queue, items)
+                    tickets.append(
+                        (item, ticket_executor.submit(self.create_ticket, item))
+                    )
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+
+class AsyncBatchUploader(BaseBatchUploader):
+    async def create_ticket(self, item: BatchItem):
+        return await self.client.create_tus_video(
+            item.file, **(item.metadata or {})
+        )
+
+    async def transfer(self, item: BatchItem, ticket) -> UploadResult:
+        start, uri, uploader = time.monotonic(), None, None
+        try:
+            upload_link, uri = await ticket
+            uploader = self.get_uploader(item, upload_link)
+            if self.chunk_size:
+                async for _ in uploader.chunks_upload(self.chunk_size):
+                    pass
+            else:
+                await uploader.upload()
+        except Exception as exc:
+            error = exc
+        else:
+            error = None
+        finally:
+            if uploader is not None:
+                uploader.close()
+        retries = uploader.retries if uploader is not None else 0
+        return UploadResult(item.file, uri, time.monotonic() - start, retries, error)
+
+    async def upload_file(self, item: BatchItem) -> UploadResult:
+        return await self.transfer(item, self.create_ticket(item))
+
+    async def upload(self, items: Iterable) -> AsyncIterator[UploadResult]:
+        items, queue, running, tickets = iter(items), [], set(), deque()
+        try:
+            self.fill_queue(queue, items)
+            while queue or tickets or running:
+                while (queue or tickets) and len(running) < self.max_in_flight:
+                    if tickets:
+                        item, ticket = tickets.popleft()
+                    else:
+                        item = self.pop_item(queue, items)
+                        ticket = self.create_ticket(item)
+                    running.add(asyncio.ensure_future(self.transfer(item, ticket)))
+                while queue and len(tickets) < self.prefetch_tickets:
+                    item = self.pop_item(queue, items)
+                    tickets.append(
+                        (item, asyncio.ensure_future(self.create_ticket(item)))
+                    )
+                done, running = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+        finally:
+            pending = [*running, *(ticket for _, ticket in tickets)]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
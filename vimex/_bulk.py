@@ -0,0 +1,208 @@
+import asyncio
+import re
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import AsyncIterator, Iterable, Iterator, Optional
+
+import httpx
+
+from ._response import loads
+
+# Number of videos requested with a single `uris` query, the page size
+# limit of vimeo.
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_MAX_CONCURRENCY = 4
+
+VIDEO_URI = re.compile(r"/videos/\d+")
+
+
+class BaseBulk:
+    """
+    Fetch many objects with as few requests as possible: the videos are
+    grouped in `/videos?uris=...` queries, the other uris, and the videos of
+    a failed query, are fetched with single GETs.
+
+    The results are `(uri, item)` pairs, `item` is None when the object
+    doesn't exist or isn't visible.
+    """
+
+    api_url = "https://api.vimeo.com"
+    videos_url = "https://api.vimeo.com/videos"
+
+    @staticmethod
+    def get_jobs(uris: Iterable[str], batch_size: int) -> Iterator[tuple[bool, list]]:
+        """
+        Yield `(is_batch, uris)` jobs.
+        """
+        batch = []
+        for uri in uris:
+            if not VIDEO_URI.fullmatch(uri):
+                yield False, [uri]
+                continue
+            batch.append(uri)
+            if len(batch) == batch_size:
+                yield True, batch
+                batch = []
+        if batch:
+            yield True, batch
+
+    @staticmethod
+    def next_job(jobs: Iterator, fallback_jobs: deque) -> Optional[tuple]:
+        """
+        Return the next job, the single GETs replacing a failed batch come
+        first, the uris are only consumed as the jobs are scheduled.
+        """
+        if fallback_jobs:
+            return fallback_jobs.popleft()
+        return next(jobs, None)
+
+    @staticmethod
+    def get_fields_params(fields: Optional[list[str]]) -> dict:
+        if not fields:
+            return {}
+        # The uri maps the items of a batch to the requested uris.
+        return {"fields": ",".join(dict.fromkeys([*fields, "uri"]))}
+
+    def get_batch_params(self, uris: list, fields: Optional[list[str]]) -> dict:
+        return {
+            "uris": ",".join(uris),
+            "per_page": len(uris),
+            **self.get_fields_params(fields),
+        }
+
+    @staticmethod
+    def read_batch(uris: list, response: httpx.Response) -> Optional[list]:
+        if not response.is_success:
+            return None
+        # Unlisted videos have an uri like `/videos/{id}:{hash}`.
+        items = {
+            item.get("uri", "").split(":")[0]: item
+            for item in loads(response.content).get("data") or []
+        }
+        return [(uri, items.get(uri)) for uri in uris]
+
+    @staticmethod
+    def read_single(uri: str, response: httpx.Response) -> tuple:
+        if response.status_code in (403, 404):
+            return uri, None
+        response.raise_for_status()
+        return uri, loads(response.content)
+
+
+class SyncBulkMixin(BaseBulk):
+    def run_bulk_job(self, job, fields, **request_kwargs) -> tuple[list, list]:
+        """
+        Return the results of a job and the jobs replacing a failed batch.
+        """
+        is_batch, uris = job
+        if is_batch:
+            response = self.get(
+                self.videos_url,
+                params=self.get_batch_params(uris, fields),
+                **request_kwargs,
+            )
+            if (results := self.read_batch(uris, response)) is not None:
+                return results, []
+            return [], [(False, [uri]) for uri in uris]
+        response = self.get(
+            f"{self.api_url}{uris[0]}",
+            params=self.get_fields_params(fields),
+            **request_kwargs,
+        )
+        return [self.read_single(uris[0], response)], []
+
+    def get_many(
+        self,
+        uris: Iterable[str],
+        fields: Optional[list[str]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        **request_kwargs,
+    ) -> Iterator[tuple]:
+        """
+        Yield `(uri, item)` as the requests complete, up to `max_concurrency`
+        requests run in a thread pool.
+        """
+        jobs = self.get_jobs(uris, batch_size)
+        fallback_jobs = deque()
+        executor = ThreadPoolExecutor(max_concurrency)
+        running = set()
+        try:
+            while True:
+                while len(running) < max_concurrency:
+                    if (job := self.next_job(jobs, fallback_jobs)) is None:
+                        break
+                    running.add(
+                        executor.submit(
+                            self.run_bulk_job, job, fields, **request_kwargs
+                        )
+                    )
+                if not running:
+                    return
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results, new_jobs = future.result()
+                    fallback_jobs.extend(new_jobs)
+                    yield from results
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+
+class AsyncBulkMixin(BaseBulk):
+    async def run_bulk_job(self, job, fields, **request_kwargs) -> tuple[list, list]:
+        is_batch, uris = job
+        if is_batch:
+            response = await self.get(
+                self.videos_url,
+                params=self.get_batch_params(uris, fields),
+                **request_kwargs,
+            )
+            if (results := self.read_batch(uris, response)) is not None:
+                return results, []
+            return [], [(False, [uri]) for uri in uris]
+        response = await self.get(
+            f"{self.api_url}{uris[0]}",
+            params=self.get_fields_params(fields),
+            **request_kwargs,
+        )
+        return [self.read_single(uris[0], response)], []
+
+    async def get_many(
+        self,
+        uris: Iterable[str],
+        fields: Optional[list[str]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        **request_kwargs,
+    ) -> AsyncIterator[tuple]:
+        """
+        Async counterpart of `SyncBulkMixin.get_many`, the requests run in
+        up to `max_concurrency` tasks.
+        """
+        jobs = self.get_jobs(uris, batch_size)
+        fallback_jobs = deque()
+        running = set()
+        try:
+            while True:
+                while len(running) < max_concurrency:
+                    if (job := self.next_job(jobs, fallback_jobs)) is None:
+                        break
+                    running.add(
+                        asyncio.create_task(
+                            self.run_bulk_job(job, fields, **request_kwargs)
+                        )
+                    )
+                if not running:
+                    return
+                done, running = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    results, new_jobs = task.result()
+                    fallback_jobs.extend(new_jobs)
+                    for result in results:
+                        yield result
+        finally:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
@@ -1,11 +1,122 @@
+import typing
+
 import httpx
 
+from ._auth import BaseOauth2Auth
+from ._bulk import AsyncBulkMixin, SyncBulkMixin
+from ._http_cache import AsyncCacheTransport, BaseHTTPCache, CacheTransport
+from ._instrumentation import Instrumentation
+from ._pagination import AsyncPaginationMixin, SyncPaginationMixin
+from ._presets import get_preset_kwargs
+from ._rate_limit import AsyncRateLimitTransport, RateLimiter, RateLimitTransport
 from ._upload import SyncUploadMixin, AsyncUploadMixin
 
 
-class VimeoClient(SyncUploadMixin, httpx.Client):
-    pass
+def get_rate_limiter(
+    rate_limiter: typing.Union[RateLimiter, bool]
+) -> typing.Optional[RateLimiter]:
+    if rate_limiter is True:
+        return RateLimiter()
+    return rate_limiter or None
+
+
+def wrap_transports(client, wrap: typing.Callable):
+    client._transport = wrap(client._transport)
+    client._mounts = {
+        pattern: transport and wrap(transport)
+        for pattern, transport in client._mounts.items()
+    }
+
+
+def bind_instrumentation(client, instrumentation: typing.Optional[Instrumentation]):
+    client.instrumentation = instrumentation
+    if instrumentation is None:
+        return
+    # Components given their own instrumentation keep it.
+    for component in (client.rate_limiter, client.auth):
+        if (
+            isinstance(component, (RateLimiter, BaseOauth2Auth))
+            and component.instrumentation is None
+        ):
+            component.instrumentation = instrumentation
+
+
+def get_cache_scope(auth) -> typing.Optional[str]:
+    # Keep the cached responses across the token refreshes.
+    return auth.cache_key if isinstance(auth, BaseOauth2Auth) else None
+
+
+class VimeoClient(SyncUploadMixin, SyncPaginationMixin, SyncBulkMixin, httpx.Client):
+    """
+    `rate_limiter` schedules the api requests from the rate limit headers
+    of vimeo, pass a `RateLimiter` to share it between clients or False to
+    disable it.
+
+    `http_cache` stores the GET responses and revalidates them with
+    conditional requests.
+
+    `preset` ("api-heavy" or "upload-heavy") sets the pool limits, the
+    timeouts and HTTP/2 for a workload, the explicit arguments win.
+
+    `instrumentation` receives the events of the client, of its auth, rate
+    limiter and uploaders, see `Instrumentation`.
+    """
+
+    def __init__(
+        self,
+        *args,
+        rate_limiter: typing.Union[RateLimiter, bool] = True,
+        http_cache: typing.Optional[BaseHTTPCache] = None,
+        preset: typing.Optional[str] = None,
+        instrumentation: typing.Optional[Instrumentation] = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **get_preset_kwargs(preset, kwargs))
+        self.rate_limiter = get_rate_limiter(rate_limiter)
+        self.http_cache = http_cache
+        bind_instrumentation(self, instrumentation)
+        if self.rate_limiter is not None:
+            wrap_transports(
+                self, lambda transport: RateLimitTransport(transport, self.rate_limiter)
+            )
+        if self.http_cache is not None:
+            # The responses served from the cache don't use the rate limit.
+            scope = get_cache_scope(self.auth)
+            wrap_transports(
+                self, lambda transport: CacheTransport(transport, http_cache, scope)
+            )
+        if isinstance(self.auth, BaseOauth2Auth):
+            # Token requests reuse the connection pool and the rate limiter
+            # of the client.
+            self.auth.bind_transport(self._transport)
 
 
-class AsyncVimeoClient(AsyncUploadMixin, httpx.AsyncClient):
-    pass
+class AsyncVimeoClient(
+    AsyncUploadMixin, AsyncPaginationMixin, AsyncBulkMixin, httpx.AsyncClient
+):
+    def __init__(
+        self,
+        *args,
+        rate_limiter: typing.Union[RateLimiter, bool] = True,
+        http_cache: typing.Optional[BaseHTTPCache] = None,
+        preset: typing.Optional[str] = None,
+        instrumentation: typing.Optional[Instrumentation] = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **get_preset_kwargs(preset, kwargs))
+        self.rate_limiter = get_rate_limiter(rate_limiter)
+        self.http_cache = http_cache
+        bind_instrumentation(self, instrumentation)
+        if self.rate_limiter is not None:
+            wrap_transports(
+                self,
+                lambda transport: AsyncRateLimitTransport(transport, self.rate_limiter),
+            )
+        if self.http_cache is not None:
+            scope = get_cache_scope(self.auth)
+            wrap_transports(
+                self,
+                lambda transport: AsyncCacheTransport(transport, http_cache, scope),
+            )
+        if isinstance(self.auth, BaseOauth2Auth):
+            self.auth.bind_async_transport(self._transport)
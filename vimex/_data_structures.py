@@ -1,6 +1,5 @@
-from dataclasses import dataclass
 from enum import Enum
-from typing import NamedTuple
+from typing import IO, Any, Iterable, Iterator, NamedTuple, Optional, Union
 
 
 class GrantType(Enum):
@@ -19,8 +18,177 @@ class DeviceCodeGrantResponse(NamedTuple):
     interval: int
 
 
-@dataclass
+class DevicePollStatus(NamedTuple):
+    attempt: int
+    status_code: int
+    # OAuth error code, e.g. `authorization_pending` or `slow_down`.
+    error: Optional[str]
+    # Seconds before the next attempt.
+    interval: float
+    elapsed: float
+
+
+class CachedToken(NamedTuple):
+    access_token: str
+    # Unix timestamp, None when the token doesn't expire.
+    expires_at: Optional[float] = None
+
+
+class CachedResponse(NamedTuple):
+    status_code: int
+    # Raw (name, value) pairs, the content is kept encoded.
+    headers: list
+    content: bytes
+    # Unix timestamp of the last validation with the server.
+    stored_at: float
+
+    def get_header(self, name: str) -> Optional[str]:
+        name = name.lower()
+        for key, value in self.headers:
+            if key.lower() == name:
+                return value
+        return None
+
+
+class Event(NamedTuple):
+    # Dotted name, e.g. "upload.patch".
+    name: str
+    # Duration in seconds for the timed events, a level or delay otherwise.
+    value: Optional[float]
+    attributes: dict
+    # Unix timestamp of the emission.
+    timestamp: float
+
+
 class ServerFlowResult:
-    code: str = None
-    received_state: str = None
-    access_token: str = None
+    __slots__ = ("code", "received_state", "access_token")
+
+    def __init__(
+        self,
+        code: Optional[str] = None,
+        received_state: Optional[str] = None,
+        access_token: Optional[str] = None,
+    ):
+        self.code = code
+        self.received_state = received_state
+        self.access_token = access_token
+
+    def __repr__(self):
+        return (
+            f"ServerFlowResult(code={self.code!r}, "
+            f"received_state={self.received_state!r}, "
+            f"access_token={self.access_token!r})"
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, ServerFlowResult):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+
+class BatchItem(NamedTuple):
+    file: Union[str, IO]
+    metadata: Optional[dict] = None
+    # Lower values are uploaded first.
+    priority: int = 0
+
+
+class UploadResult(NamedTuple):
+    file: Union[str, IO]
+    uri: Optional[str]
+    duration: float
+    retries: int
+    error: Optional[Exception] = None
+
+    @property
+    def is_success(self) -> bool:
+        return self.error is None
+
+
+def _from_json(model, data: dict):
+    # Keep only the fields of the model, the rest of the payload is dropped.
+    return model(
+        *(data.get(name, model._field_defaults.get(name)) for name in model._fields)
+    )
+
+
+class Video(NamedTuple):
+    uri: str
+    name: Optional[str] = None
+    description: Optional[str] = None
+    # Seconds.
+    duration: Optional[int] = None
+    link: Optional[str] = None
+    created_time: Optional[str] = None
+    status: Optional[str] = None
+
+    @classmethod
+    def from_json(cls, data: dict) -> "Video":
+        return _from_json(cls, data)
+
+
+class UploadTicket(NamedTuple):
+    upload_link: str
+    uri: str
+
+    @classmethod
+    def from_json(cls, data: dict) -> "UploadTicket":
+        return cls(upload_link=data["upload"]["upload_link"], uri=data["uri"])
+
+
+class TokenResponse(NamedTuple):
+    access_token: Optional[str]
+    token_type: Optional[str] = None
+    scope: Optional[str] = None
+    # Seconds, None when the token doesn't expire.
+    expires_in: Optional[float] = None
+
+    @classmethod
+    def from_json(
+        cls, data: dict, token_field_name: str = "access_token"
+    ) -> "TokenResponse":
+        return cls(
+            access_token=data.get(token_field_name),
+            token_type=data.get("token_type"),
+            scope=data.get("scope"),
+            expires_in=data.get("expires_in"),
+        )
+
+
+class Page(NamedTuple):
+    # The decoded items, turned into models on iteration.
+    data: list
+    total: Optional[int] = None
+    page: Optional[int] = None
+    per_page: Optional[int] = None
+    next: Optional[str] = None
+
+    @classmethod
+    def from_json(cls, payload: dict) -> "Page":
+        return cls(
+            data=payload.get("data") or [],
+            total=payload.get("total"),
+            page=payload.get("page"),
+            per_page=payload.get("per_page"),
+            next=(payload.get("paging") or {}).get("next"),
+        )
+
+    def iter_models(self, model=Video) -> Iterator:
+        return (model.from_json(item) for item in self.data)
+
+
+def to_columns(
+    models: Iterable[NamedTuple], fields: Optional[Iterable[str]] = None
+) -> dict[str, list[Any]]:
+    """
+    Export models as one list per field, e.g. to build a dataframe.
+    """
+    columns = None
+    for model in models:
+        if columns is None:
+            columns = {name: [] for name in fields or model._fields}
+        for name, column in columns.items():
+            column.append(getattr(model, name))
+    return columns if columns is not None else {name: [] for name in fields or ()}
@@ -0,0 +1,342 @@
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import httpx
+
+from ._data_structures import CachedResponse
+
+# Request headers the cached representations depend on.
+VARY_HEADERS = ("accept", "accept-encoding")
+
+
+class BaseHTTPCache:
+    """
+    Store the responses of GET requests for conditional requests.
+
+    At most `max_entries` responses are kept, the least recently used are
+    evicted first, and responses not validated for `ttl` seconds are
+    dropped. `hits` counts the responses served from the cache, `misses`
+    the ones downloaded.
+    """
+
+    # Whether the cache does I/O, the async transport runs it in a worker thread.
+    blocking = True
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def is_expired(self, entry: CachedResponse) -> bool:
+        return self.ttl is not None and time.time() - entry.stored_at > self.ttl
+
+    def record(self, hit: bool):
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        raise NotImplementedError
+
+    def set(self, key: str, entry: CachedResponse):
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+
+class MemoryHTTPCache(BaseHTTPCache):
+    blocking = False
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = None):
+        super().__init__(max_entries, ttl)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self.is_expired(entry):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CachedResponse):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class FileHTTPCache(BaseHTTPCache):
+    """
+    Keep the responses in a directory, one json file per entry written
+    atomically. The modification time of the files tracks their last use.
+
+    The entries are counted in process, the directory is only scanned once
+    it holds more than `max_entries` files and the least recently used ones
+    are then evicted in a batch, down to `max_entries - max_entries // 10`.
+    """
+
+    def __init__(
+        self, directory: str, max_entries: int = 1024, ttl: Optional[float] = None
+    ):
+        super().__init__(max_entries, ttl)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # Number of entries in the directory, counted on the first set.
+        self._count: Optional[int] = None
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        entry = CachedResponse(
+            status_code=data["status_code"],
+            headers=[tuple(header) for header in data["headers"]],
+            content=base64.b64decode(data["content"]),
+            stored_at=data["stored_at"],
+        )
+        if self.is_expired(entry):
+            self.delete(key)
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return entry
+
+    def set(self, key: str, entry: CachedResponse):
+        data = {
+            "status_code": entry.status_code,
+            "headers": entry.headers,
+            "content": base64.b64encode(entry.content).decode(),
+            "stored_at": entry.stored_at,
+        }
+        path = self._path(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            with self._lock:
+                is_new = not os.path.exists(path)
+                os.replace(tmp_path, path)
+                if self._count is None:
+                    self._count = len(self._scan())
+                elif is_new:
+                    self._count += 1
+                if self._count > self.max_entries:
+                    self._evict()
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def delete(self, key: str):
+        with self._lock:
+            try:
+                os.unlink(self._path(key))
+            except FileNotFoundError:
+                return
+            if self._count is not None:
+                self._count -= 1
+
+    def _scan(self) -> list:
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                try:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except FileNotFoundError:
+                    continue
+        return entries
+
+    def _evict(self):
+        # Called with the lock held, trims a batch to not scan on every set.
+        entries = self._scan()
+        keep = self.max_entries - self.max_entries // 10
+        if len(entries) > keep:
+            entries.sort()
+            for _, path in entries[: len(entries) - keep]:
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+        self._count = min(len(entries), keep)
+
+
+class BaseCacheTransport:
+    """
+    Send the GET requests with `If-None-Match`/`If-Modified-Since` when a
+    response is cached and serve the 304 responses from the cache.
+
+    The entries are keyed by the url, the `scope` of the credentials (the
+    Authorization header when missing) and the `VARY_HEADERS`. Responses
+    validated less than `max_age` seconds ago are served without a request.
+    """
+
+    def __init__(
+        self, transport, cache: BaseHTTPCache, scope: Optional[str] = None, max_age=0
+    ):
+        self.transport = transport
+        self.cache = cache
+        self.scope = scope
+        self.max_age = max_age
+
+    def get_key(self, request: httpx.Request) -> str:
+        scope = self.scope or request.headers.get("authorization", "")
+        parts = [str(request.url), scope]
+        parts.extend(request.headers.get(name, "") for name in VARY_HEADERS)
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+    @staticmethod
+    def is_cacheable(request: httpx.Request) -> bool:
+        return request.method == "GET" and "no-store" not in request.headers.get(
+            "cache-control", ""
+        )
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        return time.time() - entry.stored_at < self.max_age
+
+    @staticmethod
+    def set_conditional_headers(request: httpx.Request, entry: CachedResponse):
+        if (etag := entry.get_header("etag")) is not None:
+            request.headers.setdefault("If-None-Match", etag)
+        if (last_modified := entry.get_header("last-modified")) is not None:
+            request.headers.setdefault("If-Modified-Since", last_modified)
+
+    @staticmethod
+    def is_storable(response: httpx.Response) -> bool:
+        headers = response.headers
+        return (
+            response.status_code == 200
+            and "no-store" not in headers.get("cache-control", "")
+            and ("etag" in headers or "last-modified" in headers)
+        )
+
+    @staticmethod
+    def to_entry(response: httpx.Response, content: bytes) -> CachedResponse:
+        return CachedResponse(
+            status_code=response.status_code,
+            headers=[
+                (key.decode("latin-1"), value.decode("latin-1"))
+                for key, value in response.headers.raw
+            ],
+            content=content,
+            stored_at=time.time(),
+        )
+
+    @staticmethod
+    def revalidated(entry: CachedResponse, response: httpx.Response):
+        # The 304 carries the up to date validators.
+        updated = [
+            name
+            for name in ("etag", "last-modified", "cache-control", "expires")
+            if name in response.headers
+        ]
+        headers = [
+            (key, value) for key, value in entry.headers if key.lower() not in updated
+        ]
+        headers.extend((name, response.headers[name]) for name in updated)
+        return entry._replace(headers=headers, stored_at=time.time())
+
+    @staticmethod
+    def to_response(entry: CachedResponse, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            entry.status_code,
+            headers=entry.headers,
+            stream=httpx.ByteStream(entry.content),
+            request=request,
+        )
+
+
+class CacheTransport(BaseCacheTransport, httpx.BaseTransport):
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.is_cacheable(request):
+            return self.transport.handle_request(request)
+        key = self.get_key(request)
+        entry = self.cache.get(key)
+        if entry is not None:
+            if self.is_fresh(entry):
+                self.cache.record(hit=True)
+                return self.to_response(entry, request)
+            self.set_conditional_headers(request, entry)
+        response = self.transport.handle_request(request)
+        if entry is not None and response.status_code == 304:
+            response.close()
+            entry = self.revalidated(entry, response)
+            self.cache.set(key, entry)
+            self.cache.record(hit=True)
+            return self.to_response(entry, request)
+        self.cache.record(hit=False)
+        if not self.is_storable(response):
+            return response
+        # The raw content, decoded by the client like the one of the network.
+        entry = self.to_entry(response, b"".join(response.iter_raw()))
+        self.cache.set(key, entry)
+        return self.to_response(entry, request)
+
+    def close(self):
+        self.transport.close()
+
+
+class AsyncCacheTransport(BaseCacheTransport, httpx.AsyncBaseTransport):
+    async def run_cache(self, method, *args):
+        if self.cache.blocking:
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.is_cacheable(request):
+            return await self.transport.handle_async_request(request)
+        key = self.get_key(request)
+        entry = await self.run_cache(self.cache.get, key)
+        if entry is not None:
+            if self.is_fresh(entry):
+                self.cache.record(hit=True)
+                return self.to_response(entry, request)
+            self.set_conditional_headers(request, entry)
+        response = await self.transport.handle_async_request(request)
+        if entry is not None and response.status_code == 304:
+            await response.aclose()
+            entry = self.revalidated(entry, response)
+            await self.run_cache(self.cache.set, key, entry)
+            self.cache.record(hit=True)
+            return self.to_response(entry, request)
+        self.cache.record(hit=False)
+        if not self.is_storable(response):
+            return response
+        content = b"".join([part async for part in response.aiter_raw()])
+        entry = self.to_entry(response, content)
+        await self.run_cache(self.cache.set, key, entry)
+        return self.to_response(entry, request)
+
+    async def aclose(self):
+        await self.transport.aclose()
@@ -0,0 +1,255 @@
+"""
+Events emitted by the clients, the auths and the tus uploaders:
+
+- `token.fetch`: a token request, the value is its duration, `grant_type`
+  and `success` are attached.
+- `upload.patch`: a PATCH request of an upload, the value is its duration,
+  `bytes`, `offset` and `status_code` are attached.
+- `upload.retry`: a failed PATCH retried, the value is the backoff delay.
+- `rate_limit.headroom`: the requests left in the rate limit budget, with
+  the `limit`.
+- `rate_limit.retry`: a 429 retried, the value is the delay before the
+  retry.
+"""
+import logging
+import math
+import threading
+import time
+from collections import Counter
+from typing import Callable, Iterable, Optional
+
+from ._data_structures import Event
+
+logger = logging.getLogger(__name__)
+
+Hook = Callable[[Event], None]
+
+
+def get_metric_name(prefix: str, event_name: str, suffix: str = "") -> str:
+    return f"{prefix}_{event_name.replace('.', '_')}{suffix}"
+
+
+class Instrumentation:
+    """
+    Dispatch the events to `hooks`, called in the thread (or task) that
+    emits them. A failing hook is logged and doesn't break the request.
+
+    The instrumented objects skip the timing when they have no
+    instrumentation, and `emit` returns at once without hooks.
+    """
+
+    def __init__(self, hooks: Iterable[Hook] = ()):
+        self.hooks = list(hooks)
+
+    def add_hook(self, hook: Hook):
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook: Hook):
+        self.hooks.remove(hook)
+
+    def emit(self, name: str, value: Optional[float] = None, **attributes):
+        if not self.hooks:
+            return
+        event = Event(name, value, attributes, time.time())
+        for hook in self.hooks:
+            try:
+                hook(event)
+            except Exception:
+                logger.exception("Instrumentation hook %r failed", hook)
+
+
+class LatencyHistogram:
+    """
+    Count durations in log-linear buckets like HdrHistogram: the durations,
+    in `unit` seconds, are grouped by power of two and every group is split
+    in `2 ** significant_bits` linear buckets, so the quantiles have a
+    relative error below `2 ** -significant_bits` whatever the range.
+    """
+
+    def __init__(self, significant_bits: int = 7, unit: float = 1e-6):
+        self.significant_bits = significant_bits
+        self.unit = unit
+        # Bucket key -> count, only the used buckets are stored.
+        self.buckets = Counter()
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def get_key(self, value: float) -> int:
+        units = max(int(value / self.unit), 0)
+        shift = max(units.bit_length() - self.significant_bits, 0)
+        # The keys sort like the values.
+        return shift << self.significant_bits | units >> shift
+
+    def get_value(self, key: int) -> float:
+        """
+        Return the middle of the bucket `key`, in seconds.
+        """
+        shift = key >> self.significant_bits
+        mantissa = key & ((1 << self.significant_bits) - 1)
+        return ((mantissa << shift) + ((1 << shift) - 1) / 2) * self.unit
+
+    def record(self, value: float):
+        self.buckets[self.get_key(value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Return the duration below which `q` (between 0 and 1) of the
+        recorded durations fall, None when nothing was recorded.
+        """
+        if not self.count:
+            return None
+        rank = max(math.ceil(q * self.count), 1)
+        seen = 0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen >= rank:
+                return min(max(self.get_value(key), self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+
+class MetricsCollector:
+    """
+    Hook aggregating the events: a latency histogram per timed event, the
+    number of events and of bytes sent, and the last level of the gauges.
+
+    `to_prometheus` renders them in the Prometheus text format, ready to be
+    served on a `/metrics` endpoint.
+    """
+
+    timed_events = frozenset({"token.fetch", "upload.patch"})
+    gauge_events = frozenset({"rate_limit.headroom"})
+    quantiles = (0.5, 0.9, 0.99, 0.999)
+
+    def __init__(self, significant_bits: int = 7):
+        self.significant_bits = significant_bits
+        self.histograms: dict[str, LatencyHistogram] = {}
+        self.counts = Counter()
+        self.bytes = Counter()
+        self.gauges: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Event):
+        with self._lock:
+            if event.name in self.gauge_events:
+                if event.value is not None:
+                    self.gauges[event.name] = event.value
+                return
+            self.counts[event.name] += 1
+            if size := event.attributes.get("bytes"):
+                self.bytes[event.name] += size
+            if event.name in self.timed_events and event.value is not None:
+                if event.name not in self.histograms:
+                    self.histograms[event.name] = LatencyHistogram(
+                        self.significant_bits
+                    )
+                self.histograms[event.name].record(event.value)
+
+    def throughput(self, name: str = "upload.patch") -> Optional[float]:
+        """
+        Return the bytes per second sent by the `name` events while their
+        requests were running.
+        """
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None or not histogram.sum:
+                return None
+            return self.bytes[name] / histogram.sum
+
+    def to_prometheus(self, prefix: str = "vimex") -> str:
+        lines = []
+        with self._lock:
+            for name, histogram in sorted(self.histograms.items()):
+                metric = get_metric_name(prefix, name, "_seconds")
+                lines.append(f"# TYPE {metric} summary")
+                for q in self.quantiles:
+                    lines.append(
+                        f'{metric}{{quantile="{q}"}} {histogram.quantile(q)!r}'
+                    )
+                lines.append(f"{metric}_sum {histogram.sum!r}")
+                lines.append(f"{metric}_count {histogram.count}")
+            for name, count in sorted(self.counts.items()):
+                if name in self.histograms:
+                    # Already exported as the summary count.
+                    continue
+                metric = get_metric_name(prefix, name, "_total")
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {count}")
+            for name, size in sorted(self.bytes.items()):
+                metric = get_metric_name(prefix, name, "_bytes_total")
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {size}")
+            for name, value in sorted(self.gauges.items()):
+                metric = get_metric_name(prefix, name)
+                lines.append(f"# TYPE {metric} gauge")
+                lines.append(f"{metric} {value!r}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+class OpenTelemetryHook:
+    """
+    Hook recording the events in OpenTelemetry instruments created from
+    `meter`, the meter of the global provider by default. Requires the
+    `opentelemetry-api` package.
+    """
+
+    timed_events = MetricsCollector.timed_events
+    gauge_events = MetricsCollector.gauge_events
+
+    def __init__(self, meter=None, prefix: str = "vimex"):
+        if meter is None:
+            from opentelemetry import metrics
+
+            meter = metrics.get_meter("vimex")
+        self.meter = meter
+        self.prefix = prefix
+        self.instruments = {}
+        self.gauges: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def get_instrument(self, name: str, kind: str, suffix: str, unit: str):
+        key = (name, suffix)
+        with self._lock:
+            if key not in self.instruments:
+                metric = get_metric_name(self.prefix, name, suffix)
+                if kind == "gauge":
+                    self.instruments[key] = self.meter.create_observable_gauge(
+                        metric, callbacks=[self.get_gauge_callback(name)], unit=unit
+                    )
+                else:
+                    create = getattr(self.meter, f"create_{kind}")
+                    self.instruments[key] = create(metric, unit=unit)
+            return self.instruments[key]
+
+    def get_gauge_callback(self, name: str):
+        from opentelemetry.metrics import Observation
+
+        def callback(options):
+            if name in self.gauges:
+                yield Observation(self.gauges[name])
+
+        return callback
+
+    def __call__(self, event: Event):
+        if event.name in self.gauge_events:
+            if event.value is not None:
+                self.gauges[event.name] = event.value
+                self.get_instrument(event.name, "gauge", "", "1")
+            return
+        if event.name in self.timed_events and event.value is not None:
+            self.get_instrument(event.name, "histogram", "_seconds", "s").record(
+                event.value
+            )
+        else:
+            self.get_instrument(event.name, "counter", "_total", "1").add(1)
+        if size := event.attributes.get("bytes"):
+            self.get_instrument(event.name, "counter", "_bytes", "By").add(size)
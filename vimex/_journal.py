@@ -0,0 +1,53 @@
+import json
+import os
+import tempfile
+import threading
+from typing import Optional
+
+
+class UploadJournal:
+    """
+    Persist the state of the running tus uploads in a json file, mapping
+    a file fingerprint to its upload link and last acknowledged offset.
+
+    A restarted process can look up the upload link of a file and resume
+    the upload instead of starting from scratch.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _dump(self, entries: dict):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def get(self, fingerprint: str) -> Optional[dict]:
+        with self._lock:
+            return self._load().get(fingerprint)
+
+    def save(self, fingerprint: str, upload_link: str, offset: int):
+        with self._lock:
+            entries = self._load()
+            entries[fingerprint] = {"upload_link": upload_link, "offset": offset}
+            self._dump(entries)
+
+    def remove(self, fingerprint: str):
+        with self._lock:
+            entries = self._load()
+            if entries.pop(fingerprint, None) is not None:
+                self._dump(entries)
@@ -1,38 +1,155 @@
 import asyncio
-import sys
-import webbrowser
+import json
+import threading
 import time
 import logging
-from typing import Optional
+from concurrent.futures import Future
+from functools import cached_property, lru_cache
+from typing import TYPE_CHECKING, Callable, Optional
+from urllib.parse import parse_qs, urlsplit
 
 import httpx
-import uvicorn
-from starlette.applications import Starlette
-from starlette.requests import Request
-from starlette.responses import JSONResponse, HTMLResponse
-from starlette.routing import Route
 
-from ._data_structures import ServerFlowResult
+from ._data_structures import DevicePollStatus, ServerFlowResult
+from ._exceptions import AuthorizationStateException
+from ._response import loads
 
 
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+    from starlette.requests import Request
+
+# uvicorn, starlette, webbrowser and http.server are imported on first use,
+# `import vimex` must stay cheap for the flows that don't need a server.
+
 logger = logging.getLogger(__name__)
 
 
-class Server:
-    def __init__(self, port: Optional[int] = 5555, redirect_on_fragment=False):
-        self._redirect_on_fragment = redirect_on_fragment
-        self._routes = [
-            Route("/", self.callback),
-        ]
+IMPLICIT_GRANT_REDIRECT = """<html><body><script>
+if (window.location.hash) {
+    window.location.replace(window.location.href.replace("#", "?"));
+}
+</script></body></html>"""
 
-        self._app = Starlette(routes=self._routes)
-        self._config = uvicorn.Config(app=self._app, port=port)
-        self._server = uvicorn.Server(self._config)
+
+class BaseServer:
+    """
+    Receive the redirect of the authorization server on a local port.
+    """
+
+    def __init__(
+        self,
+        port: Optional[int] = 5555,
+        redirect_on_fragment=False,
+        host: str = "127.0.0.1",
+    ):
+        self._host = host
+        self._port = port
+        self.redirect_on_fragment = redirect_on_fragment
+        self._redirect_on_fragment = redirect_on_fragment
 
         # Response from vimeo.
         self.result = ServerFlowResult()
 
+    def reset(self):
+        """
+        Forget the previous authorization, the server can be used again.
+        """
+        self._redirect_on_fragment = self.redirect_on_fragment
+        self.result = ServerFlowResult()
+
+    @property
+    def host(self):
+        return self._host
+
+    @property
+    def port(self):
+        return self._port
+
+    def get_authorization_grant(self, link, state=None) -> ServerFlowResult:
+        raise NotImplementedError
+
+    async def async_get_authorization_grant(self, link, state=None) -> ServerFlowResult:
+        raise NotImplementedError
+
+    def open_link(self, link):
+        import webbrowser
+
+        webbrowser.open(link)
+
+    def poll_authorize_url(
+        self,
+        url: str,
+        expires_in: int,
+        interval: int,
+        headers=None,
+        data=None,
+        client: Optional[httpx.Client] = None,
+        on_progress: Optional[Callable[[DevicePollStatus], None]] = None,
+    ) -> httpx.Response:
+        poller = DeviceCodePoller(url, expires_in, interval, on_progress)
+        _client, _auto_created = client, False
+        if _client is None:
+            _client, _auto_created = httpx.Client(), True
+        try:
+            while not poller.is_expired():
+                response = _client.post(url, headers=headers, data=data)
+                if poller.process(response):
+                    return response
+                time.sleep(poller.get_delay())
+        finally:
+            if _auto_created:
+                _client.close()
+        raise TimeoutError(f"The polling to {url} timeout..")
+
+    async def async_poll_authorize_url(
+        self,
+        url: str,
+        expires_in: int,
+        interval: int,
+        headers=None,
+        data=None,
+        client: Optional[httpx.AsyncClient] = None,
+        on_progress: Optional[Callable[[DevicePollStatus], None]] = None,
+    ) -> httpx.Response:
+        """
+        Async counterpart of `poll_authorize_url`, cancelling the calling
+        task stops the polling.
+        """
+        poller = DeviceCodePoller(url, expires_in, interval, on_progress)
+        _client, _auto_created = client, False
+        if _client is None:
+            _client, _auto_created = httpx.AsyncClient(), True
+        try:
+            while not poller.is_expired():
+                response = await _client.post(url=url, headers=headers, data=data)
+                if poller.process(response):
+                    return response
+                await asyncio.sleep(poller.get_delay())
+        finally:
+            if _auto_created:
+                await _client.aclose()
+        raise TimeoutError(f"The polling to {url} timeout..")
+
+
+class Server(BaseServer):
+    @cached_property
+    def _server(self):
+        import uvicorn
+        from starlette.applications import Starlette
+        from starlette.routing import Route
+
+        routes = [
+            Route("/", self.callback),
+        ]
+        app = Starlette(routes=routes)
+        config = uvicorn.Config(app=app, host=self._host, port=self._port)
+        return uvicorn.Server(config)
+
     def implicit_grant_redirect(self):
+        from starlette.responses import HTMLResponse
+
         self._redirect_on_fragment = False
         return HTMLResponse(
             """<html><body><script>
@@ -41,7 +158,9 @@ class Server:
         </script></body></html>"""
         )
 
-    async def callback(self, request: Request):
+    async def callback(self, request: "Request"):
+        from starlette.responses import JSONResponse
+
         if self._redirect_on_fragment:
             return self.implicit_grant_redirect()
         self.result.code = request.query_params.get("code")
@@ -50,13 +169,10 @@ class Server:
         self.stop()
         return JSONResponse({"details": "Success"})
 
-    @property
-    def host(self):
-        return self._server.config.host
-
-    @property
-    def port(self):
-        return self._server.config.port
+    def reset(self):
+        super().reset()
+        # A stopped uvicorn server exits right after its startup.
+        self.__dict__.pop("_server", None)
 
     def run(self):
         self._server.run()
@@ -70,58 +186,235 @@ class Server:
     async def shutdown(self):
         await self._server.shutdown()
 
-    def get_authorization_grant(self, link) -> ServerFlowResult:
+    def get_authorization_grant(self, link, state=None) -> ServerFlowResult:
+        self.reset()
         self.open_link(link)
         self.run()
         return self.result
 
-    async def async_get_authorization_grant(self, link) -> ServerFlowResult:
+    async def async_get_authorization_grant(self, link, state=None) -> ServerFlowResult:
+        self.reset()
         await asyncio.to_thread(self.open_link, link)
         await self.serve()
         return self.result
 
-    def open_link(self, link):
-        webbrowser.open(link)
 
-    def poll_authorize_url(
-        self,
-        url: str,
-        expires_in: int,
-        interval: int,
-        headers=None,
-        data=None,
-    ) -> httpx.Response:
-        timeout_sec = expires_in
-        start = time.monotonic()
-
-        with httpx.Client() as client:
-            while time.monotonic() < start + timeout_sec:
-                sys.stdout.write(f"Polling {url}..")
-                response = client.post(url, headers=headers, data=data)
-                if response.is_success:
-                    return response
-                time.sleep(interval)
-        raise TimeoutError(f"The polling to {url} timeout..")
+class CallbackServer(BaseServer):
+    """
+    Lightweight alternative to `Server`, built on a shared `http.server`
+    listener, so several authorizations can run at once on the same port.
+    """
 
-    async def async_poll_authorize_url(
+    @property
+    def listener(self) -> "CallbackListener":
+        return CallbackListener.get(self.host, self.port)
+
+    def get_authorization_grant(self, link, state=None) -> ServerFlowResult:
+        future = self.listener.register(state)
+        try:
+            self.open_link(link)
+            self.result = future.result()
+        finally:
+            future.cancel()
+        return self.result
+
+    async def async_get_authorization_grant(self, link, state=None) -> ServerFlowResult:
+        future = self.listener.register(state)
+        try:
+            await asyncio.to_thread(self.open_link, link)
+            self.result = await asyncio.wrap_future(future)
+        finally:
+            future.cancel()
+        return self.result
+
+
+class CallbackListener:
+    """
+    Minimal http listener running in a background thread, it hands the
+    redirects to the pending authorizations according to their `state`
+    and stops once none is left.
+    """
+
+    _listeners = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._httpd: Optional["ThreadingHTTPServer"] = None
+        self._stopping: Optional[threading.Thread] = None
+
+    @classmethod
+    def get(cls, host: str, port: int) -> "CallbackListener":
+        with cls._registry_lock:
+            if (host, port) not in cls._listeners:
+                cls._listeners[host, port] = cls(host, port)
+            return cls._listeners[host, port]
+
+    def register(self, state) -> Future:
+        future = Future()
+        with self._lock:
+            if state in self._pending:
+                raise AuthorizationStateException(
+                    f"An authorization with state {state!r} is already pending."
+                )
+            self._pending[state] = future
+            if self._httpd is None:
+                self._start()
+        future.add_done_callback(lambda _: self._discard(state, future))
+        return future
+
+    def resolve(self, params: dict) -> bool:
+        state = params.get("state")
+        with self._lock:
+            future = self._pending.get(state)
+        if future is None or not future.set_running_or_notify_cancel():
+            return False
+        future.set_result(
+            ServerFlowResult(
+                code=params.get("code"),
+                received_state=state,
+                access_token=params.get("access_token"),
+            )
+        )
+        return True
+
+    def _discard(self, state, future):
+        with self._lock:
+            if self._pending.get(state) is future:
+                del self._pending[state]
+            if not self._pending:
+                self._stop()
+
+    def _start(self):
+        from http.server import ThreadingHTTPServer
+
+        if self._stopping is not None:
+            # Wait for the previous server to release the port.
+            self._stopping.join()
+            self._stopping = None
+        handler = type(
+            "CallbackRequestHandler", (get_request_handler_class(),), {"listener": self}
+        )
+        self._httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+
+    def _stop(self):
+        httpd, self._httpd = self._httpd, None
+        if httpd is None:
+            return
+
+        def stop():
+            httpd.shutdown()
+            httpd.server_close()
+
+        # Stopping may be triggered by a request handler, which must not
+        # wait for the server loop.
+        self._stopping = threading.Thread(target=stop, daemon=True)
+        self._stopping.start()
+
+
+@lru_cache(maxsize=None)
+def get_request_handler_class():
+    """
+    Build the request handler of `CallbackListener`, deferred to keep
+    http.server out of the import of vimex.
+    """
+    from http.server import BaseHTTPRequestHandler
+
+    class CallbackRequestHandler(BaseHTTPRequestHandler):
+        listener: CallbackListener
+
+        def do_GET(self):
+            params = {
+                key: values[0]
+                for key, values in parse_qs(urlsplit(self.path).query).items()
+            }
+            if not params:
+                # The implicit grant sends the token in the url fragment.
+                self.send(200, "text/html", IMPLICIT_GRANT_REDIRECT)
+            elif self.listener.resolve(params):
+                self.send(200, "application/json", json.dumps({"details": "Success"}))
+            else:
+                self.send(400, "application/json", json.dumps({"details": "Bad state"}))
+
+        def send(self, status_code: int, content_type: str, body: str):
+            content = body.encode()
+            self.send_response(status_code)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, format, *args):
+            logger.debug(format, *args)
+
+    return CallbackRequestHandler
+
+
+class DeviceCodePoller:
+    """
+    State of the polling of a device code grant (RFC 8628).
+
+    `authorization_pending` keeps the interval, `slow_down` increases it
+    by `slow_down_increment` seconds and the terminal errors end the
+    polling with the failed response.
+    """
+
+    slow_down_increment = 5
+    terminal_errors = frozenset({"access_denied", "expired_token"})
+
+    def __init__(
         self,
         url: str,
-        expires_in: int,
-        interval: int,
-        headers=None,
-        data=None,
+        expires_in: float,
+        interval: float,
+        on_progress: Optional[Callable[[DevicePollStatus], None]] = None,
     ):
-        timeout_sec = expires_in
-        start = time.monotonic()
-
-        async with httpx.AsyncClient() as client:
-            while time.monotonic() < start + timeout_sec:
-                sys.stdout.write(f"Polling {url}..")
-                response = await client.post(url=url, headers=headers, data=data)
-                if response.is_success:
-                    return response
-                await asyncio.sleep(interval)
-        raise TimeoutError(f"The polling to {url} timeout..")
+        self.url = url
+        self.interval = interval
+        self.on_progress = on_progress
+        self.attempt = 0
+        self.start = time.monotonic()
+        self.deadline = self.start + expires_in
+
+    def is_expired(self) -> bool:
+        return time.monotonic() >= self.deadline
+
+    def get_delay(self) -> float:
+        return max(min(self.interval, self.deadline - time.monotonic()), 0)
+
+    @staticmethod
+    def get_error(response: httpx.Response) -> Optional[str]:
+        try:
+            return loads(response.content).get("error")
+        except (ValueError, AttributeError):
+            return None
+
+    def process(self, response: httpx.Response) -> bool:
+        """
+        Handle a polling response, return True when the polling is over.
+        """
+        self.attempt += 1
+        error = None if response.is_success else self.get_error(response)
+        if error == "slow_down":
+            self.interval += self.slow_down_increment
+        logger.debug(
+            "Polling %s, attempt %s: %s", self.url, self.attempt, error or "done"
+        )
+        if self.on_progress is not None:
+            self.on_progress(
+                DevicePollStatus(
+                    attempt=self.attempt,
+                    status_code=response.status_code,
+                    error=error,
+                    interval=self.interval,
+                    elapsed=time.monotonic() - self.start,
+                )
+            )
+        return response.is_success or error in self.terminal_errors
 
 
 class MockedCallBackServer:
@@ -133,7 +426,7 @@ class MockedCallBackServer:
     def get_authorization_grant(self, *args, **kwargs):
         return self.result
 
-    async def async_get_authorization_grant(self, link) -> ServerFlowResult:
+    async def async_get_authorization_grant(self, link, state=None) -> ServerFlowResult:
         return self.result
 
     def poll_authorize_url(self, *args, **kwargs) -> httpx.Response:
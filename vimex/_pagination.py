@@ -0,0 +1,306 @@
+import asyncio
+import queue
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import AsyncIterator, Iterator, Optional
+
+import httpx
+
+from ._data_structures import Page
+from ._response import loads
+
+# Number of pages fetched ahead of the one being consumed.
+DEFAULT_PREFETCH = 1
+# Number of pages fetched at the same time by the concurrent pagination.
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+class BasePagination:
+    @staticmethod
+    def get_payload(response: httpx.Response) -> dict:
+        response.raise_for_status()
+        return loads(response.content)
+
+    @classmethod
+    def get_page(cls, response: httpx.Response) -> tuple[list, Optional[httpx.URL]]:
+        """
+        Return the items of a list response and the url of the next page.
+        """
+        return cls.get_next_page(response, cls.get_payload(response))
+
+    @staticmethod
+    def get_next_page(
+        response: httpx.Response, payload: dict
+    ) -> tuple[list, Optional[httpx.URL]]:
+        page = Page.from_json(payload)
+        return page.data, response.url.join(page.next) if page.next else None
+
+    @staticmethod
+    def to_models(data: list, model=None) -> list:
+        """
+        Build `model` (e.g. `Video`) instances from the items of a page,
+        keeping only the fields of the model.
+        """
+        return data if model is None else [model.from_json(item) for item in data]
+
+    @staticmethod
+    def get_page_urls(response: httpx.Response, payload: dict) -> list[httpx.URL]:
+        """
+        Return the urls of the pages following the one of `response`, known
+        from its `total` and `per_page`, empty when they are missing.
+        """
+        page = Page.from_json(payload)
+        try:
+            number, per_page, total = (
+                int(page.page or 1),
+                int(page.per_page),
+                int(page.total),
+            )
+        except (TypeError, ValueError):
+            return []
+        if per_page <= 0:
+            return []
+        last_page = -(-total // per_page)
+        return [
+            response.url.copy_set_param("page", next_number)
+            for next_number in range(number + 1, last_page + 1)
+        ]
+
+
+class SyncPaginationMixin(BasePagination):
+    def iter_pages(
+        self, url, params=None, model=None, **request_kwargs
+    ) -> Iterator[list]:
+        while url is not None:
+            response = self.get(url, params=params, **request_kwargs)
+            data, url = self.get_page(response)
+            # The next url carries the query of the first request.
+            params = None
+            yield self.to_models(data, model)
+
+    def paginate(
+        self,
+        url,
+        params=None,
+        prefetch: int = DEFAULT_PREFETCH,
+        model=None,
+        **request_kwargs,
+    ) -> Iterator:
+        """
+        Yield the items of a list endpoint following `paging.next`, as
+        `model` instances when given.
+
+        Up to `prefetch` pages are fetched by a background thread while the
+        current one is consumed, no more are kept in memory.
+        """
+        pages = self.iter_pages(url, params, model, **request_kwargs)
+        if prefetch < 1:
+            for page in pages:
+                yield from page
+            return
+
+        buffer = queue.Queue(maxsize=prefetch)
+        stopped = threading.Event()
+
+        def put(item):
+            while not stopped.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            try:
+                for page in pages:
+                    if not put(page):
+                        return
+                put(None)
+            except BaseException as exc:
+                put(exc)
+            finally:
+                pages.close()
+
+        thread = threading.Thread(target=produce, daemon=True)
+        thread.start()
+        try:
+            while (page := buffer.get()) is not None:
+                if isinstance(page, BaseException):
+                    raise page
+                yield from page
+        finally:
+            stopped.set()
+            thread.join()
+
+    def paginate_concurrently(
+        self,
+        url,
+        params=None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        ordered: bool = True,
+        model=None,
+        **request_kwargs,
+    ) -> Iterator:
+        """
+        Yield the items of a list endpoint, once the first page has arrived
+        the others are fetched by a pool of `max_concurrency` threads.
+
+        The items are yielded in the order of the pages when `ordered`,
+        otherwise as the pages complete. The requests are still scheduled by
+        the rate limiter of the client.
+        """
+        response = self.get(url, params=params, **request_kwargs)
+        payload = self.get_payload(response)
+        data, next_url = self.get_next_page(response, payload)
+        yield from self.to_models(data, model)
+        urls = self.get_page_urls(response, payload)
+        if next_url is not None and not urls:
+            # No total, fallback on `paging.next`.
+            for page in self.iter_pages(next_url, model=model, **request_kwargs):
+                yield from page
+            return
+        page_urls = iter(urls)
+
+        def fetch(page_url):
+            data, _ = self.get_page(self.get(page_url, **request_kwargs))
+            return self.to_models(data, model)
+
+        executor = ThreadPoolExecutor(max_concurrency)
+        running = deque()
+
+        def fill():
+            while len(running) < max_concurrency:
+                if (page_url := next(page_urls, None)) is None:
+                    break
+                running.append(executor.submit(fetch, page_url))
+
+        try:
+            fill()
+            while running:
+                if ordered:
+                    done = [running.popleft()]
+                else:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        running.remove(future)
+                for future in done:
+                    page = future.result()
+                    fill()
+                    yield from page
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+
+class AsyncPaginationMixin(BasePagination):
+    async def iter_pages(
+        self, url, params=None, model=None, **request_kwargs
+    ) -> AsyncIterator[list]:
+        while url is not None:
+            response = await self.get(url, params=params, **request_kwargs)
+            data, url = self.get_page(response)
+            params = None
+            yield self.to_models(data, model)
+
+    async def paginate(
+        self,
+        url,
+        params=None,
+        prefetch: int = DEFAULT_PREFETCH,
+        model=None,
+        **request_kwargs,
+    ) -> AsyncIterator:
+        """
+        Async counterpart of `SyncPaginationMixin.paginate`, the pages are
+        prefetched by a task cancelled when the iteration stops.
+        """
+        pages = self.iter_pages(url, params, model, **request_kwargs)
+        if prefetch < 1:
+            async for page in pages:
+                for item in page:
+                    yield item
+            return
+
+        buffer = asyncio.Queue(maxsize=prefetch)
+
+        async def produce():
+            try:
+                async for page in pages:
+                    await buffer.put(page)
+                await buffer.put(None)
+            except Exception as exc:
+                await buffer.put(exc)
+            finally:
+                await pages.aclose()
+
+        task = asyncio.create_task(produce())
+        try:
+            while (page := await buffer.get()) is not None:
+                if isinstance(page, BaseException):
+                    raise page
+                for item in page:
+                    yield item
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def paginate_concurrently(
+        self,
+        url,
+        params=None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        ordered: bool = True,
+        model=None,
+        **request_kwargs,
+    ) -> AsyncIterator:
+        """
+        Async counterpart of `SyncPaginationMixin.paginate_concurrently`,
+        the pages are fetched by up to `max_concurrency` tasks.
+        """
+        response = await self.get(url, params=params, **request_kwargs)
+        payload = self.get_payload(response)
+        data, next_url = self.get_next_page(response, payload)
+        for item in self.to_models(data, model):
+            yield item
+        urls = self.get_page_urls(response, payload)
+        if next_url is not None and not urls:
+            pages = self.iter_pages(next_url, model=model, **request_kwargs)
+            async for page in pages:
+                for item in page:
+                    yield item
+            return
+        page_urls = iter(urls)
+
+        async def fetch(page_url):
+            data, _ = self.get_page(await self.get(page_url, **request_kwargs))
+            return self.to_models(data, model)
+
+        running = deque()
+
+        def fill():
+            while len(running) < max_concurrency:
+                if (page_url := next(page_urls, None)) is None:
+                    break
+                running.append(asyncio.create_task(fetch(page_url)))
+
+        try:
+            fill()
+            while running:
+                if ordered:
+                    done = [running.popleft()]
+                else:
+                    done, _ = await asyncio.wait(
+                        running, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        running.remove(task)
+                for task in done:
+                    page = await task
+                    fill()
+                    for item in page:
+                        yield item
+        finally:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
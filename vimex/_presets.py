@@ -0,0 +1,59 @@
+import importlib.util
+from typing import NamedTuple, Optional
+
+import httpx
+
+
+class ClientPreset(NamedTuple):
+    limits: httpx.Limits
+    timeout: httpx.Timeout
+    # Used only when the `h2` package is installed.
+    http2: bool
+
+
+PRESETS = {
+    # Many small concurrent api requests, multiplexed on a few HTTP/2
+    # connections kept alive between the bursts.
+    "api-heavy": ClientPreset(
+        limits=httpx.Limits(
+            max_connections=100, max_keepalive_connections=50, keepalive_expiry=60
+        ),
+        timeout=httpx.Timeout(10.0, connect=5.0, pool=30.0),
+        http2=True,
+    ),
+    # Long PATCH requests of large chunks. A connection per upload avoids
+    # sharing the flow control window of a single HTTP/2 connection, the
+    # write and pool timeouts leave room for slow links and queued uploads.
+    "upload-heavy": ClientPreset(
+        limits=httpx.Limits(
+            max_connections=32, max_keepalive_connections=32, keepalive_expiry=120
+        ),
+        timeout=httpx.Timeout(30.0, connect=10.0, write=300.0, pool=600.0),
+        http2=False,
+    ),
+}
+
+
+def is_http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def get_preset_kwargs(preset: Optional[str], kwargs: dict) -> dict:
+    """
+    Return the client `kwargs` completed with the settings of `preset`,
+    the arguments given explicitly win.
+    """
+    if preset is None:
+        return kwargs
+    try:
+        settings = PRESETS[preset]
+    except KeyError:
+        raise ValueError(
+            f"Unknown preset {preset!r}, expected one of {', '.join(PRESETS)}."
+        ) from None
+    return {
+        "limits": settings.limits,
+        "timeout": settings.timeout,
+        "http2": settings.http2 and is_http2_available(),
+        **kwargs,
+    }
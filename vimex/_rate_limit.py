@@ -0,0 +1,224 @@
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Iterable, Optional
+
+import httpx
+
+from ._instrumentation import Instrumentation
+from ._retry import get_retry_after
+from ._throttle import Throttle
+
+logger = logging.getLogger(__name__)
+
+
+def parse_rate_limit_reset(value: str) -> Optional[float]:
+    """
+    Return the unix timestamp of `X-RateLimit-Reset`, vimeo sends an
+    ISO 8601 date, epoch seconds and delays in seconds are accepted too.
+    """
+    try:
+        number = float(value)
+    except ValueError:
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return None
+    # A delay is far smaller than any epoch timestamp.
+    return number if number > 10**9 else time.time() + number
+
+
+class RateLimiter:
+    """
+    Schedule the requests sent to the vimeo api from the `X-RateLimit-*`
+    headers of the responses.
+
+    The remaining budget is spread over the time left before the reset with
+    a token bucket allowing bursts of `burst` requests, once it is exhausted
+    the requests wait for the reset. Before the first headers the requests
+    are paced at `rate` requests per second, or not at all.
+
+    A 429 response blocks every request until its `Retry-After` delay (or
+    the reset) has passed, then the request is sent again up to
+    `max_retries` times.
+
+    The limiter is shared safely between threads and tasks, the requests to
+    hosts other than `hosts` (e.g. the tus upload links) are not limited.
+
+    `instrumentation` receives the `rate_limit.headroom` and
+    `rate_limit.retry` events.
+    """
+
+    hosts = frozenset({"api.vimeo.com"})
+    # Delay applied to a 429 without `Retry-After` nor reset.
+    default_retry_delay = 1.0
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: float = 10,
+        max_retries: int = 3,
+        hosts: Optional[Iterable[str]] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ):
+        self.burst = burst
+        self.max_retries = max_retries
+        if hosts is not None:
+            self.hosts = frozenset(hosts)
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        # Unix timestamp of the next reset of the budget.
+        self.reset_at: Optional[float] = None
+        self.rate = rate
+        self.throttle = self.get_initial_throttle()
+        self.instrumentation = instrumentation
+        self._in_flight = 0
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def is_limited(self, request: httpx.Request) -> bool:
+        return request.url.host in self.hosts
+
+    def reserve(self) -> float:
+        """
+        Book a request and return how many seconds it must wait.
+        """
+        with self._lock:
+            now = time.time()
+            if self.reset_at is not None and self.reset_at <= now:
+                self._reset_budget()
+            delay = max(self._blocked_until - now, 0.0)
+            self._in_flight += 1
+            if self.remaining is not None and self.remaining <= 0:
+                if self.reset_at is not None:
+                    # Wait for the fresh budget, the pace of the exhausted
+                    # one doesn't apply anymore.
+                    return max(delay, self.reset_at - now)
+            elif self.remaining is not None:
+                self.remaining -= 1
+            throttle = self.throttle
+        if throttle is not None:
+            delay = max(delay, throttle.reserve(1))
+        return delay
+
+    def update(self, response: Optional[httpx.Response]):
+        """
+        Release a request booked with `reserve` and track the budget left,
+        `response` is None when the request failed.
+        """
+        with self._lock:
+            self._in_flight = max(self._in_flight - 1, 0)
+            if response is None:
+                return
+            headers = response.headers
+            try:
+                self.limit = int(headers["x-ratelimit-limit"])
+                remaining = int(headers["x-ratelimit-remaining"])
+            except (KeyError, ValueError):
+                return
+            if "x-ratelimit-reset" in headers:
+                self.reset_at = parse_rate_limit_reset(headers["x-ratelimit-reset"])
+            # Requests sent before this response was produced are not counted.
+            self.remaining = remaining - self._in_flight
+            self._set_pace()
+            limit = self.limit
+        if self.instrumentation is not None:
+            self.instrumentation.emit("rate_limit.headroom", remaining, limit=limit)
+
+    def get_initial_throttle(self) -> Optional[Throttle]:
+        return Throttle(self.rate, self.burst) if self.rate else None
+
+    def _reset_budget(self):
+        # The budget is unknown until the next headers, back to `rate`.
+        self.remaining = None
+        self.reset_at = None
+        self.throttle = self.get_initial_throttle()
+
+    def _set_pace(self):
+        now = time.time()
+        if self.reset_at is None or self.reset_at <= now or self.remaining <= 0:
+            return
+        rate = self.remaining / (self.reset_at - now)
+        if self.throttle is None:
+            self.throttle = Throttle(rate, self.burst)
+        else:
+            self.throttle.rate = rate
+
+    def get_retry_delay(self, response: httpx.Response) -> float:
+        """
+        Block every request after a 429 and return the delay to wait.
+        """
+        delay = get_retry_after(response)
+        with self._lock:
+            now = time.time()
+            if delay is None and self.reset_at is not None:
+                delay = max(self.reset_at - now, 0.0)
+            if delay is None:
+                delay = self.default_retry_delay
+            self._blocked_until = max(self._blocked_until, now + delay)
+            return self._blocked_until - now
+
+    def record_retry(self, request: httpx.Request, attempt: int, delay: float):
+        logger.debug("Rate limited on %s, retry in %.2fs", request.url, delay)
+        if self.instrumentation is not None:
+            self.instrumentation.emit(
+                "rate_limit.retry", delay, attempt=attempt, host=request.url.host
+            )
+
+
+class RateLimitTransport(httpx.BaseTransport):
+    def __init__(self, transport: httpx.BaseTransport, limiter: RateLimiter):
+        self.transport = transport
+        self.limiter = limiter
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.limiter.is_limited(request):
+            return self.transport.handle_request(request)
+        for attempt in range(self.limiter.max_retries + 1):
+            delay = self.limiter.reserve()
+            try:
+                if delay:
+                    time.sleep(delay)
+                response = self.transport.handle_request(request)
+            except BaseException:
+                self.limiter.update(None)
+                raise
+            self.limiter.update(response)
+            if response.status_code != 429 or attempt == self.limiter.max_retries:
+                return response
+            delay = self.limiter.get_retry_delay(response)
+            self.limiter.record_retry(request, attempt + 1, delay)
+            response.close()
+
+    def close(self):
+        self.transport.close()
+
+
+class AsyncRateLimitTransport(httpx.AsyncBaseTransport):
+    def __init__(self, transport: httpx.AsyncBaseTransport, limiter: RateLimiter):
+        self.transport = transport
+        self.limiter = limiter
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.limiter.is_limited(request):
+            return await self.transport.handle_async_request(request)
+        for attempt in range(self.limiter.max_retries + 1):
+            delay = self.limiter.reserve()
+            try:
+                if delay:
+                    await asyncio.sleep(delay)
+                response = await self.transport.handle_async_request(request)
+            except BaseException:
+                self.limiter.update(None)
+                raise
+            self.limiter.update(response)
+            if response.status_code != 429 or attempt == self.limiter.max_retries:
+                return response
+            delay = self.limiter.get_retry_delay(response)
+            self.limiter.record_retry(request, attempt + 1, delay)
+            await response.aclose()
+
+    async def aclose(self):
+        await self.transport.aclose()
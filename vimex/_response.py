@@ -0,0 +1,66 @@
+import json
+from functools import lru_cache
+from typing import Any, Callable, Union
+
+import httpx
+
+from ._utils import get_attribute
+
+
+@lru_cache(maxsize=None)
+def get_json_loads() -> Callable[[bytes], Any]:
+    """
+    Return the fastest json decoder installed, orjson, ujson or the
+    standard library, imported on first use.
+    """
+    try:
+        import orjson
+
+        return orjson.loads
+    except ImportError:
+        pass
+    try:
+        import ujson
+
+        return ujson.loads
+    except ImportError:
+        return json.loads
+
+
+def loads(content: Union[bytes, str]) -> Any:
+    return get_json_loads()(content)
+
+
+class DecodedResponse:
+    """
+    Wrap a response to decode its json body once, `get` looks up a path in
+    the decoded object like `get_attribute`.
+    """
+
+    __slots__ = ("response", "_json")
+
+    _missing = object()
+
+    def __init__(self, response: httpx.Response):
+        self.response = response
+        self._json = self._missing
+
+    @classmethod
+    def wrap(cls, response: Union[httpx.Response, "DecodedResponse"]):
+        return response if isinstance(response, cls) else cls(response)
+
+    @property
+    def status_code(self) -> int:
+        return self.response.status_code
+
+    @property
+    def is_success(self) -> bool:
+        return self.response.is_success
+
+    def json(self) -> Any:
+        if self._json is self._missing:
+            self._json = loads(self.response.content)
+        return self._json
+
+    def get(self, *attrs) -> Any:
+        return get_attribute(self.json(), *attrs)
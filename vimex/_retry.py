@@ -0,0 +1,56 @@
+import random
+from typing import Iterable, Optional
+
+import httpx
+
+
+class RetryPolicy:
+    """
+    Decide whether a failed request is retried and how long to wait
+    before the next attempt.
+
+    `attempts` counts the first request too. The delay grows exponentially
+    with `backoff_factor` up to `max_backoff` and is jittered, unless the
+    response carries a `Retry-After` header.
+    """
+
+    retry_status_codes = frozenset({409, 423, 429, 500, 502, 503, 504})
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        retry_status_codes: Optional[Iterable[int]] = None,
+    ):
+        if attempts < 1:
+            raise ValueError("attempts must be at least 1.")
+        self.attempts = attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        if retry_status_codes is not None:
+            self.retry_status_codes = frozenset(retry_status_codes)
+
+    def is_retryable(self, response: Optional[httpx.Response]) -> bool:
+        # No response means a transport error.
+        if response is None:
+            return True
+        return (
+            response.status_code in self.retry_status_codes
+            or response.is_server_error
+        )
+
+    def get_backoff(self, attempt: int, response: Optional[httpx.Response] = None):
+        if response is not None:
+            retry_after = get_retry_after(response)
+            if retry_after is not None:
+                return min(retry_after, self.max_backoff)
+        backoff = min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1))
+        return random.uniform(0, backoff)
+
+
+def get_retry_after(response: httpx.Response) -> Optional[float]:
+    try:
+        return max(float(response.headers["retry-after"]), 0.0)
+    except (KeyError, ValueError):
+        return None
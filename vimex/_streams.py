@@ -0,0 +1,198 @@
+import asyncio
+import io
+import mmap
+from typing import IO, Callable, Optional, Union
+
+from ._throttle import Throttle
+
+# Size of the slices handed to the transport, the http layer copies
+# each slice before writing it on the socket.
+DEFAULT_BLOCK_SIZE = 64 * 1024
+# Size of the read-ahead buffer used when streaming a whole file.
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+
+class ChunkSource:
+    """
+    Read chunks of a seekable file at arbitrary offsets.
+
+    This is the buffered fallback, every chunk is a new bytes object.
+    """
+
+    blocking = True
+
+    def __init__(self, file: IO):
+        self.file = file
+
+    def read(self, offset: int, size: int) -> Union[bytes, memoryview]:
+        self.file.seek(offset)
+        return self.file.read(size)
+
+    def close(self):
+        pass
+
+
+class MemoryViewChunkSource(ChunkSource):
+    """
+    Serve chunks as memoryview slices of an in-memory buffer,
+    without copying any data.
+    """
+
+    blocking = False
+
+    def __init__(self, file: IO, buffer):
+        super().__init__(file)
+        self._view = memoryview(buffer)
+
+    def read(self, offset: int, size: int) -> memoryview:
+        return self._view[offset : offset + size]
+
+    def close(self):
+        self._view.release()
+
+
+class MmapChunkSource(MemoryViewChunkSource):
+    """
+    Serve chunks as memoryview slices of a read-only memory map of the file.
+
+    The pages of a slice are faulted in by `read`, so the disk reads happen
+    in the worker thread of the async readers rather than on the event loop
+    when the transport copies the slice.
+    """
+
+    blocking = True
+
+    def __init__(self, file: IO):
+        self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        super().__init__(file, self._mmap)
+
+    def read(self, offset: int, size: int) -> memoryview:
+        view = super().read(offset, size)
+        # Touch a byte of every page.
+        view[:: mmap.PAGESIZE].tobytes()
+        return view
+
+    def close(self):
+        super().close()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Some slices are still referenced (e.g. by a request kept
+            # with its response), the map is released with them.
+            pass
+
+
+def get_chunk_source(file: IO) -> ChunkSource:
+    if hasattr(file, "getbuffer"):
+        return MemoryViewChunkSource(file, file.getbuffer())
+    try:
+        return MmapChunkSource(file)
+    except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+        # No file descriptor, empty file or unsupported platform.
+        return ChunkSource(file)
+
+
+def iter_slices(chunk, block_size: int = DEFAULT_BLOCK_SIZE):
+    view = memoryview(chunk)
+    for start in range(0, len(view), block_size):
+        yield view[start : start + block_size]
+
+
+class BaseChunkStream:
+    """
+    Re-iterable request body yielding a chunk in `block_size` slices.
+    """
+
+    def __init__(
+        self,
+        chunk,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        throttle: Optional[Throttle] = None,
+    ):
+        self.chunk = chunk
+        self.block_size = block_size
+        self.throttle = throttle
+
+    def __len__(self):
+        return len(self.chunk)
+
+
+class ChunkStream(BaseChunkStream):
+    def __iter__(self):
+        for block in iter_slices(self.chunk, self.block_size):
+            if self.throttle is not None:
+                self.throttle.consume(len(block))
+            yield block
+
+
+class AsyncChunkStream(BaseChunkStream):
+    async def __aiter__(self):
+        for block in iter_slices(self.chunk, self.block_size):
+            if self.throttle is not None:
+                await self.throttle.async_consume(len(block))
+            yield block
+
+
+class BaseRangeStream:
+    """
+    Request body streaming `length` bytes of a chunk source from `offset`,
+    holding at most `buffer_size` bytes in memory.
+
+    `on_progress` is called with the absolute offset reached after every
+    block handed to the transport.
+    """
+
+    def __init__(
+        self,
+        source: ChunkSource,
+        offset: int,
+        length: int,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        on_progress: Optional[Callable[[int], None]] = None,
+        throttle: Optional[Throttle] = None,
+    ):
+        self.source = source
+        self.offset = offset
+        self.length = length
+        self.buffer_size = buffer_size
+        self.on_progress = on_progress
+        self.throttle = throttle
+
+    def __len__(self):
+        return self.length
+
+    def iter_ranges(self):
+        end = self.offset + self.length
+        for start in range(self.offset, end, self.buffer_size):
+            yield start, min(self.buffer_size, end - start)
+
+    def report(self, position):
+        if self.on_progress is not None:
+            self.on_progress(position)
+
+
+class RangeStream(BaseRangeStream):
+    def __iter__(self):
+        for start, size in self.iter_ranges():
+            block = self.source.read(start, size)
+            if not block:
+                break
+            if self.throttle is not None:
+                self.throttle.consume(len(block))
+            yield block
+            self.report(start + len(block))
+
+
+class AsyncRangeStream(BaseRangeStream):
+    async def __aiter__(self):
+        for start, size in self.iter_ranges():
+            if self.source.blocking:
+                block = await asyncio.to_thread(self.source.read, start, size)
+            else:
+                block = self.source.read(start, size)
+            if not block:
+                break
+            if self.throttle is not None:
+                await self.throttle.async_consume(len(block))
+            yield block
+            self.report(start + len(block))
@@ -0,0 +1,47 @@
+import asyncio
+import threading
+import time
+from typing import Optional
+
+
+class Throttle:
+    """
+    Token bucket limiting a flow to `rate` units per second, allowing
+    bursts of up to `burst` units. It is shared safely between threads
+    and tasks.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive.")
+        self.rate = rate
+        self.burst = burst if burst is not None else rate
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """
+        Take `amount` tokens and return how many seconds the caller must
+        wait before using them.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def consume(self, amount: float):
+        delay = self.reserve(amount)
+        if delay:
+            time.sleep(delay)
+
+    async def async_consume(self, amount: float):
+        delay = self.reserve(amount)
+        if delay:
+            await asyncio.sleep(delay)
@@ -0,0 +1,147 @@
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from ._data_structures import CachedToken
+
+
+class BaseTokenCache:
+    """
+    Store the access tokens of the auth flows, keyed by
+    `client_id:grant_type:scope`.
+    """
+
+    # Whether the cache does I/O, async flows run it in a worker thread.
+    blocking = True
+
+    def get(self, key: str) -> Optional[CachedToken]:
+        raise NotImplementedError
+
+    def set(self, key: str, token: CachedToken):
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+
+class MemoryTokenCache(BaseTokenCache):
+    blocking = False
+
+    def __init__(self):
+        self._tokens = {}
+
+    def get(self, key: str) -> Optional[CachedToken]:
+        return self._tokens.get(key)
+
+    def set(self, key: str, token: CachedToken):
+        self._tokens[key] = token
+
+    def delete(self, key: str):
+        self._tokens.pop(key, None)
+
+
+class FileTokenCache(BaseTokenCache):
+    """
+    Keep the tokens in a json file shared between processes. Writes are
+    atomic and serialized with a lock file where `fcntl` is available.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _locked(self):
+        with self._lock, open(f"{self.path}.lock", "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _dump(self, entries: dict):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entries, f)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def get(self, key: str) -> Optional[CachedToken]:
+        with self._locked():
+            entry = self._load().get(key)
+        return CachedToken(**entry) if entry else None
+
+    def set(self, key: str, token: CachedToken):
+        with self._locked():
+            entries = self._load()
+            entries[key] = token._asdict()
+            self._dump(entries)
+
+    def delete(self, key: str):
+        with self._locked():
+            entries = self._load()
+            if entries.pop(key, None) is not None:
+                self._dump(entries)
+
+
+class SQLiteTokenCache(BaseTokenCache):
+    def __init__(self, path: str):
+        self.path = path
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS tokens ("
+                "key TEXT PRIMARY KEY, access_token TEXT NOT NULL, expires_at REAL)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        import sqlite3
+
+        # A connection per operation, so the cache can be used from any thread.
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def get(self, key: str) -> Optional[CachedToken]:
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT access_token, expires_at FROM tokens WHERE key = ?", (key,)
+            ).fetchone()
+        return CachedToken(*row) if row else None
+
+    def set(self, key: str, token: CachedToken):
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO tokens (key, access_token, expires_at) "
+                "VALUES (?, ?, ?)",
+                (key, token.access_token, token.expires_at),
+            )
+
+    def delete(self, key: str):
+        with self._connect() as connection:
+            connection.execute("DELETE FROM tokens WHERE key = ?", (key,))
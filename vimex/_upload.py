@@ -1,12 +1,32 @@
+import asyncio
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import cached_property
 from typing import IO, Union, Optional
 
 import httpx
 
 import vimex
-from ._utils import get_attribute, get_file_stream, get_file_size
+from ._data_structures import UploadTicket
+from ._journal import UploadJournal
+from ._response import DecodedResponse
+from ._retry import RetryPolicy
+from ._throttle import Throttle
+from ._streams import (
+    AsyncChunkStream,
+    AsyncRangeStream,
+    ChunkStream,
+    DEFAULT_BUFFER_SIZE,
+    RangeStream,
+    get_chunk_source,
+)
+from ._utils import (
+    get_file_fingerprint,
+    get_file_stream,
+    get_file_size,
+)
 
 
 class BaseUpload:
@@ -27,11 +47,36 @@ class BaseUpload:
         except TypeError:
             return len(filename.read())
 
+    default_video_name = "Untitled"
+
+    def get_default_name(self, file: Union[str, IO]) -> str:
+        """
+        Name a video after its file, a stream without a file name gets
+        `default_video_name`.
+        """
+        path = getattr(file, "name", file)
+        if isinstance(path, (str, os.PathLike)):
+            return os.path.basename(path) or self.default_video_name
+        return self.default_video_name
+
+    def get_tus_video_body(self, file, name=None, description=None, privacy=None):
+        return self.get_post_upload_body(
+            get_file_size(file),
+            "tus",
+            name=name or self.get_default_name(file),
+            description=description or "",
+            privacy=privacy or {},
+        )
+
     @staticmethod
-    def get_value_from_response(response: httpx.Response, *args) -> str:
+    def get_value_from_response(
+        response: Union[httpx.Response, DecodedResponse], *args
+    ) -> str:
+        # Pass a `DecodedResponse` to decode the body only once.
+        response = DecodedResponse.wrap(response)
         if not response.is_success:
             raise vimex.UploadException(response.json())
-        return get_attribute(response.json(), *args)
+        return response.get(*args)
 
 
 class SyncUploadMixin(BaseUpload):
@@ -43,39 +88,192 @@ class SyncUploadMixin(BaseUpload):
         privacy: Optional[dict] = None,
         **request_kwargs
     ):
-        name = name or os.path.basename(file)
-        description = description or ""
-        privacy = privacy or {}
+        body = self.get_tus_video_body(file, name, description, privacy)
 
-        size = get_file_size(file)
-        body = self.get_post_upload_body(
-            size, "tus", name=name, description=description, privacy=privacy
+        response = DecodedResponse(
+            self.post(self.upload_url, json=body, **request_kwargs)
         )
 
-        response = self.post(self.upload_url, json=body, **request_kwargs)
-
         upload_link = self.get_value_from_response(response, "upload", "upload_link")
         uri = self.get_value_from_response(response, "uri")
 
-        return upload_link, uri
+        return UploadTicket(upload_link, uri)
+
+    def get_tus_uploader(
+        self,
+        file,
+        upload_link,
+        chunk_size: Optional[int] = None,
+        journal: Optional[UploadJournal] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        throttle: Optional[Throttle] = None,
+    ):
+        return TusUploader(
+            file,
+            upload_link,
+            self,
+            chunk_size=chunk_size,
+            journal=journal,
+            retry_policy=retry_policy,
+            throttle=throttle,
+        )
 
-    def get_tus_uploader(self, file, upload_link, chunk_size: Optional[int] = None):
-        return TusUploader(file, upload_link, self, chunk_size=chunk_size)
+    def resume_tus_uploader(
+        self, file, journal: UploadJournal, chunk_size: Optional[int] = None
+    ):
+        """
+        Return an uploader positioned at the server offset of the upload
+        recorded in `journal` for `file`, or None if there is none or its
+        upload link expired.
+        """
+        entry = journal.get(get_file_fingerprint(file))
+        if entry is None:
+            return None
+        uploader = self.get_tus_uploader(
+            file, entry["upload_link"], chunk_size=chunk_size, journal=journal
+        )
+        try:
+            uploader.resume()
+        except BaseException:
+            uploader.close()
+            if uploader.expired:
+                # The entry was removed from the journal.
+                return None
+            raise
+        return uploader
 
 
 class AsyncUploadMixin(BaseUpload):
-    pass
+    async def create_tus_video(
+        self,
+        file: Union[str, IO],
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+        privacy: Optional[dict] = None,
+        **request_kwargs
+    ):
+        # The size of a path is read from the disk, off the event loop.
+        body = await asyncio.to_thread(
+            self.get_tus_video_body, file, name, description, privacy
+        )
+
+        response = DecodedResponse(
+            await self.post(self.upload_url, json=body, **request_kwargs)
+        )
+
+        upload_link = self.get_value_from_response(response, "upload", "upload_link")
+        uri = self.get_value_from_response(response, "uri")
+
+        return UploadTicket(upload_link, uri)
+
+    def get_tus_uploader(
+        self,
+        file,
+        upload_link,
+        chunk_size: Optional[int] = None,
+        journal: Optional[UploadJournal] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        throttle: Optional[Throttle] = None,
+    ):
+        return AsyncTusUploader(
+            file,
+            upload_link,
+            self,
+            chunk_size=chunk_size,
+            journal=journal,
+            retry_policy=retry_policy,
+            throttle=throttle,
+        )
+
+    async def resume_tus_uploader(
+        self, file, journal: UploadJournal, chunk_size: Optional[int] = None
+    ):
+        fingerprint = await asyncio.to_thread(get_file_fingerprint, file)
+        entry = await asyncio.to_thread(journal.get, fingerprint)
+        if entry is None:
+            return None
+        uploader = self.get_tus_uploader(
+            file, entry["upload_link"], chunk_size=chunk_size, journal=journal
+        )
+        try:
+            await uploader.resume()
+        except BaseException:
+            uploader.close()
+            if uploader.expired:
+                return None
+            raise
+        return uploader
+
+
+class AdaptiveChunkSize:
+    """
+    Pick the size of the next chunk from the throughput measured on the
+    previous PATCH requests, aiming for requests of `target_duration`
+    seconds. The size changes at most by `max_step` times per chunk and
+    stays within `minimum` and `maximum`.
+    """
+
+    def __init__(
+        self,
+        initial: int = 8 * 1024 * 1024,
+        minimum: int = 1024 * 1024,
+        maximum: int = 1024 * 1024 * 1024,
+        target_duration: float = 5.0,
+        max_step: float = 2.0,
+    ):
+        if not 0 < minimum <= maximum:
+            raise ValueError("Invalid chunk size bounds.")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_duration = target_duration
+        self.max_step = max_step
+        self.size = min(max(initial, minimum), maximum)
+        # (size, seconds, bytes per second) of every measured chunk.
+        self.samples = []
 
+    def update(self, size: int, elapsed: float) -> int:
+        throughput = size / max(elapsed, 1e-3)
+        self.samples.append((size, elapsed, throughput))
+        ideal = throughput * self.target_duration
+        ideal = min(max(ideal, self.size / self.max_step), self.size * self.max_step)
+        self.size = int(min(max(ideal, self.minimum), self.maximum))
+        return self.size
 
-class TusUploader:
+
+class BaseTusUploader:
     DEFAULT_CHUNK_SIZE = sys.maxsize
+    upload_buffer_size = DEFAULT_BUFFER_SIZE
 
-    def __init__(self, file, upload_link: str, client, chunk_size=None):
+    def __init__(
+        self,
+        file,
+        upload_link: str,
+        client,
+        chunk_size=None,
+        journal: Optional[UploadJournal] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        throttle: Optional[Throttle] = None,
+    ):
         self._file = file
         self.chunk_size = chunk_size
         self.upload_link = upload_link
         self.client = client
+        self.journal = journal
+        self.retry_policy = retry_policy or RetryPolicy()
+        # Shared bandwidth limit, in bytes per second.
+        self.throttle = throttle
         self.upload_offset = 0
+        # Number of requests retried since the uploader was created.
+        self.retries = 0
+        self.adaptive: Optional[AdaptiveChunkSize] = None
+        # Size of every chunk acknowledged during `chunks_upload`.
+        self.chunk_sizes = []
+        # Whether the server answered that the upload link expired.
+        self.expired = False
+        # Duration of the last `patch_chunk`, until its response is handled.
+        self._patch_elapsed: Optional[float] = None
+        # The instrumentation of the client, if any.
+        self.instrumentation = getattr(client, "instrumentation", None)
 
     @cached_property
     def file(self):
@@ -85,6 +283,22 @@ class TusUploader:
     def file_length(self):
         return get_file_size(self.file)
 
+    @cached_property
+    def chunk_source(self):
+        return get_chunk_source(self.file)
+
+    @cached_property
+    def fingerprint(self):
+        return get_file_fingerprint(self.file)
+
+    @property
+    def is_prepared(self):
+        return "chunk_source" in self.__dict__
+
+    def prepare(self):
+        # Open the file, read its size and map it, before the first read.
+        return self.file, self.file_length, self.chunk_source
+
     @property
     def chunk_size(self):
         return self._chunk_size
@@ -111,23 +325,455 @@ class TusUploader:
         remain = self.file_length - self.upload_offset
         return self.chunk_size if remain > self.chunk_size else remain
 
-    def chunks_upload(self, chunk_size):
-        self.chunk_size = chunk_size
-        while self.upload_offset < self.file_length:
-            chunk = self.file.read(self.get_content_length())
-            response = self.client.patch(
-                self.upload_link,
-                headers=self.set_headers(content_length=str(self.get_content_length())),
-                data=chunk,
+    def read_chunk(self, offset, size):
+        return self.chunk_source.read(offset, size)
+
+    def fit_chunk(self, chunk):
+        """
+        Cut `chunk`, read ahead at `upload_offset` before the chunk size was
+        last updated, to the current size. Return it with the number of
+        bytes still to read after it.
+        """
+        size = self.get_content_length()
+        if len(chunk) > size:
+            return memoryview(chunk)[:size], 0
+        return chunk, size - len(chunk)
+
+    def close(self):
+        if "chunk_source" in self.__dict__:
+            self.chunk_source.close()
+            del self.chunk_source
+        if "file" in self.__dict__ and not hasattr(self._file, "read"):
+            # The stream was opened by the uploader.
+            self.file.close()
+            del self.file
+
+    def get_next_chunk_size(self, offset):
+        return min(self.chunk_size, self.file_length - offset)
+
+    def set_chunking(self, chunk_size, adaptive):
+        self.adaptive = adaptive
+        self.chunk_size = adaptive.size if adaptive is not None else chunk_size
+
+    def record_chunk(self, size, elapsed):
+        self.chunk_sizes.append(size)
+        if self.adaptive is not None:
+            self.chunk_size = self.adaptive.update(size, elapsed)
+
+    def record_patch(self, offset, size, elapsed, response: httpx.Response):
+        if self.instrumentation is not None:
+            self.instrumentation.emit(
+                "upload.patch",
+                elapsed,
+                bytes=size,
+                offset=offset,
+                status_code=response.status_code,
+            )
+
+    def record_retry(self, attempt, delay, response: Optional[httpx.Response]):
+        self.retries += 1
+        if self.instrumentation is not None:
+            self.instrumentation.emit(
+                "upload.retry",
+                delay,
+                attempt=attempt,
+                status_code=response and response.status_code,
             )
-            self.upload_offset = int(response.headers["upload-offset"])
-            yield response
 
-    def upload(self):
+    def get_upload_stream(self, stream_class, on_progress=None):
+        return stream_class(
+            self.chunk_source,
+            self.upload_offset,
+            self.file_length - self.upload_offset,
+            buffer_size=self.upload_buffer_size,
+            on_progress=on_progress,
+            throttle=self.throttle,
+        )
+
+    def update_offset(self, response: httpx.Response):
+        self.upload_offset = int(response.headers["upload-offset"])
+
+    def acknowledge(self, response: httpx.Response):
+        """
+        Move to the offset acknowledged by a PATCH response, the chunk size
+        only learns from the acknowledged bytes.
+        """
+        start = self.upload_offset
+        self.update_offset(response)
+        elapsed, self._patch_elapsed = self._patch_elapsed, None
+        if elapsed is not None and self.upload_offset > start:
+            self.record_chunk(self.upload_offset - start, elapsed)
+
+    @staticmethod
+    def is_acknowledged(response: httpx.Response):
+        return response.is_success and "upload-offset" in response.headers
+
+    def get_chunk_data(self, chunk, start):
+        """
+        Return the part of `chunk`, read from `start`, not yet
+        acknowledged by the server.
+        """
+        skip = self.upload_offset - start
+        if skip == 0:
+            return chunk
+        if 0 < skip < len(chunk):
+            return memoryview(chunk)[skip:]
+        return self.read_chunk(
+            self.upload_offset, start + len(chunk) - self.upload_offset
+        )
+
+    def check_retry(self, attempt, response, error):
+        """
+        Raise if the failed attempt `attempt` must not be retried.
+        """
+        # A success without `Upload-Offset` is retried after a resync.
+        if (
+            response is not None
+            and not response.is_success
+            and not self.retry_policy.is_retryable(response)
+        ):
+            raise vimex.UploadException(
+                f"PATCH {self.upload_link} returned {response.status_code}."
+            )
+        if attempt >= self.retry_policy.attempts:
+            raise vimex.UploadException(
+                f"Upload to {self.upload_link} failed after {attempt} attempts."
+            ) from error
+
+    def is_retryable_head(self, response: Optional[httpx.Response]):
+        """
+        Whether the resync HEAD must be sent again, an expired upload link
+        and the other non retryable statuses are handled as fatal.
+        """
+        if response is None:
+            return True
+        return (
+            not self.is_acknowledged(response)
+            and response.status_code not in (404, 410)
+            and self.retry_policy.is_retryable(response)
+        )
+
+    def get_head_headers(self):
+        return {"Tus-Resumable": "1.0.0"}
+
+    def handle_head_response(self, response: httpx.Response):
+        if response.status_code in (404, 410):
+            # The upload link expired, it can't be resumed anymore.
+            self.expired = True
+            if self.journal is not None:
+                self.journal.remove(self.fingerprint)
+        if not self.is_acknowledged(response):
+            raise vimex.UploadException(
+                f"Unable to resume the upload, HEAD {self.upload_link} "
+                f"returned {response.status_code}."
+            )
+        self.update_offset(response)
+
+    def save_offset(self):
+        if self.journal is None:
+            return
+        if self.upload_offset >= self.file_length:
+            self.journal.remove(self.fingerprint)
+        else:
+            self.journal.save(self.fingerprint, self.upload_link, self.upload_offset)
+
+
+class TusUploader(BaseTusUploader):
+    def patch_chunk(self, chunk):
+        offset, start = self.upload_offset, time.monotonic()
         response = self.client.patch(
             self.upload_link,
-            headers=self.set_headers(content_length=str(self.get_content_length())),
-            data=self.file,
+            headers=self.set_headers(content_length=str(len(chunk))),
+            content=ChunkStream(chunk, throttle=self.throttle),
         )
-        self.upload_offset = int(response.headers["upload-offset"])
+        elapsed = time.monotonic() - start
+        self._patch_elapsed = elapsed
+        self.record_patch(offset, len(chunk), elapsed, response)
+        return response
+
+    def send_chunk(self, chunk):
+        start = self.upload_offset
+        return self.send_with_retry(
+            lambda: self.patch_chunk(self.get_chunk_data(chunk, start)),
+            start + len(chunk),
+        )
+
+    def send_with_retry(self, send, end):
+        """
+        Call `send` until the server acknowledges the data up to `end`.
+
+        Before every retry the offset is synced with the server, so `send`
+        only has to send the data from `upload_offset`.
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            response, error = None, None
+            try:
+                response = send()
+            except httpx.TransportError as exc:
+                error = exc
+            if response is not None and self.is_acknowledged(response):
+                self.acknowledge(response)
+                self.save_offset()
+                return response
+            self._patch_elapsed = None
+            # A failed resync counts as an attempt too.
+            while True:
+                self.check_retry(attempt, response, error)
+                delay = self.retry_policy.get_backoff(attempt, response)
+                time.sleep(delay)
+                self.record_retry(attempt, delay, response)
+                response, error = None, None
+                try:
+                    response = self.client.head(
+                        self.upload_link, headers=self.get_head_headers()
+                    )
+                except httpx.TransportError as exc:
+                    error = exc
+                if not self.is_retryable_head(response):
+                    break
+                attempt += 1
+            self.handle_head_response(response)
+            if self.upload_offset >= end:
+                return response
+
+    def sync_offset(self):
+        response = self.client.head(self.upload_link, headers=self.get_head_headers())
+        self.handle_head_response(response)
+        return response
+
+    def resume(self):
+        """
+        Fetch the offset reached by the upload from the server, the next
+        PATCH continues from there.
+        """
+        self.sync_offset()
+        return self.upload_offset
+
+    def chunks_upload(self, chunk_size=None, read_ahead=False, adaptive=None):
+        """
+        Upload the file in chunks of `chunk_size` bytes, yielding every
+        PATCH response.
+
+        A tus upload link only accepts data at its current offset, so the
+        PATCH requests of one upload are necessarily sequential. With
+        `read_ahead` enabled the next chunk is read from disk in a worker
+        thread while the current one is on the wire.
+
+        When an `AdaptiveChunkSize` is passed as `adaptive` it picks the
+        size of every chunk and `chunk_size` is ignored.
+        """
+        self.set_chunking(chunk_size, adaptive)
+        # Record the upload link before any data is sent.
+        self.save_offset()
+        if not read_ahead:
+            while self.upload_offset < self.file_length:
+                chunk = self.read_chunk(self.upload_offset, self.get_content_length())
+                yield self.send_chunk(chunk)
+            return
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = None
+            while self.upload_offset < self.file_length:
+                if pending is not None and pending[0] == self.upload_offset:
+                    chunk, missing = self.fit_chunk(pending[1].result())
+                    if missing:
+                        tail = self.read_chunk(
+                            self.upload_offset + len(chunk), missing
+                        )
+                        chunk = b"".join((chunk, tail))
+                else:
+                    chunk = self.read_chunk(
+                        self.upload_offset, self.get_content_length()
+                    )
+                next_offset = self.upload_offset + len(chunk)
+                pending = None
+                if next_offset < self.file_length:
+                    pending = (
+                        next_offset,
+                        executor.submit(
+                            self.read_chunk,
+                            next_offset,
+                            self.get_next_chunk_size(next_offset),
+                        ),
+                    )
+                response = self.send_chunk(chunk)
+                if pending is not None and pending[0] != self.upload_offset:
+                    # The server did not accept the whole chunk, the
+                    # prefetched data is stale.
+                    pending[1].result()
+                    pending = None
+                yield response
+
+    def upload(self, on_progress=None):
+        """
+        Upload the rest of the file in a single PATCH request.
+
+        The body is streamed from the file through a fixed size buffer,
+        `on_progress` is called with the reached offset as data goes out.
+        """
+        self.save_offset()
+        return self.send_with_retry(
+            lambda: self.patch_stream(RangeStream, on_progress), self.file_length
+        )
+
+    def patch_stream(self, stream_class, on_progress=None):
+        stream = self.get_upload_stream(stream_class, on_progress)
+        offset, start = self.upload_offset, time.monotonic()
+        response = self.client.patch(
+            self.upload_link,
+            headers=self.set_headers(content_length=str(len(stream))),
+            content=stream,
+        )
+        self.record_patch(offset, len(stream), time.monotonic() - start, response)
+        return response
+
+
+class AsyncTusUploader(BaseTusUploader):
+    async def async_prepare(self):
+        if not self.is_prepared:
+            await asyncio.to_thread(self.prepare)
+
+    async def async_read_chunk(self, offset, size):
+        if not self.chunk_source.blocking:
+            return self.read_chunk(offset, size)
+        return await asyncio.to_thread(self.read_chunk, offset, size)
+
+    async def patch_chunk(self, chunk):
+        offset, start = self.upload_offset, time.monotonic()
+        response = await self.client.patch(
+            self.upload_link,
+            headers=self.set_headers(content_length=str(len(chunk))),
+            content=AsyncChunkStream(chunk, throttle=self.throttle),
+        )
+        elapsed = time.monotonic() - start
+        self._patch_elapsed = elapsed
+        self.record_patch(offset, len(chunk), elapsed, response)
+        return response
+
+    async def async_get_chunk_data(self, chunk, start):
+        if 0 <= self.upload_offset - start < len(chunk):
+            return self.get_chunk_data(chunk, start)
+        return await self.async_read_chunk(
+            self.upload_offset, start + len(chunk) - self.upload_offset
+        )
+
+    async def send_chunk(self, chunk):
+        start = self.upload_offset
+
+        async def send():
+            return await self.patch_chunk(
+                await self.async_get_chunk_data(chunk, start)
+            )
+
+        return await self.send_with_retry(send, start + len(chunk))
+
+    async def send_with_retry(self, send, end):
+        attempt = 0
+        while True:
+            attempt += 1
+            response, error = None, None
+            try:
+                response = await send()
+            except httpx.TransportError as exc:
+                error = exc
+            if response is not None and self.is_acknowledged(response):
+                self.acknowledge(response)
+                await self.async_save_offset()
+                return response
+            self._patch_elapsed = None
+            while True:
+                self.check_retry(attempt, response, error)
+                delay = self.retry_policy.get_backoff(attempt, response)
+                await asyncio.sleep(delay)
+                self.record_retry(attempt, delay, response)
+                response, error = None, None
+                try:
+                    response = await self.client.head(
+                        self.upload_link, headers=self.get_head_headers()
+                    )
+                except httpx.TransportError as exc:
+                    error = exc
+                if not self.is_retryable_head(response):
+                    break
+                attempt += 1
+            await asyncio.to_thread(self.handle_head_response, response)
+            if self.upload_offset >= end:
+                return response
+
+    async def async_save_offset(self):
+        if self.journal is not None:
+            await asyncio.to_thread(self.save_offset)
+
+    async def sync_offset(self):
+        await self.async_prepare()
+        response = await self.client.head(
+            self.upload_link, headers=self.get_head_headers()
+        )
+        await asyncio.to_thread(self.handle_head_response, response)
+        return response
+
+    async def resume(self):
+        await self.sync_offset()
+        return self.upload_offset
+
+    async def chunks_upload(self, chunk_size=None, read_ahead=False, adaptive=None):
+        """
+        Async counterpart of `TusUploader.chunks_upload`, file reads are
+        run in a worker thread so they never block the event loop.
+        """
+        self.set_chunking(chunk_size, adaptive)
+        await self.async_prepare()
+        await self.async_save_offset()
+        pending = None
+        try:
+            while self.upload_offset < self.file_length:
+                if pending is not None and pending[0] == self.upload_offset:
+                    chunk, missing = self.fit_chunk(await pending[1])
+                    if missing:
+                        tail = await self.async_read_chunk(
+                            self.upload_offset + len(chunk), missing
+                        )
+                        chunk = b"".join((chunk, tail))
+                else:
+                    chunk = await self.async_read_chunk(
+                        self.upload_offset, self.get_content_length()
+                    )
+                next_offset = self.upload_offset + len(chunk)
+                pending = None
+                if read_ahead and next_offset < self.file_length:
+                    pending = (
+                        next_offset,
+                        asyncio.ensure_future(
+                            self.async_read_chunk(
+                                next_offset, self.get_next_chunk_size(next_offset)
+                            )
+                        ),
+                    )
+                response = await self.send_chunk(chunk)
+                if pending is not None and pending[0] != self.upload_offset:
+                    await pending[1]
+                    pending = None
+                yield response
+        finally:
+            if pending is not None:
+                await asyncio.gather(pending[1], return_exceptions=True)
+
+    async def upload(self, on_progress=None):
+        await self.async_prepare()
+        await self.async_save_offset()
+        return await self.send_with_retry(
+            lambda: self.patch_stream(AsyncRangeStream, on_progress), self.file_length
+        )
+
+    async def patch_stream(self, stream_class, on_progress=None):
+        stream = self.get_upload_stream(stream_class, on_progress)
+        offset, start = self.upload_offset, time.monotonic()
+        response = await self.client.patch(
+            self.upload_link,
+            headers=self.set_headers(content_length=str(len(stream))),
+            content=stream,
+        )
+        self.record_patch(offset, len(stream), time.monotonic() - start, response)
         return response
@@ -1,3 +1,4 @@
+import hashlib
 import os
 from typing import Union
 
@@ -23,9 +24,32 @@ def get_file_stream(file: Union[str, IO]):
 
 
 def get_file_size(file: Union[str, IO]):
-    file = get_file_stream(file)
+    if not hasattr(file, "read"):
+        with get_file_stream(file) as stream:
+            return get_file_size(stream)
     pos = file.tell()
     file.seek(0, os.SEEK_END)
     size = file.tell()
     file.seek(pos)
     return size
+
+
+def get_file_fingerprint(file: Union[str, IO], sample_size: int = 64 * 1024):
+    """
+    Identify a file by its size and the content of its first and last
+    `sample_size` bytes, without reading it whole.
+
+    A path is opened and closed here, the position of a stream is restored.
+    """
+    if not hasattr(file, "read"):
+        with get_file_stream(file) as stream:
+            return get_file_fingerprint(stream, sample_size)
+    position = file.tell()
+    file.seek(0)
+    size = get_file_size(file)
+    digest = hashlib.sha256(str(size).encode())
+    digest.update(file.read(sample_size))
+    file.seek(max(size - sample_size, 0))
+    digest.update(file.read(sample_size))
+    file.seek(position)
+    return digest.hexdigest()